@@ -0,0 +1,1011 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the galaxy data pipeline
+Runs each pipeline stage on synthetic catalogs of increasing size, e.g. the
+per-row scalar coordinate path against the column (batch) path, or JSON
+against the binary catalog format. Timings can be saved as JSON and compared
+against a saved baseline, failing when a stage slows down past a threshold.
+"""
+
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from catalog_binary import decode_catalog, encode_catalog
+from crossmatch import crossmatch, crossmatch_naive
+from routing import (
+    MAX_TABLE_NODES,
+    build_route_table,
+    decode_route_table,
+    encode_route_table,
+    galaxy_positions,
+    lookup_route,
+    shortest_path_reference,
+)
+from sexagesimal import parse_sexagesimal_column
+from spatial_index import (
+    build_spatial_index,
+    linear_nearest_neighbors,
+    linear_radius_search,
+    nearest_neighbors,
+    radius_search,
+)
+from scraper import (
+    equatorial_to_cartesian,
+    equatorial_to_cartesian_batch,
+    equatorial_to_galactocentric_batch,
+    make_galaxy_id,
+    parse_dec_column,
+    parse_dec_to_degrees,
+    parse_ra_column,
+    parse_ra_to_degrees,
+    peak_memory_mb,
+    process_galaxies,
+)
+
+# Morphological types weighted roughly like the built-in Local Group list
+SYNTHETIC_TYPES = ("dSph", "Irr", "dE", "dIrr", "Sb", "Sc", "SBbc", "cE")
+SYNTHETIC_TYPE_WEIGHTS = (25, 9, 3, 2, 1, 1, 1, 1)
+
+def make_synthetic_rows(count: int, seed: int = 42, start: int = 0) -> List[Dict]:
+    """Generate raw catalog rows shaped like the galaxies_raw entries (names numbered from start)"""
+    rng = random.Random(seed)
+    rows = []
+    for idx in range(start, start + count):
+        ra_total = rng.uniform(0, 24 * 3600)
+        dec_total = rng.uniform(-90 * 3600, 90 * 3600)
+        sign = "-" if dec_total < 0 else "+"
+        dec_total = abs(dec_total)
+        rows.append({
+            "name": f"Synthetic {idx}",
+            "alternate_names": [f"SYN J{idx:07d}"] if idx % 3 == 0 else [],
+            "type": rng.choices(SYNTHETIC_TYPES, SYNTHETIC_TYPE_WEIGHTS)[0],
+            "ra": f"{int(ra_total // 3600):02d}:{int(ra_total % 3600 // 60):02d}:{ra_total % 60:04.1f}",
+            "dec": f"{sign}{int(dec_total // 3600):02d}:{int(dec_total % 3600 // 60):02d}:{int(dec_total % 60):02d}",
+            "distance_kpc": round(rng.uniform(10, 1100), 1),
+            "size_estimate_kpc": round(rng.uniform(0.05, 5), 2),
+            "notes": "Synthetic benchmark row",
+        })
+    return rows
+
+def coordinates_scalar(rows: List[Dict]) -> Tuple[List[float], List[float], List[Tuple[float, float, float]]]:
+    """Reference path: one scalar call per row"""
+    ra_deg = [parse_ra_to_degrees(row["ra"]) for row in rows]
+    dec_deg = [parse_dec_to_degrees(row["dec"]) for row in rows]
+    xyz = [
+        equatorial_to_cartesian(ra, dec, row["distance_kpc"])
+        for ra, dec, row in zip(ra_deg, dec_deg, rows)
+    ]
+    return ra_deg, dec_deg, xyz
+
+def coordinates_batch(rows: List[Dict]) -> Tuple[List[float], List[float], List[Tuple[float, float, float]]]:
+    """Column path: whole-column parsing and conversion"""
+    ra_deg = parse_ra_column([row["ra"] for row in rows])
+    dec_deg = parse_dec_column([row["dec"] for row in rows])
+    xs, ys, zs = equatorial_to_cartesian_batch(ra_deg, dec_deg, [row["distance_kpc"] for row in rows])
+    return ra_deg, dec_deg, list(zip(xs, ys, zs))
+
+def iter_synthetic_chunks(count: int, chunk_size: int, seed: int = 42) -> Iterator[List[Dict]]:
+    """Synthetic rows in chunks, so very large catalogs never sit in memory at once"""
+    for start in range(0, count, chunk_size):
+        yield make_synthetic_rows(min(chunk_size, count - start), seed=seed + start, start=start)
+
+# Timings of the current run, saved with --save and compared with --baseline
+RESULTS: List[Dict] = []
+
+def record(suite: str, name: str, rows: int, seconds: float, **extra) -> None:
+    """Keep one timing for the JSON results"""
+    RESULTS.append({
+        "suite": suite,
+        "name": name,
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds > 0 else None,
+        **extra,
+    })
+
+def best_time(func: Callable, *args, repeat: int = 3) -> Tuple[float, object]:
+    """Run func a few times and keep the fastest wall time"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def bench_coordinates(sizes: List[int], repeat: int) -> None:
+    """Time scalar vs batch coordinate conversion and check they agree"""
+    print("\n📐 Coordinate pipeline: scalar vs batch")
+    print(f"  {'rows':>10}  {'scalar (s)':>11}  {'batch (s)':>10}  {'speedup':>8}  {'rows/s (batch)':>15}")
+    for size in sizes:
+        rows = make_synthetic_rows(size)
+        scalar_time, scalar_result = best_time(coordinates_scalar, rows, repeat=repeat)
+        batch_time, batch_result = best_time(coordinates_batch, rows, repeat=repeat)
+        if scalar_result != batch_result:
+            raise AssertionError(f"Batch coordinates differ from scalar results at {size} rows")
+        record("coordinates", "scalar", size, scalar_time)
+        record("coordinates", "batch", size, batch_time)
+        print(
+            f"  {size:>10,}  {scalar_time:>11.3f}  {batch_time:>10.3f}  "
+            f"{scalar_time / batch_time:>7.2f}x  {size / batch_time:>15,.0f}"
+        )
+
+def bench_formats(sizes: List[int], repeat: int) -> None:
+    """Compare size and decode time of galaxies.json against the binary catalog"""
+    print("\n📦 Output formats: JSON (indent=2) vs columnar binary")
+    print(f"  {'rows':>10}  {'json bytes':>12}  {'bin bytes':>12}  {'json.loads (s)':>14}  {'bin decode (s)':>14}")
+    for size in sizes:
+        galaxies = process_galaxies(make_synthetic_rows(size))
+        json_text = json.dumps(galaxies, indent=2, ensure_ascii=False)
+        binary = encode_catalog(galaxies)
+        json_time, _ = best_time(json.loads, json_text, repeat=repeat)
+        binary_time, _ = best_time(decode_catalog, binary, repeat=repeat)
+        record("formats", "json_loads", size, json_time, bytes=len(json_text.encode("utf-8")))
+        record("formats", "binary_decode", size, binary_time, bytes=len(binary))
+        print(
+            f"  {size:>10,}  {len(json_text.encode('utf-8')):>12,}  {len(binary):>12,}  "
+            f"{json_time:>14.3f}  {binary_time:>14.3f}"
+        )
+
+READER_LOOKUPS = 100
+
+def bench_reader(sizes: List[int], repeat: int) -> None:
+    """Open a binary catalog with the mmap reader and look records up by id, vs json.load + a dict by id"""
+    import tempfile
+    from catalog_reader import CatalogReader
+
+    print(f"\n🗂️  mmap catalog reader ({READER_LOOKUPS} lookups by id) vs json.load")
+    print(f"  {'rows':>10}  {'open (ms)':>10}  {'lookup (ms)':>12}  {'json.load (s)':>14}  {'dict lookup (ms)':>17}")
+    for size in sizes:
+        galaxies = process_galaxies(make_synthetic_rows(size))
+        rng = random.Random(size)
+        wanted = [galaxies[rng.randrange(size)]["id"] for _ in range(READER_LOOKUPS)]
+        with tempfile.TemporaryDirectory() as directory:
+            bin_path, json_path = os.path.join(directory, "galaxies.bin"), os.path.join(directory, "galaxies.json")
+            with open(bin_path, "wb") as f:
+                f.write(encode_catalog(galaxies))
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(galaxies, f, indent=2, ensure_ascii=False)
+            del galaxies
+
+            open_time, reader = best_time(CatalogReader, bin_path, repeat=repeat)
+            lookup_time, found = best_time(lambda: [reader.get(galaxy_id) for galaxy_id in wanted], repeat=1)
+
+            def load_json() -> Dict[str, Dict]:
+                with open(json_path, "r", encoding="utf-8") as f:
+                    return {galaxy["id"]: galaxy for galaxy in json.load(f)}
+
+            json_time, by_id = best_time(load_json, repeat=1)
+            dict_time, expected = best_time(lambda: [by_id[galaxy_id] for galaxy_id in wanted], repeat=1)
+            # Binary columns are float32, so compare names and float32-rounded distances
+            for got, want in zip(found, expected):
+                if (got["id"], got["name"]) != (want["id"], want["name"]) or \
+                        abs(got["distance_kpc"] - want["distance_kpc"]) > 1e-6 * max(1.0, want["distance_kpc"]):
+                    raise AssertionError(f"Reader returned {got['id']} for {want['id']}")
+            reader.close()
+        record("reader", "open", size, open_time)
+        record("reader", "lookup_by_id", size, lookup_time / READER_LOOKUPS)
+        record("reader", "json_load", size, json_time)
+        print(f"  {size:>10,}  {open_time * 1000:>10.3f}  {lookup_time / READER_LOOKUPS * 1000:>12.3f}  "
+              f"{json_time:>14.3f}  {dict_time / READER_LOOKUPS * 1000:>17.4f}")
+
+ROUTING_MAX_NODES = MAX_TABLE_NODES
+ROUTING_MAX_JUMP_KPC = 250.0
+
+def bench_routing(sizes: List[int], repeat: int) -> None:
+    """
+    Build route tables, check lookups against the A* route planner and compare
+    query cost with per-query Dijkstra (exact all-pairs checks live in tests/test_routing.py)
+    """
+    from route_planner import RoutePlanner
+
+    print(f"\n🚀 Route tables (max jump {ROUTING_MAX_JUMP_KPC:.0f} kpc) vs per-query Dijkstra")
+    print(f"  {'nodes':>10}  {'build (s)':>10}  {'table bytes':>12}  {'lookup (ms)':>12}  {'per-query (ms)':>15}")
+    for size in sizes:
+        if size > ROUTING_MAX_NODES:
+            print(f"  {size:>10,}  skipped (all-pairs tables are limited to {ROUTING_MAX_NODES:,} nodes here)")
+            continue
+        galaxies = process_galaxies(make_synthetic_rows(size))
+        build_time, table = best_time(build_route_table, galaxies, ROUTING_MAX_JUMP_KPC, repeat=1)
+        data = encode_route_table(table)
+        table = decode_route_table(data)
+        planner = RoutePlanner(galaxies, ROUTING_MAX_JUMP_KPC)
+
+        rng = random.Random(size)
+        pairs = [(rng.choice(galaxies)["id"], rng.choice(galaxies)["id"]) for _ in range(20)]
+        reference_time = 0.0
+        lookup_time = 0.0
+        for start_id, end_id in pairs:
+            elapsed, _ = best_time(shortest_path_reference, galaxies, start_id, end_id,
+                                   ROUTING_MAX_JUMP_KPC, repeat=1)
+            reference_time += elapsed
+            elapsed, actual = best_time(lookup_route, table, start_id, end_id, repeat=repeat)
+            lookup_time += elapsed
+            expected = planner.route(start_id, end_id)
+            if actual[0] != expected[0] or abs(actual[1] - expected[1]) > 1e-3 * max(1.0, expected[1]):
+                raise AssertionError(f"Route table disagrees with the A* planner for {start_id} -> {end_id}")
+        record("routing", "build_table", size, build_time, bytes=len(data))
+        record("routing", "lookup", size, lookup_time / len(pairs))
+        print(
+            f"  {size:>10,}  {build_time:>10.3f}  {len(data):>12,}  "
+            f"{lookup_time / len(pairs) * 1000:>12.4f}  {reference_time / len(pairs) * 1000:>15.3f}"
+        )
+
+def bench_spatial(sizes: List[int], repeat: int) -> None:
+    """k-d tree queries vs linear scans, checking that both return the same points"""
+    print("\n🌐 Spatial index (k-d tree) vs linear scan, k=5 and r=50 kpc")
+    print(f"  {'points':>10}  {'build (s)':>10}  {'knn (ms)':>9}  {'scan knn (ms)':>14}  "
+          f"{'radius (ms)':>12}  {'scan radius (ms)':>17}")
+    for size in sizes:
+        _, _, positions = coordinates_batch(make_synthetic_rows(size))
+        build_time, index = best_time(build_spatial_index, positions, repeat=1)
+
+        rng = random.Random(size)
+        queries = [positions[rng.randrange(size)] for _ in range(10)]
+        timings = [0.0, 0.0, 0.0, 0.0]
+        for point in queries:
+            elapsed, knn = best_time(nearest_neighbors, index, point, 5, repeat=repeat)
+            timings[0] += elapsed
+            elapsed, expected_knn = best_time(linear_nearest_neighbors, positions, point, 5, repeat=1)
+            timings[1] += elapsed
+            elapsed, within = best_time(radius_search, index, point, 50.0, repeat=repeat)
+            timings[2] += elapsed
+            elapsed, expected_within = best_time(linear_radius_search, positions, point, 50.0, repeat=1)
+            timings[3] += elapsed
+            # Compare kNN by distance (ties may pick different points) and radius hits by index
+            knn_matches = all(abs(a[1] - b[1]) < 1e-9 for a, b in zip(knn, expected_knn))
+            if not knn_matches or {i for i, _ in within} != {i for i, _ in expected_within}:
+                raise AssertionError(f"Spatial index disagrees with linear scan at {size} points")
+        record("spatial", "build", size, build_time)
+        record("spatial", "knn", size, timings[0] / len(queries))
+        record("spatial", "radius", size, timings[2] / len(queries))
+        knn_ms, scan_knn_ms, radius_ms, scan_radius_ms = (t / len(queries) * 1000 for t in timings)
+        print(
+            f"  {size:>10,}  {build_time:>10.3f}  {knn_ms:>9.3f}  {scan_knn_ms:>14.3f}  "
+            f"{radius_ms:>12.3f}  {scan_radius_ms:>17.3f}"
+        )
+
+CROSSMATCH_RADIUS_ARCSEC = 2.0
+CROSSMATCH_NAIVE_MAX_ROWS = 3_000
+
+def make_sky_catalogs(count: int, seed: int = 7) -> Tuple[List[float], List[float], List[float], List[float]]:
+    """Two overlapping RA/Dec catalogs: half of the second catalog re-observes the first with ~1" errors"""
+    rng = random.Random(seed)
+    ra1 = [rng.uniform(0, 360) for _ in range(count)]
+    dec1 = [math.degrees(math.asin(rng.uniform(-1, 1))) for _ in range(count)]
+    ra2, dec2 = [], []
+    for ra, dec in zip(ra1, dec1):
+        if rng.random() < 0.5:
+            ra2.append((ra + rng.gauss(0, 1 / 3600) / max(math.cos(math.radians(dec)), 1e-3)) % 360)
+            dec2.append(max(-90.0, min(90.0, dec + rng.gauss(0, 1 / 3600))))
+        else:
+            ra2.append(rng.uniform(0, 360))
+            dec2.append(math.degrees(math.asin(rng.uniform(-1, 1))))
+    return ra1, dec1, ra2, dec2
+
+def bench_crossmatch(sizes: List[int], repeat: int) -> None:
+    """Zone cross-match of two catalogs, checked against the O(n*m) match on small sizes"""
+    print(f"\n🎯 Cross-match (radius {CROSSMATCH_RADIUS_ARCSEC:g}\") of two catalogs")
+    print(f"  {'rows each':>10}  {'zones (s)':>10}  {'matches':>10}  {'naive (s)':>10}")
+    for size in sizes:
+        ra1, dec1, ra2, dec2 = make_sky_catalogs(size)
+        elapsed, matches = best_time(crossmatch, ra1, dec1, ra2, dec2, CROSSMATCH_RADIUS_ARCSEC, repeat=repeat)
+        naive = "-"
+        if size <= CROSSMATCH_NAIVE_MAX_ROWS:
+            naive_time, expected = best_time(crossmatch_naive, ra1, dec1, ra2, dec2, CROSSMATCH_RADIUS_ARCSEC, repeat=1)
+            if [(i, j) for i, j, _ in matches] != [(i, j) for i, j, _ in expected]:
+                raise AssertionError(f"Zone cross-match disagrees with naive match at {size} rows")
+            naive = f"{naive_time:.3f}"
+        record("crossmatch", "zones", size, elapsed, matches=len(matches))
+        print(f"  {size:>10,}  {elapsed:>10.3f}  {len(matches):>10,}  {naive:>10}")
+
+def bench_galactic(sizes: List[int], repeat: int) -> None:
+    """Time the galactocentric transform (accuracy is checked in tests/test_galactic.py)"""
+    print("\n🧭 ICRS -> Galactic -> galactocentric transform")
+    print(f"  {'rows':>10}  {'galactocentric (s)':>19}  {'rows/s':>12}")
+    for size in sizes:
+        rows = make_synthetic_rows(size)
+        ra_deg, dec_deg, _ = coordinates_batch(rows)
+        distances = [row["distance_kpc"] for row in rows]
+        elapsed, _ = best_time(equatorial_to_galactocentric_batch, ra_deg, dec_deg, distances, repeat=repeat)
+        record("galactic", "galactocentric", size, elapsed)
+        print(f"  {size:>10,}  {elapsed:>19.3f}  {size / elapsed:>12,.0f}")
+
+PIPELINE_CHUNK_ROWS = 100_000
+
+def _time_each(func: Callable, values: List, repeat: int) -> float:
+    """Best wall time of calling func once per value"""
+    return best_time(lambda: [func(value) for value in values], repeat=repeat)[0]
+
+def bench_pipeline(sizes: List[int], repeat: int) -> None:
+    """
+    Time each per-row scraper.py stage separately (RA parse, Dec parse,
+    Cartesian conversion, ID generation, JSON serialization). Catalogs are
+    generated and processed in chunks, so sizes up to 10^7 rows run in
+    bounded memory. The memory column is the tracemalloc peak of one
+    untimed process_galaxies + JSON pass per chunk, reset for every size
+    (ru_maxrss only ever grows, so it cannot be compared across sizes).
+    """
+    stages = ("parse_ra", "parse_dec", "cartesian", "make_id", "json")
+    print("\n🏭 scraper.py stages (per-row functions)")
+    print(f"  {'rows':>10}  " + "  ".join(f"{stage + ' (s)':>13}" for stage in stages) + f"  {'traced MB':>9}")
+    for size in sizes:
+        totals = dict.fromkeys(stages, 0.0)
+        json_bytes = 0
+        traced_peak = 0
+        for rows in iter_synthetic_chunks(size, PIPELINE_CHUNK_ROWS):
+            ra_strings = [row["ra"] for row in rows]
+            dec_strings = [row["dec"] for row in rows]
+            totals["parse_ra"] += _time_each(parse_ra_to_degrees, ra_strings, repeat)
+            totals["parse_dec"] += _time_each(parse_dec_to_degrees, dec_strings, repeat)
+
+            ra_deg = [parse_ra_to_degrees(value) for value in ra_strings]
+            dec_deg = [parse_dec_to_degrees(value) for value in dec_strings]
+            distances = [row["distance_kpc"] for row in rows]
+            totals["cartesian"] += best_time(
+                lambda: [equatorial_to_cartesian(*args) for args in zip(ra_deg, dec_deg, distances)], repeat=repeat
+            )[0]
+            totals["make_id"] += _time_each(make_galaxy_id, [row["name"] for row in rows], repeat)
+
+            galaxies = process_galaxies(rows)
+            elapsed, text = best_time(lambda: json.dumps(galaxies, indent=2, ensure_ascii=False), repeat=repeat)
+            totals["json"] += elapsed
+            json_bytes += len(text.encode("utf-8"))
+            del galaxies, text
+            traced_peak = max(traced_peak, traced_peak_bytes(
+                lambda: json.dumps(process_galaxies(rows), indent=2, ensure_ascii=False)))
+
+        peak_mb = traced_peak / (1024 * 1024)
+        for stage in stages:
+            extra = {"bytes": json_bytes} if stage == "json" else {}
+            record("pipeline", stage, size, totals[stage], traced_peak_mb=round(peak_mb, 3),
+                   process_peak_rss_mb=peak_memory_mb(), **extra)
+        print(f"  {size:>10,}  " + "  ".join(f"{totals[stage]:>13.3f}" for stage in stages)
+              + f"  {peak_mb:>9.1f}")
+        print(f"  {'rows/s':>10}  " + "  ".join(f"{size / totals[stage]:>13,.0f}" for stage in stages))
+
+def mixed_sexagesimal_forms(values: List[str], hours: bool) -> List[str]:
+    """Rewrite colon separated values in rotating catalog forms ("HH MM SS", "12h30m00s", "+41d16m09s")"""
+    letters = "hms" if hours else "dms"
+    forms = []
+    for idx, value in enumerate(values):
+        parts = value.split(":")
+        if idx % 3 == 0:
+            forms.append(value)
+        elif idx % 3 == 1:
+            forms.append(" ".join(parts))
+        else:
+            forms.append("".join(part + letter for part, letter in zip(parts, letters)))
+    return forms
+
+def bench_sexagesimal(sizes: List[int], repeat: int) -> None:
+    """Per-string RA/Dec parsers vs the sexagesimal column parser (colon, mixed forms and bytes input)"""
+    print("\n🔢 Sexagesimal parsing: per-string vs column")
+    print(f"  {'rows':>10}  {'per-string (s)':>14}  {'column (s)':>10}  {'mixed forms (s)':>15}  "
+          f"{'bytes (s)':>10}  {'speedup':>8}")
+    for size in sizes:
+        rows = make_synthetic_rows(size)
+        for key, hours, scalar in (("ra", True, parse_ra_to_degrees), ("dec", False, parse_dec_to_degrees)):
+            values = [row[key] for row in rows]
+            mixed = mixed_sexagesimal_forms(values, hours)
+            buffer = "\n".join(mixed).encode("utf-8")
+            scalar_time, expected = best_time(lambda: [scalar(value) for value in values], repeat=repeat)
+            column_time, (column, errors) = best_time(parse_sexagesimal_column, values, hours, repeat=repeat)
+            mixed_time, (from_mixed, _) = best_time(parse_sexagesimal_column, mixed, hours, repeat=repeat)
+            bytes_time, (from_bytes, _) = best_time(parse_sexagesimal_column, buffer, hours, repeat=repeat)
+            if errors or not expected == column == from_mixed == from_bytes:
+                raise AssertionError(f"Column {key} parser disagrees with the per-string parser at {size} rows")
+            record("sexagesimal", f"{key}_per_string", size, scalar_time)
+            record("sexagesimal", f"{key}_column", size, column_time)
+            record("sexagesimal", f"{key}_mixed", size, mixed_time)
+            print(f"  {size:>10,}  {scalar_time:>14.3f}  {column_time:>10.3f}  {mixed_time:>15.3f}  "
+                  f"{bytes_time:>10.3f}  {scalar_time / column_time:>7.2f}x  {key}")
+
+TILE_QUERY_HALF_SIZE_KPC = 100.0
+
+def bench_tiles(sizes: List[int], repeat: int) -> None:
+    """Write octree tiles, then check box queries read from the tiles against a linear scan"""
+    import tempfile
+    from array import array
+    from tiles import encode_tiles, linear_bbox, load_bbox, tiles_in_bbox
+
+    print(f"\n🧱 Octree tiles: {TILE_QUERY_HALF_SIZE_KPC * 2:g} kpc box queries")
+    print(f"  {'objects':>10}  {'build (s)':>10}  {'tiles':>7}  {'query (ms)':>11}  "
+          f"{'tiles read':>11}  {'scan (ms)':>10}")
+    for size in sizes:
+        galaxies = process_galaxies(make_synthetic_rows(size))
+        build_time, (index, files) = best_time(encode_tiles, galaxies, repeat=1)
+        # Tiles store float32 positions, so the reference scan uses the same values
+        flat32 = array("f", [v for position in galaxy_positions(galaxies) for v in position])
+        positions = list(zip(flat32[0::3], flat32[1::3], flat32[2::3]))
+
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, "tiles"))
+            for path, data in files.items():
+                with open(os.path.join(directory, path), "wb") as f:
+                    f.write(data)
+
+            rng = random.Random(size)
+            query_time = scan_time = 0.0
+            tiles_read = 0
+            for _ in range(10):
+                cx, cy, cz = positions[rng.randrange(size)]
+                lo = (cx - TILE_QUERY_HALF_SIZE_KPC, cy - TILE_QUERY_HALF_SIZE_KPC, cz - TILE_QUERY_HALF_SIZE_KPC)
+                hi = (cx + TILE_QUERY_HALF_SIZE_KPC, cy + TILE_QUERY_HALF_SIZE_KPC, cz + TILE_QUERY_HALF_SIZE_KPC)
+                elapsed, found = best_time(load_bbox, directory, lo, hi, index, repeat=repeat)
+                query_time += elapsed
+                elapsed, expected = best_time(linear_bbox, positions, lo, hi, repeat=1)
+                scan_time += elapsed
+                tiles_read += len(tiles_in_bbox(index, lo, hi))
+                if sorted(record["id"] for record in found) != sorted(galaxies[idx]["id"] for idx in expected):
+                    raise AssertionError(f"Tile box query disagrees with linear scan at {size} objects")
+        record("tiles", "build", size, build_time, tiles=len(files))
+        record("tiles", "bbox_query", size, query_time / 10)
+        print(f"  {size:>10,}  {build_time:>10.3f}  {len(files):>7,}  {query_time / 10 * 1000:>11.3f}  "
+              f"{tiles_read / 10:>11.1f}  {scan_time / 10 * 1000:>10.3f}")
+
+def bench_search(sizes: List[int], repeat: int) -> None:
+    """Trigram search index lookups vs scanning every name and alias"""
+    from search_index import build_search_index, encode_search_index, linear_search, load_search_index, search
+
+    print("\n🔎 Name/alias search: trigram index vs linear scan")
+    print(f"  {'objects':>10}  {'build (s)':>10}  {'index bytes':>12}  {'lookup (ms)':>12}  {'scan (ms)':>10}")
+    for size in sizes:
+        galaxies = process_galaxies(make_synthetic_rows(size))
+        build_time, index = best_time(build_search_index, galaxies, repeat=1)
+        data = encode_search_index(index)
+        loaded = load_search_index(json.loads(data))
+
+        rng = random.Random(size)
+        queries = [f"Synthetic {rng.randrange(size)}", f"syn j{rng.randrange(size):07d}"[:9], str(rng.randrange(size)),
+                   "tic 1", "J00", "zzz"]
+        lookup_time = scan_time = 0.0
+        for query in queries:
+            elapsed, found = best_time(search, loaded, query, repeat=repeat)
+            lookup_time += elapsed
+            elapsed, expected = best_time(linear_search, galaxies, query, repeat=1)
+            scan_time += elapsed
+            if found != expected:
+                raise AssertionError(f"Search index disagrees with linear scan for {query!r} at {size} objects")
+        record("search", "build", size, build_time, bytes=len(data))
+        record("search", "lookup", size, lookup_time / len(queries))
+        print(f"  {size:>10,}  {build_time:>10.3f}  {len(data):>12,}  {lookup_time / len(queries) * 1000:>12.3f}  "
+              f"{scan_time / len(queries) * 1000:>10.3f}")
+
+def traced_peak_bytes(func: Callable, *args) -> int:
+    """Peak bytes allocated by Python while func runs (tracemalloc), not counting what was live before"""
+    import tracemalloc
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def traced_build(func: Callable, *args) -> Tuple[float, int, object]:
+    """Run func under tracemalloc, returns (seconds, bytes still allocated by the result, result)"""
+    import tracemalloc
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed, allocated, result
+
+def bench_records(sizes: List[int], repeat: int) -> None:
+    """Memory held by nested dict records vs the columnar GalaxyTable (strings shared with the raw rows excluded)"""
+    from records import GalaxyTable
+
+    print("\n🗜️  Record memory: dict per galaxy vs GalaxyTable columns")
+    print(f"  {'rows':>10}  {'dicts (MB)':>11}  {'table (MB)':>11}  {'B/row dicts':>12}  {'B/row table':>12}  "
+          f"{'saving':>7}  {'dicts (s)':>10}  {'table (s)':>10}")
+    for size in sizes:
+        rows = make_synthetic_rows(size)
+        dict_time, dict_bytes, galaxies = traced_build(process_galaxies, rows)
+        sample = galaxies[::max(1, size // 1000)]
+        del galaxies
+        table_time, table_bytes, table = traced_build(GalaxyTable.from_rows, rows)
+        if sample != [table.record(idx) for idx in range(0, size, max(1, size // 1000))]:
+            raise AssertionError(f"GalaxyTable records differ from process_galaxies at {size} rows")
+        del table, rows
+        record("records", "dicts", size, dict_time, bytes=dict_bytes)
+        record("records", "table", size, table_time, bytes=table_bytes)
+        print(f"  {size:>10,}  {dict_bytes / 1e6:>11.1f}  {table_bytes / 1e6:>11.1f}  {dict_bytes / size:>12,.0f}  "
+              f"{table_bytes / size:>12,.0f}  {dict_bytes / table_bytes:>6.1f}x  {dict_time:>10.3f}  {table_time:>10.3f}")
+
+PATCHES_MAX_ROWS = 100_000
+PATCHES_CHANGE_FRACTION = 0.01
+
+def edited_rows(rows: List[Dict], seed: int) -> List[Dict]:
+    """Next release of a catalog: ~1% new distances, ~0.5% removed rows and as many added, a few new notes"""
+    rng = random.Random(seed)
+    edited = []
+    for row in rows:
+        roll = rng.random()
+        if roll < PATCHES_CHANGE_FRACTION / 2:
+            continue
+        if roll < PATCHES_CHANGE_FRACTION * 1.5:
+            row = {**row, "distance_kpc": round(row["distance_kpc"] * rng.uniform(0.9, 1.1), 1)}
+        elif roll < PATCHES_CHANGE_FRACTION * 1.6:
+            row = {**row, "notes": f"Revised in release {seed}"}
+        edited.append(row)
+    added = len(rows) - len(edited)
+    edited.extend(make_synthetic_rows(added, seed=seed, start=len(rows) * (seed + 1)))
+    return edited
+
+def bench_patches(sizes: List[int], repeat: int) -> None:
+    """Delta patches between two catalog releases: size on the wire and diff/apply time, checked byte for byte"""
+    from patches import apply_patch, apply_patch_bytes, encode_patch, next_version_chain, patch_chain, sha256_hex
+    from writers import write_json
+
+    print(f"\n🩹 Delta patches (~{PATCHES_CHANGE_FRACTION:.0%} of records changed, added and removed per release)")
+    print(f"  {'rows':>10}  {'full bytes':>12}  {'patch bytes':>12}  {'ratio':>7}  {'diff (s)':>9}  {'apply (s)':>10}")
+    for size in sizes:
+        if size > PATCHES_MAX_ROWS:
+            print(f"  {size:>10,}  skipped (limited to {PATCHES_MAX_ROWS:,} rows here)")
+            continue
+        # Three releases: v1 -> v2 -> v3, applied as a chain from v1
+        releases = [make_synthetic_rows(size)]
+        releases.append(edited_rows(releases[0], 1))
+        releases.append(edited_rows(releases[1], 2))
+        catalogs = [process_galaxies(rows) for rows in releases]
+        for galaxy in catalogs[2][::500]:
+            # Fields can disappear between releases too
+            del galaxy["size_estimate_kpc"]
+        encoded = [write_json(galaxies) for galaxies in catalogs]
+        del catalogs
+
+        # v1 is the versioned build on disk; a build without one would start a new chain instead of diffing
+        metadata = {"catalog_version": 1, "catalog_sha256": sha256_hex(encoded[0]), "patches": []}
+        patch_files = {}
+        diff_time = 0.0
+        for previous, current in zip(encoded, encoded[1:]):
+            elapsed, (fields, files) = best_time(next_version_chain, previous, metadata, current, repeat=repeat)
+            diff_time = max(diff_time, elapsed)
+            metadata = fields
+            patch_files.update(files)
+        chain = patch_chain(metadata, 1)
+        if metadata["catalog_version"] != 3 or [entry["to"] for entry in chain] != [2, 3]:
+            raise AssertionError(f"Unexpected version chain {metadata['patches']}")
+
+        patches = [json.loads(patch_files[entry["file"]]) for entry in chain]
+        catalog = encoded[0]
+        for patch in patches:
+            catalog = apply_patch_bytes(catalog, patch)
+        if catalog != encoded[2]:
+            raise AssertionError("Patch chain did not reproduce the latest catalog")
+        old_records = json.loads(encoded[0])
+        apply_time, _ = best_time(apply_patch, old_records, patches[0], repeat=repeat)
+
+        patch_size = len(encode_patch(patches[0]))
+        record("patches", "diff", size, diff_time, bytes=patch_size, full_bytes=len(encoded[1]))
+        record("patches", "apply", size, apply_time)
+        print(f"  {size:>10,}  {len(encoded[1]):>12,}  {patch_size:>12,}  {len(encoded[1]) / patch_size:>6.1f}x  "
+              f"{diff_time:>9.3f}  {apply_time:>10.3f}")
+
+def bench_writers(sizes: List[int], repeat: int) -> None:
+    """Bytes on the wire and encode time of every registered catalog format, raw and compressed"""
+    from writers import COMPRESSORS, WRITERS
+
+    print("\n📦 Catalog writers: bytes and encode time per format")
+    print(f"  {'rows':>10}  {'format':<9} {'bytes':>13} {'encode (s)':>11}"
+          + "".join(f" {name + ' bytes':>13} {name + ' (s)':>9}" for name in COMPRESSORS))
+    for size in sizes:
+        galaxies = process_galaxies(make_synthetic_rows(size))
+        for fmt, (_, encode) in WRITERS.items():
+            elapsed, data = best_time(encode, galaxies, repeat=repeat)
+            record("writers", fmt, size, elapsed, bytes=len(data))
+            line = f"  {size:>10,}  {fmt:<9} {len(data):>13,} {elapsed:>11.3f}"
+            for name, (_, compress) in COMPRESSORS.items():
+                compress_time, packed = best_time(compress, data, repeat=1)
+                record("writers", f"{fmt}+{name}", size, compress_time, bytes=len(packed))
+                line += f" {len(packed):>13,} {compress_time:>9.3f}"
+            print(line)
+
+STAR_SPECTRAL_TYPES = ("O9V", "B3V", "A1V", "F5IV-V", "G2V", "G8III", "K1.5III", "K5V", "M2.0V", "M5.5Ve", "DA2", "")
+STAR_MAGNITUDE_CUT = 9.0
+
+def write_synthetic_star_csv(path: str, count: int, seed: int = 11) -> int:
+    """HYG-style star CSV (RA in hours, distance in parsecs); returns how many rows pass STAR_MAGNITUDE_CUT"""
+    rng = random.Random(seed)
+    passing = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("id,proper,ra_hours,dec,dist,mag,absmag,spect\n")
+        for idx in range(count):
+            dist_pc = rng.uniform(1.3, 100.0)
+            absmag = rng.uniform(-5.0, 16.0)
+            mag = f"{absmag + 5 * math.log10(dist_pc) - 5:.2f}"
+            passing += float(mag) <= STAR_MAGNITUDE_CUT
+            # Every other row leaves the absolute magnitude to be derived
+            absmag_text = f"{absmag:.2f}" if idx % 2 else ""
+            f.write(f"star{idx},,{rng.uniform(0, 24):.6f},{math.degrees(math.asin(rng.uniform(-1, 1))):.5f},"
+                    f"{dist_pc:.4f},{mag},{absmag_text},"
+                    f"{STAR_SPECTRAL_TYPES[idx % len(STAR_SPECTRAL_TYPES)]}\n")
+    return passing
+
+def bench_stars(sizes: List[int], repeat: int) -> None:
+    """Chunked star ingestion with a magnitude cut, checked against the generated magnitudes and distances"""
+    import tempfile
+    from stars import encode_stars_binary, ingest_stars
+
+    def ingest_all(path: str) -> Tuple[List[Dict], int]:
+        stars, read = [], 0
+        for chunk, chunk_read in ingest_stars(path, 50_000, STAR_MAGNITUDE_CUT):
+            stars.extend(chunk)
+            read += chunk_read
+        return stars, read
+
+    print(f"\n⭐ Star ingestion (magnitude cut {STAR_MAGNITUDE_CUT:g})")
+    print(f"  {'rows':>10}  {'ingest (s)':>11}  {'rows/s':>10}  {'kept':>10}  {'binary (s)':>11}  {'bin bytes':>12}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stars.csv")
+            passing = write_synthetic_star_csv(path, size)
+            elapsed, (stars, read) = best_time(ingest_all, path, repeat=repeat)
+        if read != size or len(stars) != passing:
+            raise AssertionError(f"Kept {len(stars)} of {read} rows, expected {passing} of {size}")
+        sun = (8.0, 0.0, 0.02)
+        for star in stars[:1000]:
+            p = star["position_3d"]
+            offset = math.dist((p["x"], p["y"], p["z"]), sun)
+            if abs(offset - star["distance_kpc"]) > 1e-6 or star["apparentMagnitude"] > STAR_MAGNITUDE_CUT:
+                raise AssertionError(f"{star['id']}: bad position or magnitude")
+        binary_time, data = best_time(encode_stars_binary, stars, repeat=1)
+        record("stars", "ingest", size, elapsed, kept=len(stars))
+        record("stars", "encode_binary", len(stars), binary_time, bytes=len(data))
+        print(f"  {size:>10,}  {elapsed:>11.3f}  {size / elapsed:>10,.0f}  {len(stars):>10,}  "
+              f"{binary_time:>11.3f}  {len(data):>12,}")
+
+PLANNER_QUERIES = 1_000
+PLANNER_MAX_NODES = 10_000
+
+def bench_planner(sizes: List[int], repeat: int) -> None:
+    """Batch A*/Dijkstra route planner: routes/s in one process and the pool, checked against per-query Dijkstra"""
+    from route_planner import RoutePlanner
+
+    print(f"\n🗺️  Batch route planner (max jump {ROUTING_MAX_JUMP_KPC:.0f} kpc, {PLANNER_QUERIES:,} random queries)")
+    print(f"  {'nodes':>10}  {'graph (s)':>10}  {'jumps':>12}  {'1 process':>13}  {'pool':>13}")
+    for size in sizes:
+        if size > PLANNER_MAX_NODES:
+            print(f"  {size:>10,}  skipped (limited to {PLANNER_MAX_NODES:,} nodes here)")
+            continue
+        galaxies = process_galaxies(make_synthetic_rows(size))
+        graph_time, planner = best_time(RoutePlanner, galaxies, ROUTING_MAX_JUMP_KPC, repeat=1)
+        rng = random.Random(size)
+        queries = [(rng.choice(planner.ids), rng.choice(planner.ids)) for _ in range(PLANNER_QUERIES)]
+        inline_time, expected = best_time(lambda: planner.plan(queries, workers=1), repeat=repeat)
+        pool_time, actual = best_time(lambda: planner.plan(queries), repeat=1)
+        if actual != expected:
+            raise AssertionError("Process pool routes differ from the single process run")
+        if size <= ROUTING_MAX_NODES:
+            for (start_id, end_id), (path, distance) in list(zip(queries, expected))[:20]:
+                ref_path, ref_distance = shortest_path_reference(galaxies, start_id, end_id, ROUTING_MAX_JUMP_KPC)
+                if bool(path) != bool(ref_path) or abs(distance - ref_distance) > 1e-6 * max(1.0, ref_distance):
+                    raise AssertionError(f"Planner disagrees with Dijkstra for {start_id} -> {end_id}")
+        jumps = len(planner.graph["neighbors"]) // 2
+        record("planner", "graph", size, graph_time, jumps=jumps)
+        record("planner", "single_process", size, inline_time, routes_per_second=round(len(queries) / inline_time))
+        record("planner", "process_pool", size, pool_time, routes_per_second=round(len(queries) / pool_time))
+        print(f"  {size:>10,}  {graph_time:>10.3f}  {jumps:>12,}  "
+              f"{len(queries) / inline_time:>9,.0f} r/s  {len(queries) / pool_time:>9,.0f} r/s")
+
+UNCERTAINTY_SAMPLES = 1000
+UNCERTAINTY_MAX_OBJECTS = 10_000
+
+def bench_uncertainty(sizes: List[int], repeat: int) -> None:
+    """Monte Carlo error ellipsoids and neighbour bounds, one process vs the process pool"""
+    from uncertainty import neighbor_pairs, propagate_uncertainties
+
+    print(f"\n🎲 Monte Carlo uncertainties ({UNCERTAINTY_SAMPLES:,} samples per object, {os.cpu_count()} CPUs)")
+    print(f"  {'objects':>10}  {'pairs':>8}  {'1 process (s)':>14}  {'pool (s)':>9}  {'objects/s':>10}")
+    for size in sizes:
+        if size > UNCERTAINTY_MAX_OBJECTS:
+            print(f"  {size:>10,}  skipped (limited to {UNCERTAINTY_MAX_OBJECTS:,} objects here)")
+            continue
+        galaxies = process_galaxies(make_synthetic_rows(size))
+        pairs = neighbor_pairs(galaxy_positions(galaxies))
+        inline_time, expected = best_time(lambda: propagate_uncertainties(galaxies, pairs, UNCERTAINTY_SAMPLES, workers=1),
+                                          repeat=1)
+        pool_time, actual = best_time(lambda: propagate_uncertainties(galaxies, pairs, UNCERTAINTY_SAMPLES), repeat=1)
+        if actual != expected:
+            raise AssertionError("Process pool results differ from the single process run")
+        # Distance-only errors stretch the ellipsoid along the line of sight alone
+        for galaxy, ellipsoid in zip(galaxies, expected["ellipsoids"]):
+            sigma = galaxy["distance_uncertainty_kpc"]
+            major, middle, _ = ellipsoid["axes_kpc"]
+            if abs(major - sigma) > 0.1 * sigma + 1e-3 or middle > 1e-3 * max(sigma, 1.0):
+                raise AssertionError(f"{galaxy['id']}: axes {ellipsoid['axes_kpc']} for sigma {sigma} kpc")
+        record("uncertainty", "single_process", size, inline_time, pairs=len(pairs))
+        record("uncertainty", "process_pool", size, pool_time, pairs=len(pairs))
+        print(f"  {size:>10,}  {len(pairs):>8,}  {inline_time:>14.3f}  {pool_time:>9.3f}  {size / pool_time:>10,.0f}")
+
+KINEMATICS_EPOCHS = 1_000
+KINEMATICS_MAX_OBJECTS = 100_000
+KINEMATICS_SATELLITES = 100
+
+def synthetic_motion(count: int, satellites: int, seed: int = 42) -> List[Dict]:
+    """M31 and bound satellites of both hosts (orbits) followed by count nearby stars (straight lines)"""
+    from kinematics import M31_ID, MILKY_WAY_ID
+
+    rng = random.Random(seed)
+    objects = [{"id": M31_ID, "position": (378.0, 613.0, -283.0), "velocity": (0.066, -0.076, 0.049),
+                "host": MILKY_WAY_ID}]
+    for idx in range(satellites):
+        host = M31_ID if idx % 4 == 0 else MILKY_WAY_ID
+        offset = tuple(rng.uniform(-150, 150) for _ in range(3))
+        base = objects[0]["position"] if host == M31_ID else (0.0, 0.0, 0.0)
+        base_velocity = objects[0]["velocity"] if host == M31_ID else (0.0, 0.0, 0.0)
+        velocity = tuple(b + rng.gauss(0, 0.08) for b in base_velocity)
+        objects.append({"id": f"satellite_{idx}", "position": tuple(b + o for b, o in zip(base, offset)),
+                        "velocity": velocity, "host": host})
+    for idx in range(count):
+        objects.append({"id": f"star_{idx}", "position": (8.0 + rng.uniform(-0.02, 0.02), rng.uniform(-0.02, 0.02),
+                                                          0.02 + rng.uniform(-0.02, 0.02)),
+                        "velocity": tuple(rng.gauss(0, 0.04) for _ in range(3)), "host": None})
+    return objects
+
+def check_kepler_against_integration() -> float:
+    """Largest gap between kepler_position and an RK4 integration of a few mildly eccentric orbits"""
+    from kinematics import G_KPC3_MSUN_MYR2, kepler_position
+
+    mu = G_KPC3_MSUN_MYR2 * 1.0e12
+
+    def acceleration(p):
+        r3 = math.dist(p, (0.0, 0.0, 0.0)) ** 3
+        return [-mu * c / r3 for c in p]
+
+    worst = 0.0
+    for r0, v0, elapsed in (((50.0, 10.0, 5.0), (0.05, 0.15, 0.02), 3000.0),
+                            ((120.0, -40.0, 30.0), (0.02, 0.12, -0.05), -2500.0),
+                            ((60.0, 0.0, 0.0), (0.0, 0.4, 0.1), 1500.0)):
+        steps = 20_000
+        h = elapsed / steps
+        r, v = list(r0), list(v0)
+        for _ in range(steps):
+            a1 = acceleration(r)
+            r2 = [r[i] + h / 2 * v[i] for i in range(3)]
+            v2 = [v[i] + h / 2 * a1[i] for i in range(3)]
+            a2 = acceleration(r2)
+            r3 = [r[i] + h / 2 * v2[i] for i in range(3)]
+            v3 = [v[i] + h / 2 * a2[i] for i in range(3)]
+            a3 = acceleration(r3)
+            r4 = [r[i] + h * v3[i] for i in range(3)]
+            v4 = [v[i] + h * a3[i] for i in range(3)]
+            a4 = acceleration(r4)
+            r = [r[i] + h / 6 * (v[i] + 2 * v2[i] + 2 * v3[i] + v4[i]) for i in range(3)]
+            v = [v[i] + h / 6 * (a1[i] + 2 * a2[i] + 2 * a3[i] + a4[i]) for i in range(3)]
+        worst = max(worst, math.dist(r, kepler_position(r0, v0, mu, elapsed)))
+    return worst
+
+def bench_kinematics(sizes: List[int], repeat: int) -> None:
+    """Keyframe propagation of moving objects over many epochs, one process vs the process pool"""
+    from kinematics import (
+        _orbit_state,
+        decode_keyframes,
+        epoch_range,
+        kepler_position,
+        positions_at,
+        propagate_keyframes,
+    )
+
+    kepler_error = check_kepler_against_integration()
+    if kepler_error > 1e-3:
+        raise AssertionError(f"Kepler orbits drift {kepler_error:.2e} kpc from numerical integration")
+
+    # Decoded keyframes must reproduce the exact motion to within the int16 quantization
+    epochs = epoch_range(0.0, 1000.0, 41)
+    objects = synthetic_motion(500, KINEMATICS_SATELLITES)
+    keyframes = decode_keyframes(propagate_keyframes(objects, epochs, workers=1))
+    by_id = {obj["id"]: obj for obj in objects}
+    m31 = by_id["andromeda_m31"]
+    state = {orbit["id"]: orbit for orbit in _orbit_state(objects, 1000.0)["orbits"]}
+    for epoch in (0.0, 250.0, 1000.0):
+        m31_now = kepler_position(m31["position"], m31["velocity"], state[m31["id"]]["mu"], epoch)
+        for object_id, position, scale in zip(keyframes["ids"], positions_at(keyframes, epoch), keyframes["scales"]):
+            obj = by_id[object_id]
+            if obj["host"] is None:
+                expected = [p + v * epoch for p, v in zip(obj["position"], obj["velocity"])]
+            else:
+                orbit = state[object_id]
+                expected = kepler_position(orbit["r0"], orbit["v0"], orbit["mu"], epoch)
+                if orbit["around_m31"]:
+                    expected = [e + m for e, m in zip(expected, m31_now)]
+            if math.dist(expected, position) > 2 * scale + 1e-4 * max(1.0, math.dist(obj["position"], expected)):
+                raise AssertionError(f"{object_id} at {epoch} Myr: {position} instead of {expected}")
+
+    print(f"\n🌀 Keyframe propagation ({KINEMATICS_EPOCHS:,} epochs, {KINEMATICS_SATELLITES} orbits + N stars, "
+          f"{os.cpu_count()} CPUs; Kepler vs RK4 {kepler_error:.1e} kpc)")
+    print(f"  {'objects':>10}  {'1 process (s)':>14}  {'pool (s)':>9}  {'obj-epochs/s':>13}  {'bytes':>14}")
+    epochs = epoch_range(0.0, 1.0, KINEMATICS_EPOCHS)
+    for size in sizes:
+        if size > KINEMATICS_MAX_OBJECTS:
+            print(f"  {size:>10,}  skipped (limited to {KINEMATICS_MAX_OBJECTS:,} objects here)")
+            continue
+        objects = synthetic_motion(size, KINEMATICS_SATELLITES)
+        inline_time, expected = best_time(lambda: propagate_keyframes(objects, epochs, workers=1), repeat=1)
+        pool_time, actual = best_time(lambda: propagate_keyframes(objects, epochs), repeat=1)
+        if actual != expected:
+            raise AssertionError("Process pool keyframes differ from the single process run")
+        work = len(objects) * len(epochs)
+        record("kinematics", "single_process", size, inline_time, epochs=len(epochs), bytes=len(expected))
+        record("kinematics", "process_pool", size, pool_time, epochs=len(epochs), bytes=len(expected))
+        print(f"  {size:>10,}  {inline_time:>14.3f}  {pool_time:>9.3f}  {work / min(inline_time, pool_time):>13,.0f}  "
+              f"{len(expected):>14,}")
+        del expected, actual
+        gc.collect()
+
+SERVER_MAX_OBJECTS = 10_000
+SERVER_REQUESTS = 5_000
+SERVER_CONCURRENCY = 32
+
+def bench_server(sizes: List[int], repeat: int) -> None:
+    """Query server under load (p50/p99, req/s), with index answers checked against linear scans"""
+    import asyncio
+    import threading
+    from load_test import make_queries, run_load, server_stats
+    from ingest import normalize_name
+    from query_server import DEFAULT_HOST, CatalogIndex, QueryServer
+    from search_index import object_terms
+
+    print(f"\n🛰️  Query server ({SERVER_REQUESTS:,} mixed requests, {SERVER_CONCURRENCY} connections, half hot)")
+    print(f"  {'objects':>10}  {'index (s)':>10}  {'req/s':>9}  {'p50 (ms)':>9}  {'p99 (ms)':>9}  {'cache hits':>11}")
+    for size in sizes:
+        if size > SERVER_MAX_OBJECTS:
+            print(f"  {size:>10,}  skipped (limited to {SERVER_MAX_OBJECTS:,} objects here)")
+            continue
+        galaxies = process_galaxies(make_synthetic_rows(size))
+        index_time, index = best_time(CatalogIndex, galaxies, ROUTING_MAX_JUMP_KPC, repeat=1)
+        positions = index.positions
+
+        rng = random.Random(size)
+        for _ in range(20):
+            center = rng.choice(positions)
+            half = rng.uniform(50, 300)
+            lower, upper = [c - half for c in center], [c + half for c in center]
+            expected = [idx for idx, point in enumerate(positions)
+                        if all(lo <= c <= hi for lo, c, hi in zip(lower, point, upper))]
+            found = index.bbox(lower, upper, limit=size)
+            if [galaxy["id"] for galaxy in found["results"]] != [galaxies[idx]["id"] for idx in expected]:
+                raise AssertionError(f"Box query around {center} disagrees with a linear scan")
+            nearest = index.nearest(center, 10)["results"]
+            reference = linear_nearest_neighbors(positions, center, 10)
+            if len(nearest) != len(reference) or any(abs(hit["distance_kpc"] - d) > 1e-3
+                                                     for hit, (_, d) in zip(nearest, reference)):
+                raise AssertionError(f"Nearest neighbours of {center} disagree with a linear scan")
+            name = rng.choice(galaxies)["name"][:rng.randint(2, 6)]
+            prefix = normalize_name(name)
+            expected_ids = {g["id"] for g in galaxies if any(term.startswith(prefix) for term in object_terms(g))}
+            if {hit["id"] for hit in index.prefix(name, limit=size)["results"]} != expected_ids:
+                raise AssertionError(f"Prefix query '{name}' disagrees with a linear scan")
+
+        server = QueryServer(index)
+        loop = asyncio.new_event_loop()
+        listening = loop.run_until_complete(server.start(DEFAULT_HOST, 0))
+        port = listening.sockets[0].getsockname()[1]
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            paths = make_queries(galaxies, SERVER_REQUESTS, seed=size)
+            results = asyncio.run(run_load(DEFAULT_HOST, port, paths, SERVER_CONCURRENCY))
+            stats = asyncio.run(server_stats(DEFAULT_HOST, port))
+        finally:
+            loop.call_soon_threadsafe(listening.close)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+            server.executor.shutdown()
+        if results["errors"]:
+            raise AssertionError(f"{results['errors']} failed requests, e.g. {results['first_errors'][0]}")
+
+        record("server", "index", size, index_time)
+        record("server", "load", size, results["seconds"], requests=results["requests"],
+               requests_per_second=results["requests_per_second"], p50_ms=results["p50_ms"], p99_ms=results["p99_ms"])
+        print(f"  {size:>10,}  {index_time:>10.3f}  {results['requests_per_second']:>9,.0f}  {results['p50_ms']:>9.2f}  "
+              f"{results['p99_ms']:>9.2f}  {stats['cache']['hits']:>11,}")
+
+SUITES = {
+    "coordinates": bench_coordinates,
+    "crossmatch": bench_crossmatch,
+    "formats": bench_formats,
+    "galactic": bench_galactic,
+    "kinematics": bench_kinematics,
+    "patches": bench_patches,
+    "pipeline": bench_pipeline,
+    "planner": bench_planner,
+    "reader": bench_reader,
+    "records": bench_records,
+    "routing": bench_routing,
+    "search": bench_search,
+    "server": bench_server,
+    "sexagesimal": bench_sexagesimal,
+    "spatial": bench_spatial,
+    "stars": bench_stars,
+    "tiles": bench_tiles,
+    "uncertainty": bench_uncertainty,
+    "writers": bench_writers,
+}
+
+# Timings faster than this are too noisy to flag as regressions
+REGRESSION_MIN_SECONDS = 0.005
+
+def save_results(path: str, sizes: List[int], repeat: int) -> None:
+    """Write the recorded timings with enough context to compare runs"""
+    payload = {
+        "version": 1,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": sizes,
+        "repeat": repeat,
+        "results": RESULTS,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+        f.write("\n")
+
+def find_regressions(baseline_path: str, threshold: float) -> List[str]:
+    """Timings slower than the baseline run by more than threshold (a fraction)"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["suite"], r["name"], r["rows"]): r["seconds"] for r in json.load(f)["results"]}
+    regressions = []
+    for result in RESULTS:
+        before = baseline.get((result["suite"], result["name"], result["rows"]))
+        if before is None or max(before, result["seconds"]) < REGRESSION_MIN_SECONDS:
+            continue
+        if result["seconds"] > before * (1 + threshold):
+            regressions.append(
+                f"{result['suite']}/{result['name']} @ {result['rows']:,} rows: "
+                f"{before:.4f}s -> {result['seconds']:.4f}s (+{(result['seconds'] / before - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Benchmark the galaxy data pipeline")
+    parser.add_argument("suites", nargs="*", metavar="suite",
+                        help=f"Benchmark suites to run: {', '.join(SUITES)} (default: all)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000],
+                        help="Catalog sizes (rows) to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement (best is kept)")
+    parser.add_argument("--save", metavar="PATH", help="Write the timings of this run as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against a saved run and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed slowdown against --baseline as a fraction (default: 0.2)")
+    args = parser.parse_args()
+    unknown = [name for name in args.suites if name not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(unknown)}")
+
+    print("⏱️  Galaxy Pipeline Benchmarks")
+    print("=" * 50)
+    for name in args.suites or SUITES:
+        SUITES[name](args.sizes, args.repeat)
+
+    if args.save:
+        save_results(args.save, args.sizes, args.repeat)
+        print(f"\n✓ Saved {len(RESULTS)} timings to {args.save}")
+    if args.baseline:
+        regressions = find_regressions(args.baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regressions over {args.threshold:.0%} against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            print("=" * 50)
+            sys.exit(1)
+        print(f"\n✓ No regressions over {args.threshold:.0%} against {args.baseline}")
+    print("=" * 50)
+
+if __name__ == "__main__":
+    main()
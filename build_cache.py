@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Incremental rebuild cache for the galaxy data build
+Every raw input row is hashed together with a fingerprint of the code that
+transforms it; the derived galaxy record is stored under that hash so re-runs
+only recompute new or changed rows. Derived artifacts (route tables, spatial
+index, particles, ...) are cached per stage under a key made of the stage's
+inputs and a fingerprint of its modules, so unchanged stages are skipped.
+Code fingerprints hash whole module sources, found by following imports, so
+they cannot go stale the way a hand-maintained function list can. Output
+files are only rewritten when their bytes actually change.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import pickle
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import scraper
+
+DEFAULT_CACHE_PATH = ".build_cache/galaxies.json"
+DEFAULT_STAGE_DIR = ".build_cache/stages"
+
+SOURCE_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def _imported_modules(tree: ast.AST) -> List[str]:
+    """Modules imported anywhere in a module, except inside main() (the command line entry point)"""
+    names: List[str] = []
+    pending = [tree]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+        elif isinstance(node, ast.FunctionDef) and node.name == "main":
+            continue
+        pending.extend(ast.iter_child_nodes(node))
+    return names
+
+def _local_sources(module_names: Sequence[str], root: str = SOURCE_ROOT) -> Dict[str, bytes]:
+    """Source of the named modules under root and every module under root they import"""
+    sources: Dict[str, bytes] = {}
+    pending = list(module_names)
+    while pending:
+        name = pending.pop()
+        path = os.path.join(root, *name.split(".")) + ".py"
+        if name in sources or not os.path.isfile(path):
+            continue
+        with open(path, "rb") as f:
+            sources[name] = f.read()
+        pending.extend(_imported_modules(ast.parse(sources[name])))
+    return sources
+
+@lru_cache(maxsize=None)
+def code_fingerprint(*module_names: str, root: str = SOURCE_ROOT) -> str:
+    """
+    Hash of the source of the named modules and their local imports
+    Imports inside functions count too (except in main()), so a lazily
+    imported helper cannot change without changing the fingerprint; nothing
+    is listed by hand
+    """
+    digest = hashlib.sha256()
+    for name, source in sorted(_local_sources(module_names, root).items()):
+        digest.update(name.encode("utf-8") + b"\0" + hashlib.sha256(source).digest())
+    return digest.hexdigest()
+
+def transform_fingerprint() -> str:
+    """Hash of the transform code (scraper.py and everything it imports), mixed into every row hash"""
+    return code_fingerprint(scraper.__name__)
+
+def row_hash(row: Dict, fingerprint: str) -> str:
+    """Content hash of one raw input row"""
+    payload = json.dumps(row, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256((fingerprint + payload).encode("utf-8")).hexdigest()
+
+def load_cache(path: str = DEFAULT_CACHE_PATH) -> Dict[str, Dict]:
+    """Load the row cache ({row hash: galaxy record}), empty if missing or unreadable"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache: Dict[str, Dict], path: str = DEFAULT_CACHE_PATH) -> None:
+    """Persist the row cache"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    write_if_changed(path, json.dumps(cache, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+def process_galaxies_cached(rows: Sequence[Dict], cache: Dict[str, Dict],
+                            galactocentric: bool = False) -> Tuple[List[Dict], Dict[str, Dict], int]:
+    """
+    Like scraper.process_galaxies, but reuses cached records for unchanged rows
+    Returns (galaxies, cache holding exactly the current rows, number of rows recomputed)
+    """
+    fingerprint = transform_fingerprint() + ("|galactocentric" if galactocentric else "")
+    hashes = [row_hash(row, fingerprint) for row in rows]
+    missing = [idx for idx, key in enumerate(hashes) if key not in cache]
+    computed = dict(zip(missing, scraper.process_galaxies([rows[idx] for idx in missing], galactocentric)))
+
+    galaxies = [computed[idx] if idx in computed else cache[key] for idx, key in enumerate(hashes)]
+    return galaxies, dict(zip(hashes, galaxies)), len(missing)
+
+def content_hash(value: Any) -> str:
+    """Hash of a JSON-serializable value, independent of dict ordering"""
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def file_hash(path: str) -> str:
+    """Hash of a file's bytes, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def stage_key(modules: Sequence[str], *inputs: Any) -> str:
+    """Cache key of a derived stage: fingerprint of its modules plus its (JSON-serializable) inputs"""
+    return content_hash([code_fingerprint(*modules), list(inputs)])
+
+def cached_stage(name: str, key: str, compute: Callable[[], Any], force: bool = False,
+                 cache_dir: str = DEFAULT_STAGE_DIR) -> Tuple[Any, bool]:
+    """
+    Return the stored result of stage name if it was computed under key,
+    else compute, store and return it. Only the latest result per stage is
+    kept. Returns (result, True if it came from the cache).
+    """
+    path = os.path.join(cache_dir, f"{name}.pickle")
+    if not force:
+        try:
+            with open(path, "rb") as f:
+                stored_key, value = pickle.load(f)
+            if stored_key == key:
+                return value, True
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            pass
+    value = compute()
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(path + ".tmp", "wb") as f:
+        pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + ".tmp", path)
+    return value, False
+
+def write_if_changed(path: str, data: bytes, force: bool = False) -> bool:
+    """Write data to path unless the file already holds exactly these bytes, returns True if written"""
+    if not force:
+        try:
+            if os.path.getsize(path) == len(data):
+                with open(path, "rb") as f:
+                    if f.read() == data:
+                        return False
+        except OSError:
+            pass
+    with open(path, "wb") as f:
+        f.write(data)
+    return True
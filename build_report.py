@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Validation and per-stage timing for the galaxy data build
+Every processed record is checked column by column before anything is
+written (coordinate ranges, non-negative distances and sizes, finite
+positions, unique ids). Each build stage records its wall time and memory
+so the JSON build report can be compared across catalog sizes.
+
+Memory fields: rss_mb / rss_delta_mb are the resident set after a stage and
+its change over the stage. process_peak_rss_mb is the process high-water mark
+(ru_maxrss), which never goes down, so it says nothing about later stages
+once an earlier one peaked higher. When tracemalloc is tracing (scraper.py
+--trace-memory), traced_peak_mb is the peak of Python allocations during that
+stage alone; the peak is reset at the start of every stage.
+"""
+
+import json
+import math
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from scraper import peak_memory_mb
+
+DEFAULT_REPORT_PATH = ".build_cache/build_report.json"
+
+# Validation errors listed in the report and on the console
+MAX_REPORTED_ERRORS = 50
+
+def _column_errors(ids: Sequence[str], values: Sequence, label: str, is_valid) -> List[str]:
+    """Error messages for the values of one column that fail is_valid"""
+    return [f"{ids[idx]}: {label} = {value!r}" for idx, value in enumerate(values) if not is_valid(value)]
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+def validate_galaxies(galaxies: Sequence[Dict]) -> List[str]:
+    """Check processed galaxy records column-wise, returns error messages (empty when valid)"""
+    ids = [g.get("id") or f"#{idx}" for idx, g in enumerate(galaxies)]
+    errors: List[str] = []
+
+    errors += _column_errors(ids, [g.get("name") for g in galaxies], "name",
+                             lambda v: isinstance(v, str) and v.strip() != "")
+    errors += _column_errors(ids, [g["coordinates"].get("ra_deg") for g in galaxies], "ra_deg",
+                             lambda v: _is_number(v) and 0 <= v < 360)
+    errors += _column_errors(ids, [g["coordinates"].get("dec_deg") for g in galaxies], "dec_deg",
+                             lambda v: _is_number(v) and -90 <= v <= 90)
+    for field in ("distance_kpc", "distance_uncertainty_kpc", "size_estimate_kpc"):
+        errors += _column_errors(ids, [g.get(field) for g in galaxies], field, lambda v: _is_number(v) and v >= 0)
+    for axis in ("x", "y", "z"):
+        errors += _column_errors(ids, [g["position_3d"].get(axis) for g in galaxies], f"position_3d.{axis}", _is_number)
+
+    seen = set()
+    for idx, galaxy_id in enumerate(g.get("id") for g in galaxies):
+        if not galaxy_id:
+            errors.append(f"#{idx}: missing id")
+        elif galaxy_id in seen:
+            errors.append(f"{galaxy_id}: duplicate id")
+        seen.add(galaxy_id)
+    return errors
+
+def current_memory_mb() -> Optional[float]:
+    """Current resident set size of this process in MB (None if unavailable)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def _round(value: Optional[float], digits: int = 3) -> Optional[float]:
+    return None if value is None else round(value, digits)
+
+class BuildReport:
+    """Collects stage timings, validation results and written outputs of one build"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.created = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.stages: List[Dict] = []
+        self.outputs: Dict[str, Dict] = {}
+        self.validation: Dict = {"checked": 0, "errors": [], "error_count": 0}
+        self.counts: Dict[str, int] = {}
+        self.formats: List[Dict] = []
+        self.status = "running"
+        self.error: Optional[str] = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict]:
+        """Time a build stage; the yielded dict can carry extra stage details"""
+        details: Dict = {}
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        rss_before = current_memory_mb()
+        start = time.perf_counter()
+        try:
+            yield details
+        finally:
+            seconds = time.perf_counter() - start
+            rss_after = current_memory_mb()
+            self.stages.append({
+                "name": name,
+                "seconds": _round(seconds, 6),
+                "rss_mb": _round(rss_after),
+                "rss_delta_mb": _round(rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+                "process_peak_rss_mb": _round(peak_memory_mb()),
+                "traced_peak_mb": _round(tracemalloc.get_traced_memory()[1] / (1024 * 1024)) if tracing else None,
+                **details,
+            })
+
+    def fail(self, exc: BaseException) -> None:
+        """Mark the build failed by an exception in the stage that was running"""
+        self.status = "failed"
+        stage = self.stages[-1]["name"] if self.stages else None
+        self.error = f"{stage}: {type(exc).__name__}: {exc}" if stage else f"{type(exc).__name__}: {exc}"
+
+    def record_output(self, path: str, size: int, written: bool) -> None:
+        """Note an output file, its size and whether it was rewritten"""
+        self.outputs[path] = {"bytes": size, "written": written}
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": 2,
+            "created": self.created,
+            "status": self.status,
+            "error": self.error,
+            "total_seconds": _round(time.perf_counter() - self.started, 6),
+            "process_peak_rss_mb": _round(peak_memory_mb()),
+            "counts": self.counts,
+            "stages": self.stages,
+            "validation": self.validation,
+            "formats": self.formats,
+            "outputs": self.outputs,
+        }
+
+    def save(self, path: str = DEFAULT_REPORT_PATH) -> None:
+        """Write the report as JSON"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
+
+    def print_summary(self) -> None:
+        """Console table of the stage timings"""
+        print("\n⏱  Build stages (RSS after each stage):")
+        for stage in self.stages:
+            memory = f"{stage['rss_mb']:.1f} MB" if stage["rss_mb"] is not None else "n/a"
+            traced = f"   traced peak {stage['traced_peak_mb']:.1f} MB" if stage["traced_peak_mb"] is not None else ""
+            print(f"  {stage['name']:<10} {stage['seconds'] * 1000:>10.1f} ms   {memory}{traced}")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Compact columnar binary export of the galaxy catalog
+The browser can wrap each numeric column in a Float32Array without parsing
+
+File layout (all values little-endian, every section 4-byte aligned):
+- Header: magic "SMCB", format version (u32), record count (u32), column count (u32)
+- Column directory: per column a 16-byte ASCII name, kind (u32: 0 = float32,
+  1 = string), byte offset (u32) and byte length (u32)
+- Float32 columns: count * components values (position_3d is interleaved x, y, z)
+- String columns: (count + 1) u32 offsets into a UTF-8 blob that follows them
+"""
+
+import struct
+import sys
+from array import array
+from typing import Dict, List, Sequence, Tuple
+
+MAGIC = b"SMCB"
+FORMAT_VERSION = 2
+
+HEADER = struct.Struct("<4sIII")
+DIRECTORY_ENTRY = struct.Struct("<16sIII")
+
+KIND_FLOAT32 = 0
+KIND_STRING = 1
+
+# (column name, accessor) for the float32 columns
+FLOAT_COLUMNS = [
+    ("position_3d", lambda g: (g["position_3d"]["x"], g["position_3d"]["y"], g["position_3d"]["z"])),
+    ("ra_deg", lambda g: (g["coordinates"]["ra_deg"],)),
+    ("dec_deg", lambda g: (g["coordinates"]["dec_deg"],)),
+    ("distance_kpc", lambda g: (g["distance_kpc"],)),
+    # Directory names are limited to 16 bytes (version 1 truncated this to "size_estimate_kp")
+    ("size_kpc", lambda g: (g["size_estimate_kpc"],)),
+]
+
+STRING_COLUMNS = ["id", "name", "type"]
+
+def _pad4(data: bytes) -> bytes:
+    """Pad a byte string with zeros to a multiple of 4 bytes"""
+    return data + b"\0" * (-len(data) % 4)
+
+def to_little_endian(values: array) -> bytes:
+    """Serialize an array in little-endian byte order"""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def from_little_endian(typecode: str, data: bytes) -> array:
+    """Deserialize little-endian bytes into an array"""
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+def encode_float_column(values: Sequence[float]) -> bytes:
+    """Encode floats as a little-endian float32 array"""
+    return to_little_endian(array("f", values))
+
+def encode_string_column(values: Sequence[str]) -> bytes:
+    """Encode strings as u32 offsets followed by a UTF-8 blob"""
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = array("I", [0])
+    total = 0
+    for item in encoded:
+        total += len(item)
+        offsets.append(total)
+    return to_little_endian(offsets) + _pad4(b"".join(encoded))
+
+def decode_string_column(data: bytes, count: int) -> List[str]:
+    """Decode a string column written by encode_string_column"""
+    offsets_size = (count + 1) * 4
+    offsets = from_little_endian("I", data[:offsets_size])
+    blob = data[offsets_size:]
+    return [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(count)]
+
+def encode_catalog(galaxies: Sequence[Dict]) -> bytes:
+    """Encode galaxy records into the columnar binary format"""
+    sections: List[Tuple[str, int, bytes]] = []
+    for name, accessor in FLOAT_COLUMNS:
+        values = [v for g in galaxies for v in accessor(g)]
+        sections.append((name, KIND_FLOAT32, encode_float_column(values)))
+    for name in STRING_COLUMNS:
+        sections.append((name, KIND_STRING, encode_string_column([g[name] for g in galaxies])))
+    return encode_sections(len(galaxies), sections)
+
+def encode_sections(count: int, sections: Sequence[Tuple[str, int, bytes]]) -> bytes:
+    """Assemble header, column directory and encoded (name, kind, data) sections of count records"""
+    offset = HEADER.size + DIRECTORY_ENTRY.size * len(sections)
+    directory = []
+    for name, kind, data in sections:
+        if len(name.encode("ascii")) > 16:
+            raise ValueError(f"Column name too long for the directory: {name}")
+        directory.append(DIRECTORY_ENTRY.pack(name.encode("ascii"), kind, offset, len(data)))
+        offset += len(data)
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, count, len(sections))
+    return header + b"".join(directory) + b"".join(data for _, _, data in sections)
+
+def read_directory(data: bytes) -> Tuple[int, Dict[str, Tuple[int, int, int]]]:
+    """Parse the header and column directory, returns (count, {name: (kind, offset, length)})"""
+    magic, version, count, column_count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a StarMap binary catalog")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported binary catalog version {version}")
+    columns = {}
+    for idx in range(column_count):
+        name, kind, offset, length = DIRECTORY_ENTRY.unpack_from(data, HEADER.size + idx * DIRECTORY_ENTRY.size)
+        columns[name.rstrip(b"\0").decode("ascii")] = (kind, offset, length)
+    return count, columns
+
+def decode_catalog(data: bytes) -> Dict[str, object]:
+    """Decode a binary catalog into {column name: array or list of str}"""
+    count, directory = read_directory(data)
+    columns: Dict[str, object] = {"count": count}
+    for name, (kind, offset, length) in directory.items():
+        section = data[offset:offset + length]
+        if kind == KIND_FLOAT32:
+            columns[name] = from_little_endian("f", section)
+        else:
+            columns[name] = decode_string_column(section, count)
+    return columns
+
+def write_catalog_binary(galaxies: Sequence[Dict], path: str) -> int:
+    """Write the binary catalog to path, returns the number of bytes written"""
+    data = encode_catalog(galaxies)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+def read_catalog_binary(path: str) -> Dict[str, object]:
+    """Read and decode a binary catalog file"""
+    with open(path, "rb") as f:
+        return decode_catalog(f.read())
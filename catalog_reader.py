@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped reader for the binary catalog (galaxies.bin, see catalog_binary.py)
+Opening a catalog maps the file and parses only the header and column
+directory. Columns are exposed as zero-copy float32 memoryviews (or numpy
+arrays when numpy is installed) over the mapping, so only the pages that are
+actually read get loaded. Records are decoded one at a time; a lookup by id
+searches the id column's UTF-8 blob with mmap.find and checks the hit
+against the offsets, so no id index has to be built up front.
+
+    with CatalogReader("public/data/galaxies.bin") as catalog:
+        xyz = catalog.positions            # flat x, y, z float32 view
+        m31 = catalog.get("andromeda_m31")  # one record dict
+"""
+
+import mmap
+import sys
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from catalog_binary import KIND_FLOAT32, KIND_STRING, from_little_endian, read_directory
+
+try:
+    import numpy  # optional, only needed for as_numpy()
+except ImportError:
+    numpy = None
+
+# Memoryviews can only be zero-copy when the file's byte order is native
+ZERO_COPY = sys.byteorder == "little"
+
+class CatalogReader:
+    """Lazy, read-only view of a binary catalog file"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count, self.directory = read_directory(self._mm)
+        self._views: List[memoryview] = []
+        self._columns: Dict[str, object] = {}
+        self._strings: Dict[str, Tuple[object, int]] = {}
+        self._found: Dict[str, int] = {}
+
+    def _view(self, typecode: str, offset: int, length: int):
+        """Zero-copy typed view of a byte range (a decoded copy on big-endian hosts)"""
+        if not ZERO_COPY:
+            return from_little_endian(typecode, self._mm[offset:offset + length])
+        view = memoryview(self._mm)[offset:offset + length].cast(typecode)
+        self._views.append(view)
+        return view
+
+    def column(self, name: str):
+        """Float32 column as a memoryview (position_3d is interleaved x, y, z)"""
+        if name not in self._columns:
+            kind, offset, length = self.directory[name]
+            if kind != KIND_FLOAT32:
+                raise ValueError(f"{name} is not a float32 column")
+            self._columns[name] = self._view("f", offset, length)
+        return self._columns[name]
+
+    def as_numpy(self, name: str):
+        """Float32 column as a read-only numpy array over the mapping (position_3d as n x 3)"""
+        if numpy is None:
+            raise RuntimeError("numpy is not installed (pip install numpy)")
+        kind, offset, length = self.directory[name]
+        if kind != KIND_FLOAT32:
+            raise ValueError(f"{name} is not a float32 column")
+        values = numpy.frombuffer(self._mm, dtype="<f4", count=length // 4, offset=offset)
+        return values.reshape(self.count, -1) if len(values) != self.count else values
+
+    @property
+    def positions(self):
+        return self.column("position_3d")
+
+    @property
+    def ra_deg(self):
+        return self.column("ra_deg")
+
+    @property
+    def dec_deg(self):
+        return self.column("dec_deg")
+
+    @property
+    def distance_kpc(self):
+        return self.column("distance_kpc")
+
+    def _string_column(self, name: str) -> Tuple[object, int]:
+        """(offsets view, byte offset of the UTF-8 blob) of a string column"""
+        if name not in self._strings:
+            kind, offset, _ = self.directory[name]
+            if kind != KIND_STRING:
+                raise ValueError(f"{name} is not a string column")
+            offsets_size = (self.count + 1) * 4
+            self._strings[name] = (self._view("I", offset, offsets_size), offset + offsets_size)
+        return self._strings[name]
+
+    def string(self, name: str, idx: int) -> str:
+        """One value of a string column"""
+        offsets, blob = self._string_column(name)
+        return self._mm[blob + offsets[idx]:blob + offsets[idx + 1]].decode("utf-8")
+
+    def position(self, idx: int) -> Tuple[float, float, float]:
+        positions = self.positions
+        return positions[3 * idx], positions[3 * idx + 1], positions[3 * idx + 2]
+
+    def record(self, idx: int) -> Dict:
+        """Record idx decoded from every column (float32 precision)"""
+        if not 0 <= idx < self.count:
+            raise IndexError(idx)
+        x, y, z = self.position(idx)
+        record = {
+            "id": self.string("id", idx),
+            "name": self.string("name", idx),
+            "type": self.string("type", idx),
+            "coordinates": {"ra_deg": self.ra_deg[idx], "dec_deg": self.dec_deg[idx]},
+            "position_3d": {"x": x, "y": y, "z": z},
+            "distance_kpc": self.distance_kpc[idx],
+        }
+        if "size_kpc" in self.directory:
+            record["size_estimate_kpc"] = self.column("size_kpc")[idx]
+        return record
+
+    def index_of(self, object_id: str) -> Optional[int]:
+        """Row of an id, found by scanning the id blob in C; None when absent"""
+        idx = self._found.get(object_id)
+        if idx is not None:
+            return idx
+        offsets, blob = self._string_column("id")
+        needle = object_id.encode("utf-8")
+        end = blob + offsets[self.count]
+        position = self._mm.find(needle, blob, end)
+        while position != -1:
+            # A hit only counts when it spans exactly one whole id
+            start = position - blob
+            row = bisect_left(offsets, start)
+            if row < self.count and offsets[row] == start and offsets[row + 1] == start + len(needle):
+                self._found[object_id] = row
+                return row
+            position = self._mm.find(needle, position + 1, end)
+        return None
+
+    def get(self, object_id: str) -> Optional[Dict]:
+        """Record with the given id, or None"""
+        idx = self.index_of(object_id)
+        return None if idx is None else self.record(idx)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, idx: int) -> Dict:
+        return self.record(idx)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (self.record(idx) for idx in range(self.count))
+
+    def close(self) -> None:
+        """Release the column views and unmap the file"""
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._columns = {}
+        self._strings = {}
+        self._mm.close()
+
+    def __enter__(self) -> "CatalogReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Positional cross-match between catalogs
+Objects are bucketed into declination zones one match radius tall and sorted
+by RA within each zone, so every source only compares against the few
+candidates in an RA window of the three neighbouring zones instead of the
+whole other catalog
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Sequence, Tuple
+
+Match = Tuple[int, int, float]
+
+def _unit_vectors(ra_deg: Sequence[float], dec_deg: Sequence[float]) -> List[Tuple[float, float, float]]:
+    """Unit vectors on the sky for RA/Dec columns in degrees"""
+    vectors = []
+    for ra, dec in zip(ra_deg, dec_deg):
+        ra_rad, dec_rad = math.radians(ra), math.radians(dec)
+        cos_dec = math.cos(dec_rad)
+        vectors.append((cos_dec * math.cos(ra_rad), cos_dec * math.sin(ra_rad), math.sin(dec_rad)))
+    return vectors
+
+def _chord_to_arcsec(chord_sq: float) -> float:
+    """Angular separation in arcsec for a squared chord length between unit vectors"""
+    return math.degrees(2 * math.asin(min(1.0, math.sqrt(chord_sq) / 2))) * 3600
+
+def build_zones(ra_deg: Sequence[float], dec_deg: Sequence[float], zone_height_deg: float) -> Dict[int, Tuple[List[float], List[int]]]:
+    """Bucket objects into declination zones, each holding (sorted RAs, catalog indices)"""
+    order = sorted(range(len(ra_deg)), key=lambda i: (int((dec_deg[i] + 90) // zone_height_deg), ra_deg[i]))
+    zones: Dict[int, Tuple[List[float], List[int]]] = {}
+    for i in order:
+        ras, indices = zones.setdefault(int((dec_deg[i] + 90) // zone_height_deg), ([], []))
+        ras.append(ra_deg[i])
+        indices.append(i)
+    return zones
+
+def crossmatch(ra1: Sequence[float], dec1: Sequence[float], ra2: Sequence[float], dec2: Sequence[float],
+               radius_arcsec: float, nearest_only: bool = False) -> List[Match]:
+    """
+    Find every pair (i, j) with catalog 1 object i within radius_arcsec of
+    catalog 2 object j. Returns (i, j, separation in arcsec) sorted by i then
+    separation; with nearest_only, only the closest j is kept for each i.
+    """
+    radius_deg = radius_arcsec / 3600
+    # Zones are at least a radius tall so the neighbouring zones cover every match
+    zone_height = max(radius_deg, 1e-6)
+    zones = build_zones(ra2, dec2, zone_height)
+    vectors1 = _unit_vectors(ra1, dec1)
+    vectors2 = _unit_vectors(ra2, dec2)
+    max_chord_sq = (2 * math.sin(math.radians(radius_deg) / 2)) ** 2
+
+    matches: List[Match] = []
+    for i, (ra, dec) in enumerate(zip(ra1, dec1)):
+        x1, y1, z1 = vectors1[i]
+        zone = int((dec + 90) // zone_height)
+        # RA half-width of the search window, widened for the highest |dec| it can reach
+        extreme_dec = min(90.0, abs(dec) + radius_deg)
+        cos_extreme = math.cos(math.radians(extreme_dec))
+        alpha = 360.0 if cos_extreme < 1e-9 else min(360.0, radius_deg / cos_extreme)
+        if alpha >= 180.0:
+            windows = [(0.0, 360.0)]
+        else:
+            windows = [(ra - alpha, ra + alpha)]
+            if ra - alpha < 0:
+                windows.append((ra - alpha + 360, 360.0))
+            if ra + alpha >= 360:
+                windows.append((0.0, ra + alpha - 360))
+
+        found: List[Match] = []
+        for neighbour in (zone - 1, zone, zone + 1):
+            bucket = zones.get(neighbour)
+            if bucket is None:
+                continue
+            ras, indices = bucket
+            for low, high in windows:
+                for k in range(bisect_left(ras, low), bisect_right(ras, high)):
+                    j = indices[k]
+                    x2, y2, z2 = vectors2[j]
+                    chord_sq = (x1 - x2) ** 2 + (y1 - y2) ** 2 + (z1 - z2) ** 2
+                    if chord_sq <= max_chord_sq:
+                        found.append((i, j, _chord_to_arcsec(chord_sq)))
+
+        if found:
+            found.sort(key=lambda match: match[2])
+            matches.extend(found[:1] if nearest_only else found)
+    return matches
+
+def crossmatch_naive(ra1: Sequence[float], dec1: Sequence[float], ra2: Sequence[float], dec2: Sequence[float],
+                     radius_arcsec: float) -> List[Match]:
+    """Reference O(n*m) cross-match, same output order as crossmatch()"""
+    vectors1 = _unit_vectors(ra1, dec1)
+    vectors2 = _unit_vectors(ra2, dec2)
+    max_chord_sq = (2 * math.sin(math.radians(radius_arcsec / 3600) / 2)) ** 2
+    matches: List[Match] = []
+    for i, (x1, y1, z1) in enumerate(vectors1):
+        found = []
+        for j, (x2, y2, z2) in enumerate(vectors2):
+            chord_sq = (x1 - x2) ** 2 + (y1 - y2) ** 2 + (z1 - z2) ** 2
+            if chord_sq <= max_chord_sq:
+                found.append((i, j, _chord_to_arcsec(chord_sq)))
+        found.sort(key=lambda match: match[2])
+        matches.extend(found)
+    return matches
+
+def crossmatch_galaxies(galaxies1: Sequence[Dict], galaxies2: Sequence[Dict], radius_arcsec: float,
+                        nearest_only: bool = False) -> List[Tuple[str, str, float]]:
+    """Cross-match two lists of galaxy records on coordinates.ra_deg/dec_deg, returns (id1, id2, separation)"""
+    matches = crossmatch(
+        [g["coordinates"]["ra_deg"] for g in galaxies1], [g["coordinates"]["dec_deg"] for g in galaxies1],
+        [g["coordinates"]["ra_deg"] for g in galaxies2], [g["coordinates"]["dec_deg"] for g in galaxies2],
+        radius_arcsec, nearest_only=nearest_only,
+    )
+    return [(galaxies1[i]["id"], galaxies2[j]["id"], separation) for i, j, separation in matches]
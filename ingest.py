@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Multi-source catalog ingestion for the galaxy database
+Parses several local catalog dumps (CSV or VizieR/NED-style tab separated
+text) in parallel worker processes, cross-matches them by name/alias and sky
+position, and merges them into raw galaxy rows for process_galaxies()
+"""
+
+import csv
+import os
+import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from crossmatch import crossmatch
+from scraper import parse_dec_column, parse_ra_column
+from sexagesimal import parse_sexagesimal
+
+# Column names used by common catalogs, mapped to the raw galaxy row fields
+COLUMN_ALIASES = {
+    "name": "name", "galaxy": "name", "object": "name", "objname": "name",
+    "alternate_names": "alternate_names", "aliases": "alternate_names", "altname": "alternate_names",
+    "type": "type", "mtype": "type", "morph": "type", "morphology": "type",
+    "ra": "ra", "raj2000": "ra", "_raj2000": "ra", "ra_j2000": "ra",
+    "dec": "dec", "dej2000": "dec", "_dej2000": "dec", "dec_j2000": "dec",
+    "distance_kpc": "distance_kpc", "dist": "distance_kpc", "d": "distance_kpc", "dkpc": "distance_kpc",
+    "size_estimate_kpc": "size_estimate_kpc", "size": "size_estimate_kpc", "diam": "size_estimate_kpc",
+    "notes": "notes", "note": "notes", "comment": "notes",
+}
+
+NUMERIC_FIELDS = ("distance_kpc", "size_estimate_kpc")
+
+# Objects closer than this on the sky are treated as the same galaxy
+DEFAULT_MATCH_RADIUS_ARCSEC = 60.0
+
+def normalize_name(name: str) -> str:
+    """Fold a name or alias to a comparison key ("Boötes I" -> "bootesi")"""
+    folded = unicodedata.normalize("NFKD", name)
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return re.sub(r"[^a-z0-9]", "", folded.lower())
+
+def degrees_to_ra_string(ra_deg: float) -> str:
+    """Format RA in degrees as HH:MM:SS.S"""
+    total = round(ra_deg / 15 * 3600, 1) % (24 * 3600)
+    hours, rest = divmod(total, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{seconds:04.1f}"
+
+def degrees_to_dec_string(dec_deg: float) -> str:
+    """Format Dec in degrees as +/-DD:MM:SS"""
+    sign = "-" if dec_deg < 0 else "+"
+    total = round(abs(dec_deg) * 3600)
+    degrees, rest = divmod(total, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{sign}{degrees:02d}:{minutes:02d}:{seconds:02d}"
+
+def normalize_coordinate(value: str, is_ra: bool) -> str:
+    """Bring RA/Dec to the colon-separated form, accepting "HH MM SS", "00h42m44s", "12.5h" and decimal degrees"""
+    value = value.strip()
+    if ":" not in value and len(value.split()) == 1:
+        degrees = parse_sexagesimal(value, hours=is_ra)
+        return degrees_to_ra_string(degrees) if is_ra else degrees_to_dec_string(degrees)
+    return ":".join(value.split())
+
+def _to_raw_row(record: Dict[str, str]) -> Optional[Dict]:
+    """
+    Convert a parsed text record (mapped column names) to a raw galaxy row
+    None for rows without a name or coordinates; ValueError for unparseable values
+    """
+    if not record.get("name") or not record.get("ra") or not record.get("dec"):
+        return None
+    try:
+        ra, dec = normalize_coordinate(record["ra"], is_ra=True), normalize_coordinate(record["dec"], is_ra=False)
+    except ValueError:
+        raise ValueError(f"bad coordinates {record['ra'].strip()!r} {record['dec'].strip()!r}") from None
+    row: Dict = {
+        "name": record["name"].strip(),
+        "alternate_names": [a.strip() for a in re.split(r"[;,]", record.get("alternate_names") or "") if a.strip()],
+        "type": (record.get("type") or "").strip(),
+        "ra": ra,
+        "dec": dec,
+        "notes": (record.get("notes") or "").strip(),
+    }
+    for field, hours in (("ra", True), ("dec", False)):
+        try:
+            parse_sexagesimal(row[field], hours=hours)
+        except ValueError as e:
+            raise ValueError(f"bad {field} {record[field].strip()!r} ({e})") from None
+    for field in NUMERIC_FIELDS:
+        text = (record.get(field) or "").strip()
+        try:
+            row[field] = float(text) if text else None
+        except ValueError:
+            raise ValueError(f"non-numeric {field} {text!r}") from None
+    return row
+
+def _rows_from_records(path: str, records: Iterable[Tuple[int, Dict[str, str]]]) -> Tuple[List[Dict], List[str]]:
+    """Convert (line number, record) pairs to raw rows, skipping bad rows with a "path:line: reason" note"""
+    rows, skipped = [], []
+    for line_number, record in records:
+        try:
+            row = _to_raw_row(record)
+        except ValueError as e:
+            skipped.append(f"{path}:{line_number}: {record.get('name') or '?'}: {e}")
+            continue
+        if row:
+            rows.append(row)
+    return rows, skipped
+
+def _map_columns(header: Sequence[str]) -> List[Optional[str]]:
+    """Map catalog column names to raw row field names (None for unused columns)"""
+    return [COLUMN_ALIASES.get(column.strip().lower()) for column in header]
+
+ParsedSource = Tuple[List[Dict], List[str]]
+
+# Parser registry: format name -> function(path) returning (raw rows, skipped row notes)
+PARSERS: Dict[str, Callable[[str], ParsedSource]] = {}
+
+def register_parser(fmt: str):
+    """Register a catalog parser for a format name (also used as the file extension)"""
+    def decorator(func: Callable[[str], ParsedSource]) -> Callable[[str], ParsedSource]:
+        PARSERS[fmt] = func
+        return func
+    return decorator
+
+@register_parser("csv")
+def parse_csv_catalog(path: str) -> ParsedSource:
+    """Parse a comma separated catalog with a header row"""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        rows = (values for values in reader if not (values and values[0].startswith("#")))
+        fields = _map_columns(next(rows, []))
+        return _rows_from_records(path, (
+            (reader.line_num, {field: value for field, value in zip(fields, values) if field})
+            for values in rows
+        ))
+
+@register_parser("tsv")
+def parse_text_catalog(path: str) -> ParsedSource:
+    """
+    Parse a tab (or '|') separated text dump as produced by VizieR and NED:
+    '#' comment lines, a header row, optionally a units row and a row of
+    dashes, then data rows
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [(number, line.rstrip("\n")) for number, line in enumerate(f, 1)
+                 if line.strip() and not line.startswith("#")]
+    if not lines:
+        return [], []
+    delimiter = "\t" if "\t" in lines[0][1] else "|"
+
+    def split(line: str) -> List[str]:
+        return [cell.strip() for cell in line.strip().strip("|").split(delimiter)]
+
+    fields = _map_columns(split(lines[0][1]))
+    body = lines[1:]
+    # Skip the units row and dashes separator that precede the data
+    for idx, (_, line) in enumerate(body[:2]):
+        if set(line.strip()) <= set("-\t| "):
+            body = body[idx + 1:]
+            break
+
+    return _rows_from_records(path, (
+        (number, {field: value for field, value in zip(fields, split(line)) if field})
+        for number, line in body
+    ))
+
+PARSERS["txt"] = parse_text_catalog
+
+def parse_source(source: Tuple[str, str, str]) -> ParsedSource:
+    """Worker entry point: parse one (label, path, format) source into (rows, skipped row notes)"""
+    label, path, fmt = source
+    rows, skipped = PARSERS[fmt](path)
+    for row in rows:
+        row["source"] = label
+    return rows, skipped
+
+def parse_sources(sources: Sequence[Tuple[str, str, str]], workers: Optional[int] = None) -> List[ParsedSource]:
+    """Parse every source in its own worker process, preserving source order"""
+    if len(sources) <= 1 or workers == 1:
+        return [parse_source(source) for source in sources]
+    with ProcessPoolExecutor(max_workers=workers or min(len(sources), os.cpu_count() or 1)) as pool:
+        return list(pool.map(parse_source, sources))
+
+def cross_match(rows: Sequence[Dict], radius_arcsec: float = DEFAULT_MATCH_RADIUS_ARCSEC) -> List[List[int]]:
+    """
+    Group rows from different sources that describe the same object
+    Sources are visited in input order. A row joins the group of an earlier
+    row (its anchor, the first row of the group) that shares a normalized
+    name/alias with it or, failing that, lies within radius_arcsec of it;
+    otherwise it anchors a new group. Rows never match rows of their own
+    source, a group takes at most one row per source, and matches are only
+    made against anchors, so groups never chain. Returns groups of row
+    indices, each group in input order.
+    """
+    ra_deg = parse_ra_column([row["ra"] for row in rows])
+    dec_deg = parse_dec_column([row["dec"] for row in rows])
+
+    groups: List[List[int]] = []
+    group_sources: List[set] = []
+    anchor_names: Dict[str, int] = {}
+    anchors: List[int] = []
+
+    def names(row: Dict) -> List[str]:
+        return [key for key in (normalize_name(n) for n in [row["name"]] + row["alternate_names"]) if key]
+
+    def join(idx: int, group: int) -> None:
+        groups[group].append(idx)
+        group_sources[group].add(rows[idx]["source"])
+
+    source_order = list(dict.fromkeys(row["source"] for row in rows))
+    for source in source_order:
+        members = [idx for idx, row in enumerate(rows) if row["source"] == source]
+        unmatched = []
+        # Name matches take precedence over positional ones
+        for idx in members:
+            group = next((anchor_names[key] for key in names(rows[idx]) if key in anchor_names), None)
+            if group is not None and source not in group_sources[group]:
+                join(idx, group)
+            else:
+                unmatched.append(idx)
+
+        # Then the closest remaining (row, anchor) pairs, each used at most once
+        if unmatched and anchors:
+            pairs = crossmatch([ra_deg[i] for i in unmatched], [dec_deg[i] for i in unmatched],
+                               [ra_deg[i] for i in anchors], [dec_deg[i] for i in anchors],
+                               radius_arcsec)
+            matched = set()
+            for i, group, _ in sorted(pairs, key=lambda pair: pair[2]):
+                if i not in matched and source not in group_sources[group]:
+                    join(unmatched[i], group)
+                    matched.add(i)
+            unmatched = [idx for i, idx in enumerate(unmatched) if i not in matched]
+
+        for idx in unmatched:
+            groups.append([idx])
+            group_sources.append({source})
+            anchors.append(idx)
+            for key in names(rows[idx]):
+                anchor_names.setdefault(key, len(groups) - 1)
+
+    for group in groups:
+        group.sort()
+    groups.sort(key=lambda group: group[0])
+    return groups
+
+def merge_group(rows: Sequence[Dict]) -> Dict:
+    """Merge rows of one object, earlier (higher priority) sources win per field"""
+    merged = dict(rows[0])
+    for row in rows[1:]:
+        for field, value in row.items():
+            if merged.get(field) in (None, "", []):
+                merged[field] = value
+
+    names = []
+    for row in rows:
+        for name in [row["name"]] + row["alternate_names"]:
+            if normalize_name(name) not in {normalize_name(n) for n in names + [merged["name"]]}:
+                names.append(name)
+    merged["alternate_names"] = names
+    merged["source"] = " / ".join(dict.fromkeys(row["source"] for row in rows))
+    # Distance is left missing (ingest_catalogs drops the object); an unknown size is 0
+    if merged.get("size_estimate_kpc") is None:
+        merged["size_estimate_kpc"] = 0
+    return merged
+
+def ingest_catalogs(sources: Sequence[Tuple[str, str, str]], workers: Optional[int] = None,
+                    radius_arcsec: float = DEFAULT_MATCH_RADIUS_ARCSEC,
+                    skipped: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Parse, cross-match and merge catalog sources into raw galaxy rows
+    sources are (label, path, format) tuples in priority order; notes on rows
+    that could not be parsed, and on merged objects that no source gives a
+    distance for (they cannot be placed), are appended to skipped when given
+    """
+    rows = []
+    notes = []
+    for source_rows, source_skipped in parse_sources(sources, workers):
+        rows.extend(source_rows)
+        notes.extend(source_skipped)
+    merged = []
+    for group in cross_match(rows, radius_arcsec):
+        row = merge_group([rows[i] for i in group])
+        if row.get("distance_kpc") is None:
+            notes.append(f"{row['source']}: {row['name']}: no distance_kpc in any source")
+        else:
+            merged.append(row)
+    if skipped is not None:
+        skipped.extend(notes)
+    return merged
+
+def parse_source_spec(spec: str) -> Tuple[str, str, str]:
+    """Parse a LABEL=PATH[:FORMAT] command line source spec"""
+    label, _, path = spec.rpartition("=")
+    fmt = None
+    if ":" in path and path.rsplit(":", 1)[1] in PARSERS:
+        path, fmt = path.rsplit(":", 1)
+    if fmt is None:
+        fmt = os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in PARSERS:
+        raise ValueError(f"No parser registered for '{fmt}' ({spec})")
+    return label or os.path.basename(path), path, fmt
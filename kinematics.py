@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Epoch propagation of catalog positions into animation keyframes
+Objects with kinematics (proper motion in RA/Dec and radial velocity) are
+moved in the galactocentric frame the front end renders stars in (see
+scraper.equatorial_to_galactocentric_batch; velocities include the solar
+motion):
+- stars move in straight lines
+- galaxies follow point-mass (two-body) orbits: M31 around the Milky Way,
+  satellites around whichever of the two they are bound to. The Milky Way
+  defines the frame and stays at the origin; an M31 without kinematics stays
+  at its catalog position and its satellites orbit that fixed point.
+Objects without kinematics are not animated and keep their position_3d.
+Keyframes are written in the frame of the catalog's position_3d: each object
+starts at its position_3d, and in a heliocentric equatorial catalog (the
+default build) the galactocentric displacements are rotated into equatorial
+axes (GALACTOCENTRIC_TO_EQUATORIAL), so epoch 0 is the catalog itself.
+
+Epochs are split into chunks that run in a process pool; workers receive the
+initial state once, at start-up. Straight-line motion of a whole epoch is a
+single map() pipeline, orbits use the universal-variable Kepler solution.
+
+Keyframe buffer (little-endian, every section 4-byte aligned):
+- Header: magic "SMKF", format version (u32), object count N (u32), epoch count E (u32)
+- Epochs: E float32, Myr relative to J2000
+- Object ids as a string column (see catalog_binary.encode_string_column)
+- Origins: N * 3 float32, the J2000 position_3d (kpc)
+- Scales: N float32, kpc per quantization step
+- Frames: E * N * 3 int16, epoch-major; position = origin + frame * scale
+"""
+
+import csv
+import json
+import math
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from catalog_binary import (
+    decode_string_column,
+    encode_string_column,
+    from_little_endian,
+    to_little_endian,
+)
+from scraper import ICRS_TO_GALACTIC, equatorial_to_galactocentric_batch
+from stars import KINEMATIC_FIELDS
+
+MAGIC = b"SMKF"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sIII")
+
+KM_S_TO_KPC_MYR = 1.0227121650537077e-3
+# Tangential velocity in km/s of 1 mas/yr at 1 kpc
+KAPPA_KM_S = 4.740470463533348
+# Gravitational constant in kpc^3 / (Msun Myr^2)
+G_KPC3_MSUN_MYR2 = 4.498502151469554e-12
+
+# Sun's velocity relative to the Galactic Center, km/s, along (toward the
+# Galactic Center, Galactic rotation, North Galactic Pole): Schoenrich et al.
+# 2010 peculiar motion plus the IAU 220 km/s circular speed that goes with
+# the 8 kpc solar radius in SUN_GALACTOCENTRIC_KPC
+SOLAR_MOTION_KM_S = (11.1, 232.24, 7.25)
+
+MILKY_WAY_ID = "milky_way"
+M31_ID = "andromeda_m31"
+HOST_MASSES_MSUN = {MILKY_WAY_ID: 1.0e12, M31_ID: 1.5e12}
+# Galaxies closer than this to M31 than to the Milky Way orbit M31
+M31_SATELLITE_RADIUS_KPC = 300.0
+
+QUANT_MAX = 32767
+DEFAULT_EPOCH_CHUNK = 16
+
+# Column names for kinematics files, mapped to (pmra, pmdec, rv) fields
+KINEMATIC_ALIASES = {
+    "pmra": "pmra_mas_yr", "pmra_mas_yr": "pmra_mas_yr", "pm_ra": "pmra_mas_yr",
+    "pmdec": "pmdec_mas_yr", "pmde": "pmdec_mas_yr", "pmdec_mas_yr": "pmdec_mas_yr", "pm_dec": "pmdec_mas_yr",
+    "rv": "radial_velocity_km_s", "radial_velocity": "radial_velocity_km_s", "vrad": "radial_velocity_km_s",
+    "radial_velocity_km_s": "radial_velocity_km_s",
+}
+
+Vector = Tuple[float, float, float]
+Matrix = Tuple[Vector, Vector, Vector]
+
+# Galactocentric displacement -> heliocentric equatorial displacement: flip x
+# back to point away from the Galactic Center (see
+# scraper.equatorial_to_galactocentric_batch), then Galactic -> ICRS
+GALACTOCENTRIC_TO_EQUATORIAL: Matrix = tuple(
+    tuple(ICRS_TO_GALACTIC[j][i] * (-1.0 if j == 0 else 1.0) for j in range(3)) for i in range(3)
+)
+
+def load_kinematics(path: str) -> Dict[str, Vector]:
+    """
+    Read a kinematics file (CSV with a header row or JSON array) keyed by id
+    or name: {key: (pmra mas/yr incl. cos(dec), pmdec mas/yr, radial velocity km/s)}
+    """
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            records = list(csv.DictReader(line for line in f if not line.startswith("#")))
+    kinematics = {}
+    for record in records:
+        fields = {KINEMATIC_ALIASES.get(key.strip().lower(), key.strip().lower()): value
+                  for key, value in record.items()}
+        key = fields.get("id") or fields.get("name")
+        if key and all(fields.get(field) not in (None, "") for field in KINEMATIC_FIELDS):
+            kinematics[str(key).strip()] = tuple(float(fields[field]) for field in KINEMATIC_FIELDS)
+    return kinematics
+
+def epoch_range(start_myr: float, end_myr: float, count: float) -> List[float]:
+    """count evenly spaced epochs from start_myr to end_myr inclusive"""
+    count = int(count)
+    if count < 2:
+        return [float(start_myr)]
+    step = (end_myr - start_myr) / (count - 1)
+    return [start_myr + i * step for i in range(count)]
+
+def galactocentric_velocities(
+    ra_deg: Sequence[float],
+    dec_deg: Sequence[float],
+    distance_kpc: Sequence[float],
+    pmra_mas_yr: Sequence[float],
+    pmdec_mas_yr: Sequence[float],
+    radial_velocity_km_s: Sequence[float],
+) -> Tuple[List[float], List[float], List[float]]:
+    """Velocity columns in kpc/Myr in the galactocentric render frame, solar motion included"""
+    (a00, a01, a02), (a10, a11, a12), (a20, a21, a22) = ICRS_TO_GALACTIC
+    u, v, w = SOLAR_MOTION_KM_S
+    vxs, vys, vzs = [], [], []
+    for ra, dec, d, pmra, pmdec, rv in zip(map(math.radians, ra_deg), map(math.radians, dec_deg), distance_kpc,
+                                           pmra_mas_yr, pmdec_mas_yr, radial_velocity_km_s):
+        sin_ra, cos_ra, sin_dec, cos_dec = math.sin(ra), math.cos(ra), math.sin(dec), math.cos(dec)
+        v_ra, v_dec = KAPPA_KM_S * pmra * d, KAPPA_KM_S * pmdec * d
+        # Radial, east and north unit vectors in ICRS
+        ex = rv * cos_dec * cos_ra - v_ra * sin_ra - v_dec * sin_dec * cos_ra
+        ey = rv * cos_dec * sin_ra + v_ra * cos_ra - v_dec * sin_dec * sin_ra
+        ez = rv * sin_dec + v_dec * cos_dec
+        # Galactic axes, then the render frame (x decreases toward the Galactic Center)
+        gx = a00 * ex + a01 * ey + a02 * ez + u
+        gy = a10 * ex + a11 * ey + a12 * ez + v
+        gz = a20 * ex + a21 * ey + a22 * ez + w
+        vxs.append(-gx * KM_S_TO_KPC_MYR)
+        vys.append(gy * KM_S_TO_KPC_MYR)
+        vzs.append(gz * KM_S_TO_KPC_MYR)
+    return vxs, vys, vzs
+
+def _stumpff(z: float) -> Tuple[float, float]:
+    """Stumpff functions C(z), S(z)"""
+    if z > 1e-8:
+        s = math.sqrt(z)
+        return (1 - math.cos(s)) / z, (s - math.sin(s)) / (s * s * s)
+    if z < -1e-8:
+        s = math.sqrt(-z)
+        return (math.cosh(s) - 1) / -z, (math.sinh(s) - s) / (s * s * s)
+    return 0.5 - z / 24, 1 / 6 - z / 120
+
+def kepler_position(r0: Vector, v0: Vector, mu: float, dt: float) -> Vector:
+    """Position after dt on a point-mass orbit (universal variable formulation)"""
+    if dt == 0:
+        return r0
+    r0n = math.sqrt(r0[0] ** 2 + r0[1] ** 2 + r0[2] ** 2)
+    rv = r0[0] * v0[0] + r0[1] * v0[1] + r0[2] * v0[2]
+    v0sq = v0[0] ** 2 + v0[1] ** 2 + v0[2] ** 2
+    sqrt_mu = math.sqrt(mu)
+    alpha = 2 / r0n - v0sq / mu
+
+    radial = rv / sqrt_mu
+
+    def residual(chi: float) -> Tuple[float, float]:
+        """Universal Kepler equation F(chi) - sqrt(mu) dt and its derivative (the radius)"""
+        z = alpha * chi * chi
+        c, s = _stumpff(z)
+        chi2 = chi * chi
+        value = radial * chi2 * c + (1 - alpha * r0n) * chi2 * chi * s + r0n * chi - sqrt_mu * dt
+        return value, radial * chi * (1 - z * s) + (1 - alpha * r0n) * chi2 * c + r0n
+
+    if alpha > 1e-12:
+        # Whole periods change nothing; within one period chi lies in [0, 2 pi / sqrt(alpha)]
+        dt %= 2 * math.pi / (sqrt_mu * alpha ** 1.5)
+        low, high = 0.0, 2 * math.pi / math.sqrt(alpha)
+        chi = sqrt_mu * dt * alpha
+    else:
+        # F increases monotonically, so widen a bracket until it holds the root
+        step = sqrt_mu * abs(dt) / r0n
+        low, high = (0.0, step) if dt > 0 else (-step, 0.0)
+        while dt > 0 and residual(high)[0] < 0:
+            low, high = high, 2 * high
+        while dt < 0 and residual(low)[0] > 0:
+            low, high = 2 * low, low
+        chi = (low + high) / 2
+
+    # Newton steps, falling back to bisection whenever a step leaves the bracket
+    for _ in range(200):
+        value, slope = residual(chi)
+        if value > 0:
+            high = chi
+        else:
+            low = chi
+        following = chi - value / slope
+        if not low < following < high:
+            following = (low + high) / 2
+        if abs(following - chi) <= 1e-13 * max(1.0, abs(chi)):
+            chi = following
+            break
+        chi = following
+
+    z = alpha * chi * chi
+    c, s = _stumpff(z)
+    f = 1 - chi * chi / r0n * c
+    g = dt - chi ** 3 / sqrt_mu * s
+    return (f * r0[0] + g * v0[0], f * r0[1] + g * v0[1], f * r0[2] + g * v0[2])
+
+def orbit_bound(r0: Vector, v0: Vector, mu: float, span_myr: float) -> float:
+    """Upper bound on |r(t) - r0| for |t| <= span_myr on a point-mass orbit"""
+    r0n = math.sqrt(r0[0] ** 2 + r0[1] ** 2 + r0[2] ** 2)
+    v0sq = v0[0] ** 2 + v0[1] ** 2 + v0[2] ** 2
+    h_vec = (r0[1] * v0[2] - r0[2] * v0[1], r0[2] * v0[0] - r0[0] * v0[2], r0[0] * v0[1] - r0[1] * v0[0])
+    h2 = h_vec[0] ** 2 + h_vec[1] ** 2 + h_vec[2] ** 2
+    energy = v0sq / 2 - mu / r0n
+    e = math.sqrt(max(0.0, 1 + 2 * energy * h2 / (mu * mu)))
+    # Fastest at pericenter: speed bound times elapsed time
+    pericenter = h2 / (mu * (1 + e)) if h2 > 0 else 0.0
+    bound = math.sqrt(max(0.0, 2 * (energy + mu / pericenter))) * span_myr if pericenter > 0 else math.inf
+    if energy < 0 and e < 1:
+        bound = min(bound, r0n + (-mu / (2 * energy)) * (1 + e))
+    return bound
+
+def plan_galaxy_motion(galaxies: Sequence[Dict], kinematics: Dict[str, Vector],
+                       galactocentric: bool = False) -> List[Dict]:
+    """
+    Moving galaxies (those with kinematics, keyed by id or name) with their
+    galactocentric state and host: M31 orbits the Milky Way; other galaxies
+    orbit M31 when within M31_SATELLITE_RADIUS_KPC of it and nearer to it
+    than to the Milky Way, else the Milky Way. M31 satellites carry
+    host_position, M31's catalog position, which is their fixed host when M31
+    itself has no kinematics. Each object's keyframe origin is its
+    position_3d; galactocentric tells the frame of the catalog
+    """
+    moving = [(g, kinematics.get(g["id"]) or kinematics.get(g["name"])) for g in galaxies]
+    moving = [(g, k) for g, k in moving if k is not None and g["id"] != MILKY_WAY_ID and g["distance_kpc"] > 0]
+    if not moving:
+        return []
+    ra = [g["coordinates"]["ra_deg"] for g, _ in moving]
+    dec = [g["coordinates"]["dec_deg"] for g, _ in moving]
+    dist = [g["distance_kpc"] for g, _ in moving]
+    xs, ys, zs = equatorial_to_galactocentric_batch(ra, dec, dist, digits=None)
+    vxs, vys, vzs = galactocentric_velocities(ra, dec, dist, *zip(*(k for _, k in moving)))
+
+    m31 = next((g for g in galaxies if g["id"] == M31_ID), None)
+    m31_position = None
+    if m31 is not None:
+        m31_position = tuple(c[0] for c in equatorial_to_galactocentric_batch(
+            [m31["coordinates"]["ra_deg"]], [m31["coordinates"]["dec_deg"]], [m31["distance_kpc"]], digits=None))
+
+    rotation = None if galactocentric else GALACTOCENTRIC_TO_EQUATORIAL
+    objects = []
+    for (galaxy, _), x, y, z, vx, vy, vz in zip(moving, xs, ys, zs, vxs, vys, vzs):
+        catalog = galaxy["position_3d"]
+        obj = {"id": galaxy["id"], "position": (x, y, z), "velocity": (vx, vy, vz), "host": MILKY_WAY_ID,
+               "origin": (catalog["x"], catalog["y"], catalog["z"]), "rotation": rotation}
+        if galaxy["id"] != M31_ID and m31_position is not None:
+            to_m31 = math.dist((x, y, z), m31_position)
+            if 0 < to_m31 < M31_SATELLITE_RADIUS_KPC and to_m31 < math.dist((x, y, z), (0.0, 0.0, 0.0)):
+                obj.update(host=M31_ID, host_position=m31_position)
+        objects.append(obj)
+    return objects
+
+def plan_star_motion(stars: Sequence[Dict]) -> List[Dict]:
+    """Moving stars (records from stars.py that carry kinematics), in straight lines"""
+    moving = [s for s in stars if all(s.get(field) is not None for field in KINEMATIC_FIELDS)]
+    if not moving:
+        return []
+    vxs, vys, vzs = galactocentric_velocities(
+        [s["ra"] for s in moving], [s["dec"] for s in moving], [s["distance_kpc"] for s in moving],
+        *([s[field] for s in moving] for field in KINEMATIC_FIELDS)
+    )
+    return [
+        {"id": s["id"], "position": (s["position_3d"]["x"], s["position_3d"]["y"], s["position_3d"]["z"]),
+         "velocity": (vx, vy, vz), "host": None}
+        for s, vx, vy, vz in zip(moving, vxs, vys, vzs)
+    ]
+
+def _orbit_state(objects: Sequence[Dict], span_myr: float) -> Dict:
+    """
+    Precomputed propagation state: orbiting objects first (relative state to
+    their host, mu, scale), then straight-line objects as one interleaved
+    velocity / scale list
+    """
+    by_id = {obj["id"]: obj for obj in objects}
+    m31 = by_id.get(M31_ID)
+    m31_orbit = None
+    if m31 is not None and m31["host"] == MILKY_WAY_ID:
+        mu = G_KPC3_MSUN_MYR2 * (HOST_MASSES_MSUN[MILKY_WAY_ID] + HOST_MASSES_MSUN[M31_ID])
+        m31_orbit = (m31["position"], m31["velocity"], mu)
+
+    orbits, linear = [], []
+    for obj in objects:
+        if obj["host"] is None:
+            linear.append(obj)
+            continue
+        position, velocity = obj["position"], obj["velocity"]
+        host_offset_bound = 0.0
+        if obj["host"] == M31_ID:
+            # A moving M31 is the host; a static one stays at its catalog position
+            if m31 is not None:
+                host_position, host_velocity = m31["position"], m31["velocity"]
+            elif obj.get("host_position") is not None:
+                host_position, host_velocity = obj["host_position"], (0.0, 0.0, 0.0)
+            else:
+                raise ValueError(f"{obj['id']} orbits M31, which is neither moving nor given as host_position")
+            position = tuple(p - h for p, h in zip(position, host_position))
+            velocity = tuple(v - h for v, h in zip(velocity, host_velocity))
+            if m31_orbit is not None:
+                host_offset_bound = orbit_bound(*m31_orbit, span_myr)
+            mu = G_KPC3_MSUN_MYR2 * HOST_MASSES_MSUN[M31_ID]
+        elif obj["id"] == M31_ID:
+            mu = m31_orbit[2]
+        else:
+            mu = G_KPC3_MSUN_MYR2 * HOST_MASSES_MSUN[MILKY_WAY_ID]
+        bound = orbit_bound(position, velocity, mu, span_myr) + host_offset_bound
+        orbits.append({"id": obj["id"], "origin": obj.get("origin", obj["position"]), "r0": position, "v0": velocity,
+                       "mu": mu, "around_m31": obj["host"] == M31_ID, "rotation": obj.get("rotation"),
+                       "scale": max(bound, 1e-9) / QUANT_MAX})
+
+    linear_steps = []
+    for obj in linear:
+        speed = math.sqrt(sum(v * v for v in obj["velocity"]))
+        scale = max(speed * span_myr, 1e-9) / QUANT_MAX
+        obj["scale"] = scale
+        linear_steps.extend(v / scale for v in _rotate(obj.get("rotation"), obj["velocity"]))
+    return {"m31_orbit": m31_orbit, "orbits": orbits, "linear": linear, "linear_steps": linear_steps}
+
+# Propagation state of a pool worker, set once by _init_worker
+_WORKER_STATE: Dict[str, object] = {}
+
+def _init_worker(state: Dict) -> None:
+    _WORKER_STATE.update(state)
+
+def _rotate(rotation: Optional[Matrix], vector: Vector) -> Vector:
+    """Vector in the catalog frame (rotation None: already galactocentric)"""
+    if rotation is None:
+        return vector
+    x, y, z = vector
+    return tuple(r[0] * x + r[1] * y + r[2] * z for r in rotation)
+
+def _quantize(value: float) -> int:
+    return max(-QUANT_MAX, min(QUANT_MAX, round(value)))
+
+def _frames_chunk(epochs: Sequence[float]) -> bytes:
+    """Worker entry point: quantized int16 frames for a chunk of epochs"""
+    state = _WORKER_STATE
+    m31_orbit, orbits, linear_steps = state["m31_orbit"], state["orbits"], state["linear_steps"]
+    frames = array("h")
+    for t in epochs:
+        m31_offset = (0.0, 0.0, 0.0)
+        if m31_orbit is not None:
+            r0 = m31_orbit[0]
+            m31_now = kepler_position(*m31_orbit, t)
+            m31_offset = (m31_now[0] - r0[0], m31_now[1] - r0[1], m31_now[2] - r0[2])
+        for orbit in orbits:
+            r0, scale = orbit["r0"], orbit["scale"]
+            x, y, z = kepler_position(r0, orbit["v0"], orbit["mu"], t)
+            dx, dy, dz = x - r0[0], y - r0[1], z - r0[2]
+            if orbit["around_m31"]:
+                dx, dy, dz = dx + m31_offset[0], dy + m31_offset[1], dz + m31_offset[2]
+            if orbit["rotation"] is not None:
+                dx, dy, dz = _rotate(orbit["rotation"], (dx, dy, dz))
+            frames.extend((_quantize(dx / scale), _quantize(dy / scale), _quantize(dz / scale)))
+        # |v| * |t| <= |v| * span, so every step fits in int16 without clamping
+        frames.extend(map(round, map(t.__mul__, linear_steps)))
+    return to_little_endian(frames)
+
+def propagate_keyframes(objects: Sequence[Dict], epochs_myr: Sequence[float], workers: Optional[int] = None,
+                        epoch_chunk: int = DEFAULT_EPOCH_CHUNK) -> bytes:
+    """Keyframe buffer (see the module docstring) of the moving objects at every epoch"""
+    span = max((abs(t) for t in epochs_myr), default=0.0)
+    state = _orbit_state(objects, span)
+    ordered = state["orbits"] + [
+        {"id": obj["id"], "origin": obj.get("origin", obj["position"]), "scale": obj["scale"]} for obj in state["linear"]
+    ]
+    worker_state = {key: state[key] for key in ("m31_orbit", "orbits", "linear_steps")}
+    chunks = [list(epochs_myr[start:start + epoch_chunk]) for start in range(0, len(epochs_myr), epoch_chunk)]
+    if workers == 1 or len(chunks) <= 1:
+        _init_worker(worker_state)
+        frames = [_frames_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, initializer=_init_worker,
+                                 initargs=(worker_state,)) as pool:
+            frames = list(pool.map(_frames_chunk, chunks))
+
+    frame_bytes = b"".join(frames)
+    return (
+        HEADER.pack(MAGIC, FORMAT_VERSION, len(ordered), len(epochs_myr))
+        + to_little_endian(array("f", epochs_myr))
+        + encode_string_column([obj["id"] for obj in ordered])
+        + to_little_endian(array("f", [c for obj in ordered for c in obj["origin"]]))
+        + to_little_endian(array("f", [obj["scale"] for obj in ordered]))
+        + frame_bytes + b"\0" * (-len(frame_bytes) % 4)
+    )
+
+def decode_keyframes(data: bytes) -> Dict:
+    """Deserialize a keyframe buffer written by propagate_keyframes"""
+    magic, version, count, epoch_count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a StarMap keyframe buffer")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported keyframe version {version}")
+    offset = HEADER.size
+    epochs = from_little_endian("f", data[offset:offset + epoch_count * 4])
+    offset += epoch_count * 4
+    (ids_blob_size,) = struct.unpack_from("<I", data, offset + count * 4)
+    ids_size = (count + 1) * 4 + ids_blob_size + (-ids_blob_size % 4)
+    ids = decode_string_column(data[offset:offset + ids_size], count)
+    offset += ids_size
+    origins = from_little_endian("f", data[offset:offset + count * 12])
+    offset += count * 12
+    scales = from_little_endian("f", data[offset:offset + count * 4])
+    offset += count * 4
+    frames = from_little_endian("h", data[offset:offset + epoch_count * count * 6])
+    return {"ids": ids, "epochs": epochs, "origins": origins, "scales": scales, "frames": frames}
+
+def positions_at(keyframes: Dict, epoch_myr: float) -> List[Vector]:
+    """Positions of every object at an epoch, linearly interpolated between keyframes (clamped at the ends)"""
+    epochs, origins, scales, frames = keyframes["epochs"], keyframes["origins"], keyframes["scales"], keyframes["frames"]
+    count = len(keyframes["ids"])
+    if epoch_myr <= epochs[0]:
+        low, high, t = 0, 0, 0.0
+    elif epoch_myr >= epochs[-1]:
+        low, high, t = len(epochs) - 1, len(epochs) - 1, 0.0
+    else:
+        high = bisect_left(epochs, epoch_myr)
+        low = high - 1
+        t = (epoch_myr - epochs[low]) / (epochs[high] - epochs[low])
+    positions = []
+    for obj in range(count):
+        scale = scales[obj]
+        position = []
+        for axis in range(3):
+            a = frames[(low * count + obj) * 3 + axis]
+            b = frames[(high * count + obj) * 3 + axis]
+            position.append(origins[obj * 3 + axis] + (a + (b - a) * t) * scale)
+        positions.append(tuple(position))
+    return positions
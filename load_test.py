@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Load test for query_server.py
+Replays a random mix of bbox, nearest, prefix and route queries over
+keep-alive connections and reports latency percentiles and throughput. A
+share of the requests (--hot-fraction) repeats a small set of hot queries,
+which is what the server's result cache is for.
+
+    python query_server.py &
+    python load_test.py --requests 20000 --concurrency 64
+
+--serve starts the server in a subprocess for the duration of the test.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Sequence, Tuple
+from urllib.parse import urlencode
+
+from query_server import DEFAULT_HOST, DEFAULT_PORT, load_catalog
+from uncertainty import percentile
+
+HOT_QUERIES = 64
+QUERY_KINDS = ("bbox", "nearest", "prefix", "route")
+
+def make_queries(galaxies: Sequence[Dict], count: int, seed: int = 42, hot_fraction: float = 0.5) -> List[str]:
+    """Request paths: an even mix of query kinds, hot_fraction of them drawn from a small repeated set"""
+    rng = random.Random(seed)
+
+    def random_query() -> str:
+        kind = rng.choice(QUERY_KINDS)
+        galaxy = rng.choice(galaxies)
+        if kind == "bbox":
+            p = galaxy["position_3d"]
+            half = rng.uniform(50, 300)
+            center = (p["x"], p["y"], p["z"])
+            params = {"min": ",".join(f"{c - half:.1f}" for c in center),
+                      "max": ",".join(f"{c + half:.1f}" for c in center)}
+        elif kind == "nearest":
+            params = {"id": galaxy["id"], "k": rng.choice((5, 10, 20))}
+        elif kind == "prefix":
+            params = {"q": galaxy["name"][:rng.randint(2, 6)]}
+        else:
+            params = {"from": galaxy["id"], "to": rng.choice(galaxies)["id"]}
+        return f"/{kind}?{urlencode(params)}"
+
+    hot = [random_query() for _ in range(HOT_QUERIES)]
+    return [rng.choice(hot) if rng.random() < hot_fraction else random_query() for _ in range(count)]
+
+async def fetch(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str, path: str) -> Tuple[int, bytes]:
+    """One GET over an open keep-alive connection: (status, body)"""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+async def _client(host: str, port: int, paths: Sequence[str], latencies: List[float], errors: List[str]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for path in paths:
+            start = time.perf_counter()
+            status, body = await fetch(reader, writer, host, path)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(f"{status} {path}: {body[:200].decode('utf-8', 'replace')}")
+    finally:
+        writer.close()
+
+async def run_load(host: str, port: int, paths: Sequence[str], concurrency: int = 32) -> Dict:
+    """Send paths over concurrency connections; latency percentiles in ms, throughput in requests/s"""
+    latencies: List[float] = []
+    errors: List[str] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, paths[offset::concurrency], latencies, errors)
+        for offset in range(min(concurrency, len(paths)))
+    ))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+        "errors": len(errors),
+        "first_errors": errors[:5],
+    }
+
+async def server_stats(host: str, port: int) -> Dict:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, body = await fetch(reader, writer, host, "/stats")
+        return json.loads(body)
+    finally:
+        writer.close()
+
+def wait_for_port(host: str, port: int, timeout: float = 300.0) -> None:
+    """Block until something accepts connections on host:port"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Nothing listening on {host}:{port} after {timeout:.0f}s")
+            time.sleep(0.2)
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Load test for query_server.py")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Server address")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Server port")
+    parser.add_argument("--catalog", default="public/data/galaxies.json", help="Catalog the queries are drawn from")
+    parser.add_argument("--requests", type=int, default=10_000, help="Total requests")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent keep-alive connections")
+    parser.add_argument("--hot-fraction", type=float, default=0.5, help="Share of requests repeating hot queries")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the query mix")
+    parser.add_argument("--serve", action="store_true", help="Start query_server.py on --port for the test")
+    parser.add_argument("--output", help="Write the results as JSON")
+    args = parser.parse_args()
+
+    print("🏋️  Query Server Load Test")
+    print("=" * 50)
+    galaxies = load_catalog(args.catalog)
+    paths = make_queries(galaxies, args.requests, args.seed, args.hot_fraction)
+
+    server = None
+    if args.serve:
+        server = subprocess.Popen([sys.executable, "query_server.py", "--catalog", args.catalog,
+                                   "--host", args.host, "--port", str(args.port)])
+    try:
+        wait_for_port(args.host, args.port)
+        results = asyncio.run(run_load(args.host, args.port, paths, args.concurrency))
+        results["server"] = asyncio.run(server_stats(args.host, args.port))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    cache = results["server"]["cache"]
+    print(f"✓ {results['requests']:,} requests over {args.concurrency} connections in {results['seconds']:.2f}s")
+    print(f"  {results['requests_per_second']:,.0f} req/s, p50 {results['p50_ms']:.2f} ms, "
+          f"p99 {results['p99_ms']:.2f} ms, max {results['max_ms']:.2f} ms")
+    print(f"  cache: {cache['hits']:,} hits / {cache['misses']:,} misses, {results['errors']} errors")
+    for error in results["first_errors"]:
+        print(f"  ⚠️  {error}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"✓ Saved {args.output}")
+    print("=" * 50)
+
+if __name__ == "__main__":
+    main()
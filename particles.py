@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Build-time particle synthesis for galaxy point clouds
+Ports the procedural generators from SpiralGalaxy.jsx, DwarfGalaxy.jsx and
+EllipticalGalaxy.jsx to the data build. Every galaxy gets its own seeded
+random stream, so the buffers are identical from one build to the next and
+the browser only has to upload them to the GPU.
+
+Particles are stored in level-of-detail order: they are stratified by
+radius and azimuth and interleaved across strata, so every prefix of the
+buffer is an even subsample of the whole cloud (core and arms alike). A
+lower LOD tier is simply drawn with a smaller count.
+
+Binary layout per galaxy (little-endian, 4-byte aligned):
+- Header: magic "SMPB", format version (u32), particle count (u32),
+  rotation x, y, z in radians (3 x f32)
+- positions: count * 3 float32 (x, y, z interleaved, galaxy-local kpc units)
+- colors: count * 3 float32 (linear RGB, like THREE.Color)
+- sizes, intensities, randomness: count float32 each
+"""
+
+import math
+import re
+import struct
+import zlib
+from array import array
+from random import Random
+from typing import Dict, List, Optional, Tuple
+
+from catalog_binary import from_little_endian, to_little_endian
+
+MAGIC = b"SMPB"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sII3f")
+
+DEFAULT_SEED = 20251021
+
+ATTRIBUTES = (("positions", 3), ("colors", 3), ("sizes", 1), ("intensities", 1), ("randomness", 1))
+
+# LOD tiers as (name, fraction of the particles, minimum projected radius in
+# pixels), smallest first. Below the last threshold the galaxy is drawn as a
+# single impostor point.
+LOD_TIERS = (("low", 0.05, 6.0), ("medium", 0.25, 30.0), ("full", 1.0, 120.0))
+
+# Reference camera for the screen-size thresholds (CAMERA_FOV in src/utils/constants.js)
+CAMERA_FOV_DEG = 75
+REFERENCE_VIEWPORT_HEIGHT_PX = 1080
+
+# Strata used to keep the structure of every LOD prefix
+RADIAL_STRATA = 8
+AZIMUTH_STRATA = 8
+
+# Galaxy type colors, same table as src/utils/colorMapping.js
+TYPE_COLORS = {
+    "elliptical": "#0066FF",
+    "spiral": "#00FFFF",
+    "barred_spiral": "#00DDFF",
+    "irregular": "#FF9900",
+    "dwarf_spheroidal": "#FF3333",
+    "dwarf_elliptical": "#FF69B4",
+    "compact_elliptical": "#9933FF",
+    "default": "#FFFFFF",
+}
+
+Color = Tuple[float, float, float]
+
+def galaxy_color_hex(galaxy_type: str) -> str:
+    """Hex display color for a galaxy type (mirrors getGalaxyColor)"""
+    if not galaxy_type:
+        return TYPE_COLORS["default"]
+    if re.fullmatch(r"E[0-7]", galaxy_type):
+        return TYPE_COLORS["elliptical"]
+    if re.fullmatch(r"S[0abcd]", galaxy_type):
+        return TYPE_COLORS["spiral"]
+    if re.fullmatch(r"SB(a|b|bc|c|d)", galaxy_type):
+        return TYPE_COLORS["barred_spiral"]
+    if galaxy_type in ("Irr", "Irr I", "Irr II", "IrrB"):
+        return TYPE_COLORS["irregular"]
+    if galaxy_type in ("dSph", "dSph/E"):
+        return TYPE_COLORS["dwarf_spheroidal"]
+    if re.fullmatch(r"dE[0-3]?", galaxy_type):
+        return TYPE_COLORS["dwarf_elliptical"]
+    if galaxy_type == "cE":
+        return TYPE_COLORS["compact_elliptical"]
+
+    normalized = galaxy_type.upper()
+    if normalized.startswith("E"):
+        return TYPE_COLORS["elliptical"]
+    if "SPH" in normalized:
+        return TYPE_COLORS["dwarf_spheroidal"]
+    if normalized.startswith("D") and "E" in normalized:
+        return TYPE_COLORS["dwarf_elliptical"]
+    if "IRR" in normalized:
+        return TYPE_COLORS["irregular"]
+    if normalized.startswith("S"):
+        return TYPE_COLORS["spiral"]
+    return TYPE_COLORS["default"]
+
+def hex_to_linear(hex_color: str) -> Color:
+    """Parse #RRGGBB into linear RGB, the way THREE.Color does with color management on"""
+    channels = []
+    for i in (1, 3, 5):
+        c = int(hex_color[i:i + 2], 16) / 255
+        channels.append(c / 12.92 if c < 0.04045 else ((c + 0.055) / 1.055) ** 2.4)
+    return channels[0], channels[1], channels[2]
+
+def _lerp(a: Color, b: Color, t: float) -> Color:
+    """Linear interpolation between two colors"""
+    return a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t, a[2] + (b[2] - a[2]) * t
+
+def _scale(color: Color, factor: float) -> Color:
+    """Scale a color, like THREE.Color.multiplyScalar"""
+    return color[0] * factor, color[1] * factor, color[2] * factor
+
+def _clamp(value: float, low: float, high: float) -> float:
+    """Clamp value to [low, high]"""
+    return max(low, min(high, value))
+
+def galaxy_renderer(galaxy_type: str) -> Optional[str]:
+    """Which particle component Map3D.jsx uses for a type (None for the plain sphere)"""
+    t = (galaxy_type or "").lower()
+    if t.startswith("s") and "sph" not in t and not t.startswith("se"):
+        return "spiral"
+    if t.startswith("e") and not t.startswith("em"):
+        return "elliptical"
+    if t.startswith("d") or "sph" in t or "irr" in t:
+        return "dwarf"
+    return None
+
+def _empty_buffers() -> Dict[str, array]:
+    """One empty float32 array per particle attribute"""
+    return {name: array("f") for name, _ in ATTRIBUTES}
+
+def generate_spiral(galaxy: Dict, rng: Random) -> Dict:
+    """Logarithmic spiral arms, as in SpiralGalaxy.jsx"""
+    size = galaxy["size_estimate_kpc"]
+    galaxy_radius = size * 0.15
+    count = min(int(size * 200), 25000)
+    galaxy_type = galaxy["type"]
+
+    branches, spin, spread, power = 2, 1.2, 0.4, 2.5
+    if galaxy_type == "Sc":
+        spin, spread = 0.8, 0.5
+    elif galaxy_type == "Sb":
+        spin, spread = 1.5, 0.35
+    elif "SB" in galaxy_type:
+        spin, spread = 1.0, 0.4
+
+    mid_color = hex_to_linear(galaxy_color_hex(galaxy_type))
+    inner_color = hex_to_linear("#ffffee")
+    outer_color = _scale(mid_color, 0.3)
+
+    def offset(scale: float) -> float:
+        return rng.random() ** power * (1 if rng.random() < 0.5 else -1) * scale
+
+    buffers = _empty_buffers()
+    for i in range(count):
+        radius = rng.random() * galaxy_radius
+        angle = (i % branches) / branches * math.pi * 2 + radius * spin
+        random_x = offset(spread * radius)
+        random_y = offset(spread * radius * 0.2)
+        random_z = offset(spread * radius)
+        buffers["positions"].extend((math.cos(angle) * radius + random_x, random_y, math.sin(angle) * radius + random_z))
+
+        normalized = radius / galaxy_radius
+        if normalized < 0.3:
+            color = _lerp(inner_color, mid_color, normalized / 0.3)
+        else:
+            color = _lerp(mid_color, outer_color, (normalized - 0.3) / 0.7)
+        buffers["colors"].extend(color)
+
+        buffers["sizes"].append(max(0.6, (1 - normalized) * 7 + rng.random() * 3.5))
+        buffers["intensities"].append(_clamp((1 - normalized) ** 1.3 + rng.random() * 0.25, 0.1, 1.0))
+        buffers["randomness"].append(rng.random())
+    return {"rotation": (0.0, 0.0, 0.0), **buffers}
+
+def generate_dwarf(galaxy: Dict, rng: Random) -> Dict:
+    """Randomly tilted spheroidal, elliptical or irregular cloud, as in DwarfGalaxy.jsx"""
+    size = galaxy["size_estimate_kpc"]
+    galaxy_radius = max(size * 0.4, 2.8)
+    count = min(int(size * 160), 6000)
+    galaxy_type = galaxy["type"].lower()
+    rotation = (rng.random() * math.pi * 2, rng.random() * math.pi * 2, rng.random() * math.pi * 2)
+
+    irregular, flattening, randomness_factor, concentration = False, 1.0, 0.3, 1.3
+    if "sph" in galaxy_type:
+        flattening, randomness_factor = 0.6, 0.35
+    elif "de" in galaxy_type:
+        flattening, randomness_factor = 0.8, 0.3
+    elif "irr" in galaxy_type:
+        # Very chaotic, wispy cloud with an even radial spread
+        irregular, flattening, randomness_factor, concentration = True, 0.5, 0.6, 1.0
+    jitter = galaxy_radius * randomness_factor * (2 if irregular else 1)
+
+    base_color = hex_to_linear(galaxy_color_hex(galaxy["type"]))
+    inner_color = hex_to_linear("#ffffdd")
+    outer_color = _scale(base_color, 0.4)
+
+    buffers = _empty_buffers()
+    for _ in range(count):
+        radius = rng.random() ** concentration * galaxy_radius
+        theta = rng.random() * math.pi * 2
+        phi = math.acos(rng.random() * 2 - 1)
+        x = radius * math.sin(phi) * math.cos(theta) + (rng.random() - 0.5) * jitter
+        y = radius * math.sin(phi) * math.sin(theta) * flattening + (rng.random() - 0.5) * jitter
+        z = radius * math.cos(phi) + (rng.random() - 0.5) * jitter
+        buffers["positions"].extend((x, y, z))
+
+        normalized = min(math.sqrt(x * x + y * y + z * z) / galaxy_radius, 1)
+        if normalized < 0.5:
+            color = _lerp(inner_color, base_color, normalized / 0.5)
+        else:
+            color = _lerp(base_color, outer_color, (normalized - 0.5) / 0.5)
+        buffers["colors"].extend(color)
+
+        buffers["sizes"].append(max(0.5, (1 - normalized) * 5 + rng.random() * 2.2))
+        buffers["intensities"].append(_clamp((1 - normalized) ** 1.6 + rng.random() * 0.2, 0.05, 1.0))
+        buffers["randomness"].append(rng.random())
+    return {"rotation": rotation, **buffers}
+
+def generate_elliptical(galaxy: Dict, rng: Random) -> Dict:
+    """Core + envelope ellipsoid, as in EllipticalGalaxy.jsx"""
+    size = galaxy["size_estimate_kpc"]
+    galaxy_radius = max(size * 0.28, 3.5)
+    count = min(int(size * 240), 16000)
+    subtype_match = re.search(r"E(\d)", galaxy["type"], re.IGNORECASE)
+    subtype = int(subtype_match.group(1)) if subtype_match else 0
+    axis_ratio = _clamp(1 - subtype / 10, 0.3, 1)
+    major_axis = 1 / axis_ratio
+    rotation = (rng.random() * math.pi, rng.random() * math.pi, rng.random() * math.pi)
+
+    base_color = hex_to_linear(galaxy_color_hex(galaxy["type"]))
+    inner_color = hex_to_linear("#fef7e4")
+    mid_color = _lerp(base_color, hex_to_linear("#d6d7ff"), 0.35)
+    outer_color = _scale(base_color, 0.45)
+
+    buffers = _empty_buffers()
+    for _ in range(count):
+        u = rng.random() * 2.0 - 1.0
+        theta = 2.0 * math.pi * rng.random()
+        radius_core = rng.random() ** 0.45
+        radius_envelope = rng.random() ** 2.5
+        radius = (radius_envelope + (radius_core - radius_envelope) * 0.65) * galaxy_radius
+
+        sqrt_term = math.sqrt(1.0 - u * u)
+        x = radius * sqrt_term * math.cos(theta) * major_axis + (rng.random() - 0.5) * galaxy_radius * 0.22
+        y = radius * sqrt_term * math.sin(theta) + (rng.random() - 0.5) * galaxy_radius * 0.18
+        z = radius * u * axis_ratio + (rng.random() - 0.5) * galaxy_radius * 0.18
+        buffers["positions"].extend((x, y, z))
+
+        normalized = min(math.sqrt(x * x + y * y + z * z) / galaxy_radius, 1)
+        if normalized < 0.35:
+            color = _lerp(inner_color, mid_color, normalized / 0.35)
+        else:
+            color = _lerp(mid_color, outer_color, (normalized - 0.35) / 0.65)
+        buffers["colors"].extend(color)
+
+        buffers["sizes"].append(max(0.7, (1 - normalized) * 6.0 + rng.random() * 2.5))
+        buffers["intensities"].append(_clamp((1 - normalized) ** 1.4 + rng.random() * 0.3, 0.1, 1.0))
+        buffers["randomness"].append(rng.random())
+    return {"rotation": rotation, **buffers}
+
+GENERATORS = {
+    "spiral": generate_spiral,
+    "dwarf": generate_dwarf,
+    "elliptical": generate_elliptical,
+}
+
+def galaxy_seed(galaxy_id: str, seed: int = DEFAULT_SEED) -> int:
+    """Stable per-galaxy seed (independent of catalog order and Python's hash randomization)"""
+    return zlib.crc32(galaxy_id.encode("utf-8")) ^ seed
+
+def generate_particles(galaxy: Dict, seed: int = DEFAULT_SEED) -> Optional[Dict]:
+    """Particle buffers for one galaxy in LOD order, None for types rendered as a plain sphere"""
+    renderer = galaxy_renderer(galaxy["type"])
+    if renderer is None:
+        return None
+    rng = Random(galaxy_seed(galaxy["id"], seed))
+    particles = GENERATORS[renderer](galaxy, rng)
+    particles = reorder_particles(particles, stratified_order(particles, rng))
+    particles["renderer"] = renderer
+    return particles
+
+def stratified_order(particles: Dict, rng: Random) -> List[int]:
+    """
+    Particle order in which every prefix samples all radius/azimuth strata in
+    proportion to their size (systematic sampling within each stratum)
+    """
+    positions = particles["positions"]
+    count = particle_count(particles)
+    radii = [math.hypot(positions[3 * i], positions[3 * i + 1], positions[3 * i + 2]) for i in range(count)]
+    max_radius = max(radii, default=0.0) or 1.0
+
+    strata: Dict[Tuple[int, int], List[int]] = {}
+    for i, radius in enumerate(radii):
+        radial = min(int(radius / max_radius * RADIAL_STRATA), RADIAL_STRATA - 1)
+        azimuth = math.atan2(positions[3 * i + 2], positions[3 * i]) % (2 * math.pi)
+        sector = min(int(azimuth / (2 * math.pi) * AZIMUTH_STRATA), AZIMUTH_STRATA - 1)
+        strata.setdefault((radial, sector), []).append(i)
+
+    priorities = []
+    for key in sorted(strata):
+        members = strata[key]
+        rng.shuffle(members)
+        size = len(members)
+        priorities.extend(((k + rng.random()) / size, i) for k, i in enumerate(members))
+    priorities.sort()
+    return [i for _, i in priorities]
+
+def reorder_particles(particles: Dict, order: List[int]) -> Dict:
+    """Copy of the particle buffers with particles in the given order"""
+    reordered = {key: value for key, value in particles.items() if key not in dict(ATTRIBUTES)}
+    for name, components in ATTRIBUTES:
+        source = particles[name]
+        target = array("f")
+        for i in order:
+            target.extend(source[i * components:(i + 1) * components])
+        reordered[name] = target
+    return reordered
+
+def build_lod(particles: Dict) -> Dict:
+    """
+    LOD manifest entry for particles already in stratified order: the count,
+    point size scale and camera distance limit of each tier, plus an impostor
+    point summarizing the whole cloud
+    """
+    count = particle_count(particles)
+    positions = particles["positions"]
+    radii = sorted(math.hypot(positions[3 * i], positions[3 * i + 1], positions[3 * i + 2]) for i in range(count))
+    # The visible extent of the cloud (scales with size_estimate_kpc in every generator)
+    radius = radii[int(0.9 * (count - 1))] if radii else 0.0
+    focal_px = REFERENCE_VIEWPORT_HEIGHT_PX / 2 / math.tan(math.radians(CAMERA_FOV_DEG) / 2)
+
+    tiers = []
+    for name, fraction, min_radius_px in LOD_TIERS:
+        tier_count = max(1, math.ceil(count * fraction)) if count else 0
+        tiers.append({
+            "name": name,
+            "count": tier_count,
+            # Fewer, larger points keep the cloud's apparent coverage similar
+            "point_size_scale": round(math.sqrt(count / tier_count), 4) if tier_count else 1.0,
+            "min_screen_radius_px": min_radius_px,
+            "max_camera_distance_kpc": round(radius * focal_px / min_radius_px, 3),
+        })
+
+    colors, intensities = particles["colors"], particles["intensities"]
+    weight = sum(intensities) or 1.0
+    impostor_color = [
+        round(sum(colors[3 * i + c] * intensities[i] for i in range(count)) / weight, 6) for c in range(3)
+    ]
+    return {
+        "radius_kpc": round(radius, 4),
+        "tiers": tiers,
+        "impostor": {
+            "color": impostor_color,
+            "intensity": round(weight / count, 6) if count else 0.0,
+            "size": round(radius, 4),
+        },
+    }
+
+def particle_count(particles: Dict) -> int:
+    """Number of particles in a set of buffers"""
+    return len(particles["sizes"])
+
+def encode_particles(particles: Dict) -> bytes:
+    """Serialize particle buffers into the binary layout"""
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, particle_count(particles), *particles["rotation"])
+    return header + b"".join(to_little_endian(particles[name]) for name, _ in ATTRIBUTES)
+
+def decode_particles(data: bytes) -> Dict:
+    """Deserialize particle buffers written by encode_particles"""
+    magic, version, count, rx, ry, rz = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a StarMap particle buffer")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported particle buffer version {version}")
+    particles: Dict = {"rotation": (rx, ry, rz)}
+    offset = HEADER.size
+    for name, components in ATTRIBUTES:
+        size = count * components * 4
+        particles[name] = from_little_endian("f", data[offset:offset + size])
+        offset += size
+    return particles
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Delta patches between catalog builds
+A build compares its galaxies.json with the previous one record by record
+(matched on id) and writes a minified JSON patch that turns version N into
+version N + 1:
+
+    {"format": "starmap-catalog-patch", "from": 3, "to": 4,
+     "from_sha256": "...", "to_sha256": "...", "count": 43,
+     "removed": ["old_id"],
+     "changed": {"id": {"set": {"distance_kpc": 81.0}, "unset": ["notes"]}},
+     "added": [{...full record...}],
+     "order": ["id", ...]}
+
+"changed" only lists the top-level fields whose values differ; a record
+whose field order changed is sent whole as {"replace": {...}}. Added
+records are appended in order, and "order" is only present when the
+resulting id order differs from (previous order minus removed) + added.
+The hashes are of the pretty printed galaxies.json bytes (writers.write_json),
+so applying a patch can be verified byte for byte.
+
+metadata.json gains the version chain, newest last, so a client holding
+version N fetches only the patches after it (or the full catalog when N has
+dropped off the chain):
+
+    "catalog_version": 4, "catalog_sha256": "...",
+    "patches": [{"from": 3, "to": 4, "file": "patches/galaxies-3-4.json", "bytes": 512, "sha256": "..."}]
+
+Once a build is versioned, later builds keep the chain going whether or not
+they ask for patches. Version numbers are never reused: a new version is
+numbered after both the previous metadata and every patch file on disk, so
+a catalog whose chain was lost starts a fresh chain instead of overwriting
+published patches.
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from writers import write_json
+
+PATCH_FORMAT = "starmap-catalog-patch"
+PATCH_DIR = "patches"
+# Older patches drop off the chain; clients that far behind reload the catalog
+MAX_CHAIN_LENGTH = 32
+
+_PATCH_FILE = re.compile(r"galaxies-(\d+)-(\d+)\.json")
+
+def sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def diff_record(old: Dict, new: Dict) -> Optional[Dict]:
+    """Field-level change turning old into new, None when they are identical"""
+    if old == new and list(old) == list(new):
+        return None
+    change = {}
+    changed = {key: value for key, value in new.items() if key not in old or old[key] != value}
+    removed = [key for key in old if key not in new]
+    if changed:
+        change["set"] = changed
+    if removed:
+        change["unset"] = removed
+    if list(apply_record_change(old, change)) != list(new):
+        return {"replace": new}
+    return change
+
+def apply_record_change(old: Dict, change: Dict) -> Dict:
+    """New record from an old one and its entry in a patch's "changed" map"""
+    if "replace" in change:
+        return change["replace"]
+    unset = set(change.get("unset", ()))
+    record = {key: value for key, value in old.items() if key not in unset}
+    record.update(change.get("set", {}))
+    return record
+
+def diff_catalogs(old: Sequence[Dict], new: Sequence[Dict]) -> Dict:
+    """Removed ids, changed fields and added records between two galaxy lists (ids must be unique)"""
+    old_by_id = {record["id"]: record for record in old}
+    new_ids = {record["id"] for record in new}
+    removed = [record["id"] for record in old if record["id"] not in new_ids]
+
+    changed, added = {}, []
+    for record in new:
+        previous = old_by_id.get(record["id"])
+        if previous is None:
+            added.append(record)
+            continue
+        change = diff_record(previous, record)
+        if change is not None:
+            changed[record["id"]] = change
+
+    diff = {"removed": removed, "changed": changed, "added": added}
+    removed_set = set(removed)
+    natural_order = [record["id"] for record in old if record["id"] not in removed_set]
+    natural_order.extend(record["id"] for record in added)
+    order = [record["id"] for record in new]
+    if order != natural_order:
+        diff["order"] = order
+    return diff
+
+def build_patch(old_bytes: bytes, new_bytes: bytes, from_version: int, to_version: int) -> Dict:
+    """Patch between two galaxies.json encodings"""
+    old, new = json.loads(old_bytes), json.loads(new_bytes)
+    return {
+        "format": PATCH_FORMAT,
+        "from": from_version,
+        "to": to_version,
+        "from_sha256": sha256_hex(old_bytes),
+        "to_sha256": sha256_hex(new_bytes),
+        "count": len(new),
+        **diff_catalogs(old, new),
+    }
+
+def encode_patch(patch: Dict) -> bytes:
+    """Minified patch file bytes"""
+    return json.dumps(patch, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def apply_patch(galaxies: Sequence[Dict], patch: Dict) -> List[Dict]:
+    """Galaxy list after applying a patch (the input list is left untouched)"""
+    if patch.get("format") != PATCH_FORMAT:
+        raise ValueError("Not a catalog patch")
+    removed = set(patch["removed"])
+    changed = patch["changed"]
+    records = [
+        apply_record_change(record, changed[record["id"]]) if record["id"] in changed else record
+        for record in galaxies if record["id"] not in removed
+    ]
+    records.extend(patch["added"])
+    if "order" in patch:
+        by_id = {record["id"]: record for record in records}
+        records = [by_id[object_id] for object_id in patch["order"]]
+    if len(records) != patch["count"]:
+        raise ValueError(f"Patch produced {len(records)} records, expected {patch['count']}")
+    return records
+
+def apply_patch_bytes(old_bytes: bytes, patch: Dict) -> bytes:
+    """Apply a patch to galaxies.json bytes, checking both hashes; returns the new galaxies.json bytes"""
+    if sha256_hex(old_bytes) != patch["from_sha256"]:
+        raise ValueError(f"Patch {patch['from']} -> {patch['to']} does not start from this catalog")
+    new_bytes = write_json(apply_patch(json.loads(old_bytes), patch))
+    if sha256_hex(new_bytes) != patch["to_sha256"]:
+        raise ValueError(f"Patch {patch['from']} -> {patch['to']} did not reproduce the catalog")
+    return new_bytes
+
+def load_previous_build(data_dir: str = "public/data") -> Tuple[Optional[bytes], Dict]:
+    """(galaxies.json bytes, metadata) of the build currently on disk, (None, {}) when there is none"""
+    try:
+        with open(os.path.join(data_dir, "galaxies.json"), "rb") as f:
+            previous = f.read()
+    except OSError:
+        return None, {}
+    try:
+        with open(os.path.join(data_dir, "metadata.json"), "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        metadata = {}
+    return previous, metadata
+
+def latest_patch_version(data_dir: str = "public/data") -> int:
+    """Highest version named by a patch file in data_dir/patches (0 when there are none)"""
+    try:
+        names = os.listdir(os.path.join(data_dir, PATCH_DIR))
+    except OSError:
+        return 0
+    versions = [int(v) for name in names if (match := _PATCH_FILE.fullmatch(name)) for v in match.groups()]
+    return max(versions, default=0)
+
+def next_version_chain(previous_bytes: Optional[bytes], previous_metadata: Dict,
+                       new_bytes: bytes, latest_published: int = 0) -> Tuple[Dict, Dict[str, bytes]]:
+    """
+    Version fields for the new metadata.json and the patch files to write
+    ({path relative to the data directory: bytes}). A build without a
+    versioned predecessor (or whose metadata does not describe the previous
+    galaxies.json) starts a new chain after latest_published; an unchanged
+    catalog keeps its version and chain.
+    """
+    new_sha = sha256_hex(new_bytes)
+    version = previous_metadata.get("catalog_version")
+    chain = list(previous_metadata.get("patches", []))
+    files: Dict[str, bytes] = {}
+
+    if (previous_bytes is None or version is None
+            or previous_metadata.get("catalog_sha256") != sha256_hex(previous_bytes)):
+        version, chain = latest_published + 1, []
+    elif sha256_hex(previous_bytes) != new_sha:
+        to_version = max(version, latest_published) + 1
+        patch = build_patch(previous_bytes, new_bytes, version, to_version)
+        data = encode_patch(patch)
+        path = f"{PATCH_DIR}/galaxies-{version}-{to_version}.json"
+        files[path] = data
+        chain.append({"from": version, "to": to_version, "file": path, "bytes": len(data), "sha256": sha256_hex(data)})
+        version = to_version
+
+    fields = {"catalog_version": version, "catalog_sha256": new_sha, "patches": chain[-MAX_CHAIN_LENGTH:]}
+    return fields, files
+
+def catalog_versioning(new_bytes: bytes, data_dir: str = "public/data",
+                       enabled: bool = False) -> Tuple[Optional[Dict], Dict[str, bytes]]:
+    """
+    next_version_chain against the build in data_dir, or (None, {}) when
+    versioning was not asked for and the previous build was not versioned
+    """
+    previous_bytes, previous_metadata = load_previous_build(data_dir)
+    if not enabled and "catalog_version" not in previous_metadata:
+        return None, {}
+    return next_version_chain(previous_bytes, previous_metadata, new_bytes, latest_patch_version(data_dir))
+
+def patch_chain(metadata: Dict, from_version: int) -> Optional[List[Dict]]:
+    """Chain entries that bring a client from from_version to the current version ([] when current, None when out of reach)"""
+    current = metadata.get("catalog_version")
+    if from_version == current:
+        return []
+    steps = [entry for entry in metadata.get("patches", []) if entry["from"] >= from_version]
+    if not steps or steps[0]["from"] != from_version or steps[-1]["to"] != current:
+        return None
+    if any(step["to"] != following["from"] for step, following in zip(steps, steps[1:])):
+        return None
+    return steps
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Local HTTP query service over a built catalog
+The catalog (galaxies.json, .jsonl/.ndjson or the binary galaxies.bin) is
+loaded once into a CatalogIndex shared by every request: the k-d tree from
+spatial_index.py, a sorted list of folded names and aliases for prefix
+lookups and the bounded jump graph from route_planner.py. All of it is
+read-only after start-up.
+
+The asyncio event loop only parses requests and writes responses. Queries
+run on a thread pool, so a slow route never stalls other connections.
+Responses are cached in an LRU keyed by path and sorted parameters, and
+concurrent identical misses share a single computation.
+
+Endpoints (GET, JSON responses):
+- /bbox?min=x,y,z&max=x,y,z[&limit=N]   objects inside a box (kpc)
+- /nearest?x=..&y=..&z=..[&k=N]         k nearest objects to a point
+- /nearest?id=ID[&k=N]                  k nearest neighbours of an object
+- /prefix?q=TEXT[&limit=N]              names/aliases starting with TEXT (folded)
+- /route?from=ID&to=ID                  shortest jump route
+- /stats                                request and cache counters (never cached)
+
+    python query_server.py --catalog public/data/galaxies.json --port 8765
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ingest import normalize_name
+from route_planner import DEFAULT_MAX_JUMP_KPC, RoutePlanner
+from routing import galaxy_positions
+from search_index import object_terms
+from spatial_index import box_search, build_spatial_index, nearest_neighbors
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 10_000
+MAX_K = 1_000
+
+Response = Tuple[int, bytes]
+
+class UnknownId(KeyError):
+    """An object id that is not in the catalog (answered with 404)"""
+
+    def __str__(self) -> str:
+        return str(self.args[0])
+
+def load_catalog(path: str) -> List[Dict]:
+    """Galaxy records from a scraper.py output (.json, .jsonl/.ndjson or galaxies.bin)"""
+    if path.endswith(".bin"):
+        from catalog_reader import CatalogReader
+        with CatalogReader(path) as catalog:
+            return list(catalog)
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+class CatalogIndex:
+    """Read-only indexes over one catalog, safe to query from many threads"""
+
+    def __init__(self, galaxies: Sequence[Dict], max_jump_kpc: Optional[float] = DEFAULT_MAX_JUMP_KPC):
+        self.galaxies = list(galaxies)
+        self.index = {galaxy["id"]: idx for idx, galaxy in enumerate(self.galaxies)}
+        self.positions = galaxy_positions(self.galaxies)
+        self.spatial = build_spatial_index(self.positions)
+        names = sorted((term, idx) for idx, galaxy in enumerate(self.galaxies) for term in object_terms(galaxy))
+        self.terms = [term for term, _ in names]
+        self.term_objects = [idx for _, idx in names]
+        self.planner = RoutePlanner(self.galaxies, max_jump_kpc)
+
+    def summary(self, idx: int) -> Dict:
+        galaxy = self.galaxies[idx]
+        return {"id": galaxy["id"], "name": galaxy["name"], "type": galaxy["type"],
+                "position_3d": galaxy["position_3d"]}
+
+    def bbox(self, lower: Sequence[float], upper: Sequence[float], limit: int = DEFAULT_LIMIT) -> Dict:
+        """Objects inside the box, in catalog order; count is the total before the limit"""
+        hits = box_search(self.spatial, tuple(lower), tuple(upper))
+        return {"count": len(hits), "results": [self.summary(idx) for idx in hits[:limit]]}
+
+    def nearest(self, point: Sequence[float], k: int = 5, exclude: Optional[int] = None) -> Dict:
+        """k nearest objects to a point, nearest first (exclude drops the query object itself)"""
+        hits = nearest_neighbors(self.spatial, tuple(point), k + (exclude is not None))
+        results = [{**self.summary(idx), "distance_kpc": round(distance, 4)}
+                   for idx, distance in hits if idx != exclude]
+        return {"count": len(results[:k]), "results": results[:k]}
+
+    def prefix(self, text: str, limit: int = DEFAULT_LIMIT) -> Dict:
+        """Objects with a name or alias starting with the folded text, alphabetical by matching term"""
+        needle = normalize_name(text)
+        if not needle:
+            raise ValueError("q must contain letters or digits")
+        seen: Dict[int, None] = {}
+        position = bisect_left(self.terms, needle)
+        while position < len(self.terms) and self.terms[position].startswith(needle) and len(seen) < limit:
+            seen.setdefault(self.term_objects[position])
+            position += 1
+        return {"count": len(seen), "results": [self.summary(idx) for idx in seen]}
+
+    def route(self, start_id: str, end_id: str) -> Dict:
+        """Shortest jump route between two objects (an empty path when unreachable)"""
+        for object_id in (start_id, end_id):
+            if object_id not in self.index:
+                raise UnknownId(f"Unknown id '{object_id}'")
+        path, distance = self.planner.route(start_id, end_id)
+        return {"from": start_id, "to": end_id, "path": path, "jumps": max(len(path) - 1, 0),
+                "distance_kpc": round(distance, 4), "max_jump_kpc": self.planner.max_jump_kpc}
+
+class LRUCache:
+    """Least recently used cache; only touched from the event loop thread, so it needs no lock"""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Response]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Response]:
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Response) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+def _encode(payload: Dict) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _finite(text: str, name: str) -> float:
+    """float(text), rejecting nan and infinities (which JSON cannot carry back)"""
+    value = float(text)
+    if not math.isfinite(value):
+        raise ValueError(f"{name} must be a finite number")
+    return value
+
+def _vector(params: Dict[str, str], name: str) -> Tuple[float, float, float]:
+    values = [_finite(v, name) for v in params.get(name, "").split(",") if v.strip()]
+    if len(values) != 3:
+        raise ValueError(f"{name} must be x,y,z")
+    return values[0], values[1], values[2]
+
+def _required(params: Dict[str, str], *names: str) -> None:
+    """ValueError naming the first missing query parameter"""
+    for name in names:
+        if name not in params:
+            raise ValueError(f"Missing parameter '{name}'")
+
+def _count(params: Dict[str, str], name: str, default: int, maximum: int) -> int:
+    value = int(params.get(name, default))
+    if not 1 <= value <= maximum:
+        raise ValueError(f"{name} must be between 1 and {maximum}")
+    return value
+
+class QueryServer:
+    """HTTP/1.1 front end (keep-alive, GET only) for a CatalogIndex"""
+
+    def __init__(self, index: CatalogIndex, cache_size: int = DEFAULT_CACHE_SIZE, workers: Optional[int] = None):
+        self.index = index
+        self.cache = LRUCache(cache_size)
+        self.executor = ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) + 4),
+                                           thread_name_prefix="query")
+        self.requests = 0
+        self.started = time.time()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.handlers: Dict[str, Callable[[Dict[str, str]], Dict]] = {
+            "/bbox": self._bbox,
+            "/nearest": self._nearest,
+            "/prefix": self._prefix,
+            "/route": self._route,
+        }
+
+    def _bbox(self, params: Dict[str, str]) -> Dict:
+        lower, upper = _vector(params, "min"), _vector(params, "max")
+        if any(lo > hi for lo, hi in zip(lower, upper)):
+            raise ValueError("min must not exceed max")
+        return self.index.bbox(lower, upper, _count(params, "limit", DEFAULT_LIMIT, MAX_LIMIT))
+
+    def _nearest(self, params: Dict[str, str]) -> Dict:
+        k = _count(params, "k", 5, MAX_K)
+        if "id" in params:
+            idx = self.index.index.get(params["id"])
+            if idx is None:
+                raise UnknownId(f"Unknown id '{params['id']}'")
+            return self.index.nearest(self.index.positions[idx], k, exclude=idx)
+        _required(params, "x", "y", "z")
+        return self.index.nearest(tuple(_finite(params[axis], axis) for axis in "xyz"), k)
+
+    def _prefix(self, params: Dict[str, str]) -> Dict:
+        return self.index.prefix(params.get("q", ""), _count(params, "limit", DEFAULT_LIMIT, MAX_LIMIT))
+
+    def _route(self, params: Dict[str, str]) -> Dict:
+        _required(params, "from", "to")
+        return self.index.route(params["from"], params["to"])
+
+    def _run(self, handler: Callable[[Dict[str, str]], Dict], params: Dict[str, str]) -> Response:
+        """Worker thread entry point: one query, encoded"""
+        try:
+            return 200, _encode(handler(params))
+        except UnknownId as exc:
+            return 404, _encode({"error": str(exc)})
+        except ValueError as exc:
+            return 400, _encode({"error": str(exc)})
+        except Exception as exc:
+            # Never cached (see _finish); the connection stays usable
+            return 500, _encode({"error": f"Internal error ({type(exc).__name__})"})
+
+    def _finish(self, key: Hashable, future: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if not future.cancelled() and future.exception() is None and future.result()[0] == 200:
+            self.cache.put(key, future.result())
+
+    def stats(self) -> Dict:
+        return {
+            "objects": len(self.index.galaxies),
+            "requests": self.requests,
+            "uptime_s": round(time.time() - self.started, 1),
+            "cache": {"size": len(self.cache), "maxsize": self.cache.maxsize,
+                      "hits": self.cache.hits, "misses": self.cache.misses},
+            "inflight": len(self._inflight),
+        }
+
+    async def respond(self, path: str, params: Dict[str, str]) -> Response:
+        """Status and JSON body for one request, from the cache when possible"""
+        self.requests += 1
+        if path == "/stats":
+            return 200, _encode(self.stats())
+        handler = self.handlers.get(path)
+        if handler is None:
+            return 404, _encode({"error": f"Unknown endpoint {path}"})
+
+        key = (path, tuple(sorted(params.items())))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.get_running_loop().run_in_executor(self.executor, self._run, handler, params)
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda future: self._finish(key, future))
+        # Shielded so a client hanging up does not cancel a result others are waiting for
+        return await asyncio.shield(pending)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """One client connection, serving requests until it closes or asks to"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    body_length = int(headers.get("content-length") or 0)
+                    if body_length < 0:
+                        raise ValueError(body_length)
+                except ValueError:
+                    body_length = None
+                if body_length:
+                    await reader.readexactly(body_length)
+
+                parts = request_line.decode("latin-1").split()
+                connection = headers.get("connection", "").lower()
+                # Without a usable Content-Length the next request cannot be found, so the connection closes
+                keep_alive = len(parts) == 3 and body_length is not None and (
+                    connection == "keep-alive" if parts[2] == "HTTP/1.0" else connection != "close")
+                if body_length is None:
+                    status, body = 400, _encode({"error": "Invalid Content-Length"})
+                elif len(parts) != 3:
+                    status, body = 400, _encode({"error": "Malformed request line"})
+                elif parts[0] != "GET":
+                    status, body = 405, _encode({"error": "Only GET is supported"})
+                else:
+                    url = urlsplit(parts[1])
+                    params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+                    status, body = await self.respond(url.path, params)
+
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Access-Control-Allow-Origin: *\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """Start listening (port 0 picks a free port, see server.sockets)"""
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def serve_forever(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Local HTTP query service over the galaxy catalog")
+    parser.add_argument("--catalog", default="public/data/galaxies.json",
+                        help="Catalog written by scraper.py (.json, .jsonl/.ndjson or .bin)")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="Cached query results (LRU)")
+    parser.add_argument("--workers", type=int, default=None, help="Query threads (default: CPUs + 4, at most 32)")
+    parser.add_argument("--max-jump", type=float, default=DEFAULT_MAX_JUMP_KPC,
+                        help="Maximum jump range in kpc for /route (0 = unlimited)")
+    args = parser.parse_args()
+
+    print("🛰️  Catalog Query Server")
+    print("=" * 50)
+    start = time.perf_counter()
+    galaxies = load_catalog(args.catalog)
+    index = CatalogIndex(galaxies, args.max_jump or None)
+    print(f"✓ Indexed {len(galaxies):,} objects from {args.catalog} in {time.perf_counter() - start:.2f}s")
+    print(f"✓ Listening on http://{args.host}:{args.port} (bbox, nearest, prefix, route, stats)")
+    try:
+        asyncio.run(QueryServer(index, args.cache_size, args.workers).serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n✓ Stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Memory-compact galaxy records for large catalogs
+GalaxyTable keeps a catalog as columns instead of one nested dict per
+object: numbers in array('d') columns, repeated strings (type, notes and the
+source/source_url/citation provenance) interned once in a StringPool and
+referenced by u32 index, and alternate names as tuples sharing one empty
+tuple. The nested record shape written to galaxies.json is only built when a
+record is read, e.g. while serializing, by the same scraper.galaxy_record and
+scraper.convert_coordinates that process_galaxies uses.
+It is meant for code that holds a whole catalog in memory; the streaming
+ingest (scraper.stream_galaxies) only ever holds one chunk and converts it
+with process_galaxies directly.
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from scraper import DEFAULT_CITATION, DEFAULT_SOURCE, DEFAULT_SOURCE_URL, convert_coordinates, galaxy_record
+
+_NO_ALIASES: Tuple[str, ...] = ()
+
+class StringPool:
+    """Distinct strings stored once and referenced by index"""
+
+    __slots__ = ("strings", "_index")
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        """Index of value, adding it on first use"""
+        idx = self._index.get(value)
+        if idx is None:
+            idx = self._index[value] = len(self.strings)
+            self.strings.append(value)
+        return idx
+
+    def __getitem__(self, idx: int) -> str:
+        return self.strings[idx]
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+class NumberColumn:
+    """Float64 column that remembers which values were ints, so JSON output is unchanged"""
+
+    __slots__ = ("values", "is_int")
+
+    def __init__(self):
+        self.values = array("d")
+        self.is_int = array("B")
+
+    def extend(self, values: Iterable) -> None:
+        for value in values:
+            self.values.append(value)
+            self.is_int.append(isinstance(value, int))
+
+    def __getitem__(self, idx: int):
+        value = self.values[idx]
+        return int(value) if self.is_int[idx] else value
+
+class GalaxyTable:
+    """Struct-of-arrays galaxy catalog, see the module docstring"""
+
+    __slots__ = (
+        "galactocentric", "pool", "names", "alternate_names", "ra", "dec", "ra_deg", "dec_deg",
+        "x", "y", "z", "distance_kpc", "size_estimate_kpc", "type", "notes", "source", "source_url", "citation",
+    )
+
+    def __init__(self, galactocentric: bool = False):
+        self.galactocentric = galactocentric
+        self.pool = StringPool()
+        self.names: List[str] = []
+        self.alternate_names: List[Tuple[str, ...]] = []
+        self.ra: List[str] = []
+        self.dec: List[str] = []
+        self.ra_deg = array("d")
+        self.dec_deg = array("d")
+        self.x = array("d")
+        self.y = array("d")
+        self.z = array("d")
+        self.distance_kpc = NumberColumn()
+        self.size_estimate_kpc = NumberColumn()
+        self.type = array("I")
+        self.notes = array("I")
+        self.source = array("I")
+        self.source_url = array("I")
+        self.citation = array("I")
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict], galactocentric: bool = False, chunk_size: int = 10_000) -> "GalaxyTable":
+        """Build a table from raw catalog rows, converting chunk_size rows at a time"""
+        table = cls(galactocentric)
+        chunk: List[Dict] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                table.extend(chunk)
+                chunk = []
+        if chunk:
+            table.extend(chunk)
+        return table
+
+    def extend(self, rows: Sequence[Dict]) -> None:
+        """Convert raw rows column-wise (same conversions as process_galaxies) and append them"""
+        ra_deg, dec_deg, (xs, ys, zs) = convert_coordinates(rows, self.galactocentric)
+
+        add = self.pool.add
+        self.names.extend(row["name"] for row in rows)
+        self.alternate_names.extend(tuple(row["alternate_names"]) or _NO_ALIASES for row in rows)
+        self.ra.extend(row["ra"] for row in rows)
+        self.dec.extend(row["dec"] for row in rows)
+        self.ra_deg.extend(round(value, 6) for value in ra_deg)
+        self.dec_deg.extend(round(value, 6) for value in dec_deg)
+        self.x.extend(xs)
+        self.y.extend(ys)
+        self.z.extend(zs)
+        self.distance_kpc.extend(row["distance_kpc"] for row in rows)
+        self.size_estimate_kpc.extend(row["size_estimate_kpc"] for row in rows)
+        self.type.extend(add(row["type"]) for row in rows)
+        self.notes.extend(add(row["notes"]) for row in rows)
+        self.source.extend(add(row.get("source", DEFAULT_SOURCE)) for row in rows)
+        self.source_url.extend(add(row.get("source_url", DEFAULT_SOURCE_URL)) for row in rows)
+        self.citation.extend(add(row.get("citation", DEFAULT_CITATION)) for row in rows)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def record(self, idx: int) -> Dict:
+        """Record idx in the galaxies.json shape (built by scraper.galaxy_record, like process_galaxies)"""
+        pool = self.pool
+        row = {
+            "name": self.names[idx],
+            "alternate_names": list(self.alternate_names[idx]),
+            "type": pool[self.type[idx]],
+            "ra": self.ra[idx],
+            "dec": self.dec[idx],
+            "distance_kpc": self.distance_kpc[idx],
+            "size_estimate_kpc": self.size_estimate_kpc[idx],
+            "notes": pool[self.notes[idx]],
+            "source": pool[self.source[idx]],
+            "source_url": pool[self.source_url[idx]],
+            "citation": pool[self.citation[idx]],
+        }
+        return galaxy_record(row, self.ra_deg[idx], self.dec_deg[idx], self.x[idx], self.y[idx], self.z[idx])
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (self.record(idx) for idx in range(len(self)))
+
+    def to_records(self) -> List[Dict]:
+        """Every record in the galaxies.json shape"""
+        return list(self)
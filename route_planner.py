@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Batch route planning over the generated catalog (public/data/galaxies.json)
+The jump graph links every pair of objects within max_jump_kpc. It is built
+once, from a grid of max_jump_kpc cells instead of comparing every pair,
+into flat arrays that are cheap to hand to worker processes.
+
+Queries are grouped by start object: a start with a few destinations runs A*
+per destination with the straight-line distance as heuristic (admissible,
+since every jump is a straight line), a start with many destinations runs
+one Dijkstra that stops once all of them are settled. Groups are spread over
+a process pool whose workers receive the graph once, at start-up.
+
+Usage:
+    python route_planner.py --random 10000 --max-jump 250
+    python route_planner.py --from milky_way --to andromeda_m31 triangulum_m33
+    python route_planner.py --tour milky_way leo_i andromeda_m31
+"""
+
+import argparse
+import heapq
+import json
+import math
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, repeat
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from routing import Position, galaxy_positions
+
+DEFAULT_MAX_JUMP_KPC = 250.0
+DEFAULT_CHUNK_SIZE = 64
+# A start with this many destinations runs one Dijkstra instead of an A* per
+# destination (a Dijkstra to far-apart targets settles most of the graph)
+DIJKSTRA_MIN_TARGETS = 32
+
+# {"offsets": array Q, "neighbors": array I, "weights": array d}, see build_bounded_graph
+JumpGraph = Dict[str, array]
+# (path as node indices, total distance in kpc); ([], 0.0) when unreachable
+Route = Tuple[List[int], float]
+
+def build_bounded_graph(positions: Sequence[Position], max_jump_kpc: Optional[float] = DEFAULT_MAX_JUMP_KPC) -> JumpGraph:
+    """
+    Jump graph in compressed sparse row form: the neighbors of node i are
+    neighbors[offsets[i]:offsets[i + 1]] at distances weights[...]. Same edges
+    as routing.build_jump_graph; points are bucketed in a grid of
+    max_jump_kpc cells so only the 27 surrounding cells are compared.
+    """
+    limit = cell_size = max_jump_kpc or math.inf
+    cells: Dict[Tuple[int, int, int], List[int]] = {}
+    for idx, (x, y, z) in enumerate(positions):
+        key = (0, 0, 0) if math.isinf(cell_size) else (
+            math.floor(x / cell_size), math.floor(y / cell_size), math.floor(z / cell_size))
+        cells.setdefault(key, []).append(idx)
+
+    # Distances and the range test run through map/compress, without a Python
+    # level loop per candidate pair
+    node_edges: List[Tuple[List[int], List[float]]] = [([], [])] * len(positions)
+    within_range = limit.__ge__
+    for (cx, cy, cz), members in cells.items():
+        candidates = members if math.isinf(cell_size) else [
+            j
+            for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+            for j in cells.get((cx + dx, cy + dy, cz + dz), ())
+        ]
+        points = [positions[j] for j in candidates]
+        for i in members:
+            all_distances = list(map(math.dist, repeat(positions[i]), points))
+            keep = list(map(within_range, all_distances))
+            ids = list(compress(candidates, keep))
+            distances = list(compress(all_distances, keep))
+            own = ids.index(i)
+            del ids[own], distances[own]
+            node_edges[i] = (ids, distances)
+
+    offsets = array("Q", [0])
+    neighbors = array("I")
+    weights = array("d")
+    for ids, distances in node_edges:
+        neighbors.extend(ids)
+        weights.extend(distances)
+        offsets.append(len(neighbors))
+    return {"offsets": offsets, "neighbors": neighbors, "weights": weights}
+
+def _walk_back(previous: List[int], start: int, end: int) -> List[int]:
+    path = [end]
+    while path[-1] != start:
+        path.append(previous[path[-1]])
+    path.reverse()
+    return path
+
+def astar(graph: JumpGraph, positions: Sequence[Position], start: int, goal: int) -> Route:
+    """Shortest route from start to goal, A* with the straight-line distance to goal as heuristic"""
+    if start == goal:
+        return [start], 0.0
+    offsets, neighbors, weights = graph["offsets"], graph["neighbors"], graph["weights"]
+    goal_position = positions[goal]
+    dist = math.dist
+    best = [math.inf] * len(positions)
+    previous = [-1] * len(positions)
+    best[start] = 0.0
+    queue = [(dist(positions[start], goal_position), 0.0, start)]
+    while queue:
+        _, distance, node = heapq.heappop(queue)
+        if node == goal:
+            return _walk_back(previous, start, goal), distance
+        # The heuristic is consistent, so a node is final the first time it is popped
+        if distance > best[node]:
+            continue
+        lo, hi = offsets[node], offsets[node + 1]
+        for neighbor, weight in zip(neighbors[lo:hi], weights[lo:hi]):
+            candidate = distance + weight
+            if candidate >= best[neighbor]:
+                continue
+            best[neighbor] = candidate
+            previous[neighbor] = node
+            heapq.heappush(queue, (candidate + dist(positions[neighbor], goal_position), candidate, neighbor))
+    return [], 0.0
+
+def dijkstra_to_targets(graph: JumpGraph, start: int, targets: Sequence[int]) -> Dict[int, Route]:
+    """Shortest routes from start to every target, stopping as soon as all targets are settled"""
+    offsets, neighbors, weights = graph["offsets"], graph["neighbors"], graph["weights"]
+    count = len(offsets) - 1
+    remaining = set(targets)
+    routes: Dict[int, Route] = {}
+    best = [math.inf] * count
+    previous = [-1] * count
+    best[start] = 0.0
+    queue = [(0.0, start)]
+    while queue and remaining:
+        distance, node = heapq.heappop(queue)
+        if distance > best[node]:
+            continue
+        if node in remaining:
+            remaining.discard(node)
+            routes[node] = (_walk_back(previous, start, node), distance)
+        lo, hi = offsets[node], offsets[node + 1]
+        for neighbor, weight in zip(neighbors[lo:hi], weights[lo:hi]):
+            candidate = distance + weight
+            if candidate >= best[neighbor]:
+                continue
+            best[neighbor] = candidate
+            previous[neighbor] = node
+            heapq.heappush(queue, (candidate, neighbor))
+    for target in remaining:
+        routes[target] = ([], 0.0)
+    return routes
+
+# Graph and positions of a pool worker, set once by _init_worker
+_WORKER_STATE: Dict[str, object] = {}
+
+def _init_worker(graph: JumpGraph, positions: Sequence[Position]) -> None:
+    _WORKER_STATE["graph"] = graph
+    _WORKER_STATE["positions"] = positions
+
+def _route_groups(groups: Sequence[Tuple[int, Sequence[int]]]) -> List[Dict[int, Route]]:
+    """Worker entry point: routes for a chunk of (start, destinations) groups"""
+    graph, positions = _WORKER_STATE["graph"], _WORKER_STATE["positions"]
+    results = []
+    for start, targets in groups:
+        if len(targets) < DIJKSTRA_MIN_TARGETS:
+            results.append({target: astar(graph, positions, start, target) for target in targets})
+        else:
+            results.append(dijkstra_to_targets(graph, start, targets))
+    return results
+
+class RoutePlanner:
+    """Jump graph over a catalog, answering many route queries per build"""
+
+    def __init__(self, galaxies: Sequence[Dict], max_jump_kpc: Optional[float] = DEFAULT_MAX_JUMP_KPC):
+        self.ids = [g["id"] for g in galaxies]
+        self.index = {galaxy_id: idx for idx, galaxy_id in enumerate(self.ids)}
+        self.positions = galaxy_positions(galaxies)
+        self.max_jump_kpc = max_jump_kpc
+        self.graph = build_bounded_graph(self.positions, max_jump_kpc)
+
+    def route(self, start_id: str, end_id: str) -> Tuple[List[str], float]:
+        """Single route as (path of ids, total distance in kpc); ([], 0) when there is no route"""
+        path, distance = astar(self.graph, self.positions, self.index[start_id], self.index[end_id])
+        return [self.ids[node] for node in path], distance
+
+    def plan(self, queries: Sequence[Tuple[str, str]], workers: Optional[int] = None,
+             chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Tuple[List[str], float]]:
+        """Routes for many (start id, end id) queries, in query order"""
+        by_start: Dict[int, List[int]] = {}
+        for start_id, end_id in queries:
+            targets = by_start.setdefault(self.index[start_id], [])
+            end = self.index[end_id]
+            if end not in targets:
+                targets.append(end)
+        groups = list(by_start.items())
+        chunks = [groups[start:start + chunk_size] for start in range(0, len(groups), chunk_size)]
+
+        if workers == 1 or len(chunks) <= 1:
+            _init_worker(self.graph, self.positions)
+            results = [_route_groups(chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, initializer=_init_worker,
+                                     initargs=(self.graph, self.positions)) as pool:
+                results = list(pool.map(_route_groups, chunks))
+
+        routes: Dict[Tuple[int, int], Route] = {}
+        for chunk, chunk_results in zip(chunks, results):
+            for (start, _), group_routes in zip(chunk, chunk_results):
+                routes.update(((start, end), route) for end, route in group_routes.items())
+        planned = []
+        for start_id, end_id in queries:
+            path, distance = routes[self.index[start_id], self.index[end_id]]
+            planned.append(([self.ids[node] for node in path], distance))
+        return planned
+
+    def many_to_many(self, start_ids: Sequence[str], end_ids: Sequence[str],
+                     workers: Optional[int] = None) -> Dict[Tuple[str, str], Tuple[List[str], float]]:
+        """Routes from every start to every end, keyed by (start id, end id)"""
+        queries = [(start_id, end_id) for start_id in start_ids for end_id in end_ids]
+        return dict(zip(queries, self.plan(queries, workers=workers)))
+
+    def tour(self, waypoint_ids: Sequence[str]) -> Tuple[List[str], float]:
+        """Route through the waypoints in order (one graph for every leg); ([], 0) if a leg is unreachable"""
+        if len(waypoint_ids) < 2:
+            return list(waypoint_ids), 0.0
+        path, total = [waypoint_ids[0]], 0.0
+        for leg, distance in self.plan(list(zip(waypoint_ids, waypoint_ids[1:])), workers=1):
+            if not leg:
+                return [], 0.0
+            path.extend(leg[1:])
+            total += distance
+        return path, total
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Batch route planner over the galaxy catalog")
+    parser.add_argument("--catalog", default="public/data/galaxies.json", help="Catalog written by scraper.py")
+    parser.add_argument("--max-jump", type=float, default=DEFAULT_MAX_JUMP_KPC,
+                        help="Maximum jump range in kpc (0 = unlimited)")
+    parser.add_argument("--from", dest="starts", nargs="+", metavar="ID", help="Start ids (many-to-many with --to)")
+    parser.add_argument("--to", dest="ends", nargs="+", metavar="ID", help="Destination ids")
+    parser.add_argument("--tour", nargs="+", metavar="ID", help="Visit these ids in order")
+    parser.add_argument("--random", type=int, default=0, help="Plan this many random start/end pairs")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for --random")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--output", help="Write the planned routes as JSON")
+    args = parser.parse_args()
+
+    print("🚀 Route Planner")
+    print("=" * 50)
+    with open(args.catalog, "r", encoding="utf-8") as f:
+        galaxies = json.load(f)
+
+    start = time.perf_counter()
+    planner = RoutePlanner(galaxies, args.max_jump or None)
+    edges = len(planner.graph["neighbors"]) // 2
+    print(f"✓ Jump graph: {len(galaxies):,} objects, {edges:,} jumps in {time.perf_counter() - start:.2f}s")
+
+    if args.tour:
+        path, distance = planner.tour(args.tour)
+        print(f"✓ Tour: {' -> '.join(path) if path else 'unreachable'} ({distance:.1f} kpc)")
+        routes = [{"from": args.tour[0], "to": args.tour[-1], "path": path, "distance_kpc": distance}]
+    else:
+        if args.starts and args.ends:
+            queries = [(s, e) for s in args.starts for e in args.ends]
+        else:
+            rng = random.Random(args.seed)
+            queries = [(rng.choice(planner.ids), rng.choice(planner.ids)) for _ in range(args.random)]
+        if not queries:
+            parser.error("give --from/--to, --tour or --random")
+        start = time.perf_counter()
+        planned = planner.plan(queries, workers=args.workers)
+        elapsed = time.perf_counter() - start
+        reachable = sum(1 for path, _ in planned if path)
+        print(f"✓ Planned {len(queries):,} routes ({reachable:,} reachable) in {elapsed:.2f}s "
+              f"= {len(queries) / elapsed:,.0f} routes/s")
+        routes = [
+            {"from": s, "to": e, "path": path, "distance_kpc": distance}
+            for (s, e), (path, distance) in zip(queries, planned)
+        ]
+        for route in routes[:10]:
+            print(f"  {route['from']} -> {route['to']}: {len(route['path'])} stops, {route['distance_kpc']:.1f} kpc")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(routes, f, indent=2)
+        print(f"✓ Saved {args.output}")
+    print("=" * 50)
+
+if __name__ == "__main__":
+    main()
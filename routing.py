@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Precomputed route tables for the galaxy catalog
+Builds an all-pairs shortest-path distance matrix and predecessor table over
+the catalog at build time, optionally limited to a maximum jump range, so a
+route lookup becomes a few table reads instead of a graph search per query
+
+Binary layout (little-endian):
+- Header: magic "SMRT", format version (u32), node count (u32),
+  predecessor index width in bytes (u32: 2 or 4), max jump in kpc (f32, 0 = unlimited)
+- Node ids as a string column (see catalog_binary.encode_string_column)
+- Distance matrix: count * count float32, row = source, inf when unreachable
+- Predecessor matrix: count * count u16/u32, pred[s][t] is the node before t
+  on the shortest path from s, NO_NODE when t is unreachable or t == s
+
+Size and build time grow with the square of the catalog: the table takes
+count^2 * (4 + 2) bytes (24 MB at 2,000 nodes) and building it runs one
+Dijkstra per node in pure Python (~100 s at 2,000 nodes). Tables are
+therefore limited to MAX_TABLE_NODES; larger catalogs route per query with
+route_planner.RoutePlanner instead.
+"""
+
+import heapq
+import math
+import struct
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from catalog_binary import (
+    decode_string_column,
+    encode_string_column,
+    from_little_endian,
+    to_little_endian,
+)
+
+MAGIC = b"SMRT"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sIIIf")
+
+MAX_TABLE_NODES = 2_000
+
+Position = Tuple[float, float, float]
+
+def galaxy_positions(galaxies: Sequence[Dict]) -> List[Position]:
+    """Extract (x, y, z) tuples from galaxy records"""
+    return [(g["position_3d"]["x"], g["position_3d"]["y"], g["position_3d"]["z"]) for g in galaxies]
+
+def build_jump_graph(positions: Sequence[Position], max_jump_kpc: Optional[float] = None) -> List[List[Tuple[int, float]]]:
+    """Adjacency lists of (neighbor index, distance) for every pair within max_jump_kpc"""
+    count = len(positions)
+    limit = math.inf if not max_jump_kpc else max_jump_kpc
+    graph: List[List[Tuple[int, float]]] = [[] for _ in range(count)]
+    for i in range(count):
+        xi, yi, zi = positions[i]
+        for j in range(i + 1, count):
+            xj, yj, zj = positions[j]
+            distance = math.sqrt((xj - xi) ** 2 + (yj - yi) ** 2 + (zj - zi) ** 2)
+            if distance <= limit:
+                graph[i].append((j, distance))
+                graph[j].append((i, distance))
+    return graph
+
+def dijkstra(graph: List[List[Tuple[int, float]]], source: int) -> Tuple[List[float], List[int]]:
+    """Single-source shortest paths, returns (distances, predecessors) with -1 for no predecessor"""
+    distances = [math.inf] * len(graph)
+    previous = [-1] * len(graph)
+    distances[source] = 0.0
+    queue = [(0.0, source)]
+    while queue:
+        distance, node = heapq.heappop(queue)
+        if distance > distances[node]:
+            continue
+        for neighbor, weight in graph[node]:
+            candidate = distance + weight
+            if candidate < distances[neighbor]:
+                distances[neighbor] = candidate
+                previous[neighbor] = node
+                heapq.heappush(queue, (candidate, neighbor))
+    return distances, previous
+
+def _id_index(ids: Sequence[str]) -> Dict[str, int]:
+    return {galaxy_id: idx for idx, galaxy_id in enumerate(ids)}
+
+def build_route_table(galaxies: Sequence[Dict], max_jump_kpc: Optional[float] = None,
+                      max_nodes: int = MAX_TABLE_NODES) -> Dict:
+    """
+    Compute all-pairs shortest paths over the catalog
+    Returns {"ids", "index", "max_jump_kpc", "distances", "predecessors"}
+    where the two matrices are flat row-major lists (index = source * count + target)
+    and index maps ids to rows; raises ValueError above max_nodes (see the module docstring)
+    """
+    if len(galaxies) > max_nodes:
+        raise ValueError(f"Route tables are limited to {max_nodes:,} nodes ({len(galaxies):,} given); "
+                         f"use route_planner.RoutePlanner for larger catalogs")
+    graph = build_jump_graph(galaxy_positions(galaxies), max_jump_kpc)
+    distances: List[float] = []
+    predecessors: List[int] = []
+    for source in range(len(galaxies)):
+        row_distances, row_previous = dijkstra(graph, source)
+        distances.extend(row_distances)
+        predecessors.extend(row_previous)
+    ids = [g["id"] for g in galaxies]
+    return {
+        "ids": ids,
+        "index": _id_index(ids),
+        "max_jump_kpc": max_jump_kpc or 0.0,
+        "distances": distances,
+        "predecessors": predecessors,
+    }
+
+def lookup_route(table: Dict, start_id: str, end_id: str) -> Tuple[List[str], float]:
+    """
+    Read a route out of a route table
+    Returns (path of ids, total distance in kpc); ([], 0) when there is no route
+    """
+    ids = table["ids"]
+    # Tables from build/decode_route_table carry their id index; the table itself is never modified
+    index = table.get("index") or _id_index(ids)
+    start, end = index[start_id], index[end_id]
+    if start == end:
+        return [start_id], 0.0
+
+    count = len(ids)
+    total = table["distances"][start * count + end]
+    if math.isinf(total):
+        return [], 0.0
+
+    predecessors = table["predecessors"]
+    path = [end]
+    node = end
+    while node != start:
+        node = predecessors[start * count + node]
+        path.append(node)
+    path.reverse()
+    return [ids[node] for node in path], total
+
+def shortest_path_reference(galaxies: Sequence[Dict], start_id: str, end_id: str,
+                            max_jump_kpc: Optional[float] = None) -> Tuple[List[str], float]:
+    """
+    Per-query reference router (what the browser does today): build the jump
+    graph, run Dijkstra from the start and walk the predecessors back
+    """
+    ids = [g["id"] for g in galaxies]
+    start, end = ids.index(start_id), ids.index(end_id)
+    distances, previous = dijkstra(build_jump_graph(galaxy_positions(galaxies), max_jump_kpc), start)
+    if math.isinf(distances[end]):
+        return [], 0.0
+    path = [end]
+    while path[-1] != start:
+        path.append(previous[path[-1]])
+    return [ids[node] for node in reversed(path)], distances[end]
+
+def encode_route_table(table: Dict) -> bytes:
+    """Serialize a route table into the compact binary layout"""
+    count = len(table["ids"])
+    typecode, width = ("H", 2) if count < 0xFFFF else ("I", 4)
+    no_node = 0xFFFF if width == 2 else 0xFFFFFFFF
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, count, width, table["max_jump_kpc"])
+    predecessors = array(typecode, [no_node if p < 0 else p for p in table["predecessors"]])
+    return (
+        header
+        + encode_string_column(table["ids"])
+        + to_little_endian(array("f", table["distances"]))
+        + to_little_endian(predecessors)
+    )
+
+def decode_route_table(data: bytes) -> Dict:
+    """Deserialize a route table written by encode_route_table"""
+    magic, version, count, width, max_jump_kpc = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a StarMap route table")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported route table version {version}")
+
+    offset = HEADER.size
+    (ids_blob_size,) = struct.unpack_from("<I", data, offset + count * 4)
+    ids_size = (count + 1) * 4 + ids_blob_size + (-ids_blob_size % 4)
+    ids = decode_string_column(data[offset:offset + ids_size], count)
+    offset += ids_size
+
+    matrix_size = count * count
+    distances = from_little_endian("f", data[offset:offset + matrix_size * 4])
+    offset += matrix_size * 4
+
+    typecode, no_node = ("H", 0xFFFF) if width == 2 else ("I", 0xFFFFFFFF)
+    raw = from_little_endian(typecode, data[offset:offset + matrix_size * width])
+    predecessors = [-1 if p == no_node else p for p in raw]
+    return {
+        "ids": ids,
+        "index": _id_index(ids),
+        "max_jump_kpc": max_jump_kpc,
+        "distances": distances,
+        "predecessors": predecessors,
+    }
+
+def write_route_table(table: Dict, path: str) -> int:
+    """Write a route table to path, returns the number of bytes written"""
+    data = encode_route_table(table)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+def read_route_table(path: str) -> Dict:
+    """Read a route table file"""
+    with open(path, "rb") as f:
+        return decode_route_table(f.read())
@@ -4,10 +4,27 @@ Galaxy Data Scraper and Processor for Local Group
 Scrapes data from Caltech NED and supplements with distance information
 """
 
+import argparse
+import csv
 import json
 import re
 import math
-from typing import Dict, List, Tuple
+import sys
+import time
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sexagesimal import parse_sexagesimal_column
+
+try:
+    import resource  # POSIX only, used for peak memory reporting
+except ImportError:
+    resource = None
+
+# Provenance used for rows that do not carry their own
+DEFAULT_SOURCE = "Caltech NED / McConnachie 2012"
+DEFAULT_SOURCE_URL = "https://ned.ipac.caltech.edu/level5/Mateo/table1.html"
+DEFAULT_CITATION = "McConnachie, A. W. 2012, AJ, 144, 4"
 
 # Manual data compilation based on Caltech NED Local Group database
 # and supplemented with distance measurements from various astronomical databases
@@ -32,10 +49,11 @@ def parse_dec_to_degrees(dec_str: str) -> float:
 def equatorial_to_cartesian(ra_deg: float, dec_deg: float, distance_kpc: float) -> Tuple[float, float, float]:
     """
     Convert equatorial coordinates (RA, Dec, distance) to Cartesian (x, y, z)
-    Using galactocentric coordinate system where:
-    - x points toward Galactic Center
-    - y points in direction of Galactic rotation
-    - z points toward North Galactic Pole
+    Heliocentric equatorial frame where:
+    - x points toward RA 0h, Dec 0
+    - y points toward RA 6h, Dec 0
+    - z points toward the North Celestial Pole
+    See equatorial_to_galactocentric_batch for the galactocentric frame.
     """
     ra_rad = math.radians(ra_deg)
     dec_rad = math.radians(dec_deg)
@@ -47,9 +65,166 @@ def equatorial_to_cartesian(ra_deg: float, dec_deg: float, distance_kpc: float)
     
     return round(x, 2), round(y, 2), round(z, 2)
 
-def create_galaxy_database() -> List[Dict]:
+# Batch (column) variants of the functions above. They produce exactly the same
+# floats as the scalar versions, but work on whole columns so large catalogs
+# are not bottlenecked on per-row Python calls. RA/Dec strings are parsed by
+# sexagesimal.parse_sexagesimal_column, the one column parser in the build: it
+# checks that every row splits into its own fields, so a short row can never
+# borrow fields from its neighbour.
+
+def _parse_column(values: Sequence[str], hours: bool) -> List[float]:
+    """Any sexagesimal form via the sexagesimal module, ValueError listing bad rows"""
+    degrees, errors = parse_sexagesimal_column(values, hours=hours)
+    if errors:
+        shown = ", ".join(f"{idx} ({values[idx]!r})" for idx in errors[:10])
+        raise ValueError(f"{len(errors)} malformed {'RA' if hours else 'Dec'} values at rows {shown}")
+    return degrees
+
+def parse_ra_column(ra_values: Sequence[str]) -> List[float]:
+    """Convert a column of HH:MM:SS.S (or any other sexagesimal form) strings to degrees"""
+    return _parse_column(ra_values, hours=True)
+
+def parse_dec_column(dec_values: Sequence[str]) -> List[float]:
+    """Convert a column of +/-DD:MM:SS (or any other sexagesimal form) strings to degrees"""
+    return _parse_column(dec_values, hours=False)
+
+def equatorial_to_cartesian_batch(
+    ra_deg: Sequence[float],
+    dec_deg: Sequence[float],
+    distance_kpc: Sequence[float],
+) -> Tuple[List[float], List[float], List[float]]:
+    """Column version of equatorial_to_cartesian, returns (xs, ys, zs)"""
+    ra_rad = list(map(math.radians, ra_deg))
+    dec_rad = list(map(math.radians, dec_deg))
+    cos_dec = list(map(math.cos, dec_rad))
+    d_cos_dec = [d * c for d, c in zip(distance_kpc, cos_dec)]
+
+    xs = [round(dc * c, 2) for dc, c in zip(d_cos_dec, map(math.cos, ra_rad))]
+    ys = [round(dc * s, 2) for dc, s in zip(d_cos_dec, map(math.sin, ra_rad))]
+    zs = [round(d * s, 2) for d, s in zip(distance_kpc, map(math.sin, dec_rad))]
+    return xs, ys, zs
+
+# ICRS -> Galactic rotation matrix (Hipparcos catalogue, ESA 1997, vol. 1, sec. 1.5.3)
+ICRS_TO_GALACTIC = (
+    (-0.0548755604162154, -0.8734370902348850, -0.4838350155487132),
+    (+0.4941094278755837, -0.4448296299600112, +0.7469822444972189),
+    (-0.8676661490190047, -0.1980763734312015, +0.4559837761750669),
+)
+
+# Sun's galactocentric position in kpc, same values as src/services/stellarCoordinates.js
+SUN_GALACTOCENTRIC_KPC = (8.0, 0.0, 0.02)
+
+def equatorial_to_galactic_vectors(
+    ra_deg: Sequence[float],
+    dec_deg: Sequence[float],
+) -> Tuple[List[float], List[float], List[float]]:
+    """Rotate RA/Dec columns into heliocentric Galactic unit vectors (x to l=0, y to l=90, z to b=90)"""
+    (a00, a01, a02), (a10, a11, a12), (a20, a21, a22) = ICRS_TO_GALACTIC
+    gx, gy, gz = [], [], []
+    for ra, dec in zip(map(math.radians, ra_deg), map(math.radians, dec_deg)):
+        cos_dec = math.cos(dec)
+        ex, ey, ez = cos_dec * math.cos(ra), cos_dec * math.sin(ra), math.sin(dec)
+        gx.append(a00 * ex + a01 * ey + a02 * ez)
+        gy.append(a10 * ex + a11 * ey + a12 * ez)
+        gz.append(a20 * ex + a21 * ey + a22 * ez)
+    return gx, gy, gz
+
+def equatorial_to_galactic_batch(
+    ra_deg: Sequence[float],
+    dec_deg: Sequence[float],
+) -> Tuple[List[float], List[float]]:
+    """Convert RA/Dec columns to Galactic longitude/latitude columns (degrees)"""
+    gx, gy, gz = equatorial_to_galactic_vectors(ra_deg, dec_deg)
+    l_deg = [math.degrees(math.atan2(y, x)) % 360 for x, y in zip(gx, gy)]
+    b_deg = [math.degrees(math.asin(max(-1.0, min(1.0, z)))) for z in gz]
+    return l_deg, b_deg
+
+def equatorial_to_galactocentric_batch(
+    ra_deg: Sequence[float],
+    dec_deg: Sequence[float],
+    distance_kpc: Sequence[float],
+    digits: Optional[int] = 2,
+) -> Tuple[List[float], List[float], List[float]]:
+    """
+    Convert RA/Dec/heliocentric distance columns to render-ready galactocentric
+    Cartesian columns, in the frame the front end uses for stars:
+    - the Galactic Center is the origin and the Sun sits at SUN_GALACTOCENTRIC_KPC
+    - x decreases toward the Galactic Center as seen from the Sun
+    - y points toward l = 90 (Galactic rotation), z toward the North Galactic Pole
+    Rows with distance 0 are the Milky Way itself and are placed at the origin.
+    """
+    sun_x, sun_y, sun_z = SUN_GALACTOCENTRIC_KPC
+    gx, gy, gz = equatorial_to_galactic_vectors(ra_deg, dec_deg)
+    xs, ys, zs = [], [], []
+    for d, x, y, z in zip(distance_kpc, gx, gy, gz):
+        if d == 0:
+            xs.append(0.0)
+            ys.append(0.0)
+            zs.append(0.0)
+        else:
+            xs.append(sun_x - d * x)
+            ys.append(sun_y + d * y)
+            zs.append(sun_z + d * z)
+    if digits is not None:
+        xs, ys, zs = ([round(v, digits) for v in column] for column in (xs, ys, zs))
+    return xs, ys, zs
+
+def make_galaxy_id(name: str) -> str:
+    """Create a galaxy ID from its name"""
+    return name.lower().replace(" ", "_").replace("(", "").replace(")", "")
+
+def convert_coordinates(rows: Sequence[Dict], galactocentric: bool = False) -> Tuple[List[float], List[float], Tuple[List[float], ...]]:
+    """
+    Column-wise RA/Dec parsing and Cartesian conversion of raw rows: (ra_deg, dec_deg, (xs, ys, zs))
+    position_3d is heliocentric equatorial unless galactocentric is set
     """
-    Create comprehensive Local Group galaxy database
+    ra_deg = parse_ra_column([row["ra"] for row in rows])
+    dec_deg = parse_dec_column([row["dec"] for row in rows])
+    to_cartesian = equatorial_to_galactocentric_batch if galactocentric else equatorial_to_cartesian_batch
+    return ra_deg, dec_deg, to_cartesian(ra_deg, dec_deg, [row["distance_kpc"] for row in rows])
+
+def galaxy_record(row: Dict, ra_deg: float, dec_deg: float, x: float, y: float, z: float) -> Dict:
+    """
+    The galaxies.json record for one raw row and its converted coordinates
+    The only place the record shape is defined (process_galaxies and records.GalaxyTable both use it)
+    """
+    return {
+        "id": make_galaxy_id(row["name"]),
+        "name": row["name"],
+        "alternate_names": row["alternate_names"],
+        "type": row["type"],
+        "coordinates": {
+            "ra": row["ra"],
+            "dec": row["dec"],
+            "ra_deg": round(ra_deg, 6),
+            "dec_deg": round(dec_deg, 6)
+        },
+        "position_3d": {
+            "x": x,
+            "y": y,
+            "z": z
+        },
+        "distance_kpc": row["distance_kpc"],
+        "distance_uncertainty_kpc": round(row["distance_kpc"] * 0.05, 1),  # Assume 5% uncertainty
+        "size_estimate_kpc": row["size_estimate_kpc"],
+        "morphological_type": row["type"],
+        "notes": row["notes"],
+        "source": row.get("source", DEFAULT_SOURCE),
+        "source_url": row.get("source_url", DEFAULT_SOURCE_URL),
+        "citation": row.get("citation", DEFAULT_CITATION)
+    }
+
+def process_galaxies(galaxies_raw: Sequence[Dict], galactocentric: bool = False) -> List[Dict]:
+    """
+    Turn raw catalog rows into galaxy records, converting coordinates column-wise
+    position_3d is heliocentric equatorial unless galactocentric is set
+    """
+    ra_deg, dec_deg, (xs, ys, zs) = convert_coordinates(galaxies_raw, galactocentric)
+    return [galaxy_record(*columns) for columns in zip(galaxies_raw, ra_deg, dec_deg, xs, ys, zs)]
+
+def builtin_galaxy_rows() -> List[Dict]:
+    """
+    Raw rows of the built-in Local Group galaxy list
     Data compiled from:
     - Caltech NED Local Group database
     - McConnachie 2012 (The Observed Properties of Dwarf Galaxies)
@@ -499,56 +674,20 @@ def create_galaxy_database() -> List[Dict]:
         },
     ]
     
-    # Process each galaxy
-    galaxies = []
-    for idx, gal in enumerate(galaxies_raw):
-        # Parse coordinates
-        ra_deg = parse_ra_to_degrees(gal["ra"])
-        dec_deg = parse_dec_to_degrees(gal["dec"])
-        
-        # Convert to 3D Cartesian
-        x, y, z = equatorial_to_cartesian(ra_deg, dec_deg, gal["distance_kpc"])
-        
-        # Create ID from name
-        galaxy_id = gal["name"].lower().replace(" ", "_").replace("(", "").replace(")", "")
-        
-        # Build galaxy object
-        galaxy = {
-            "id": galaxy_id,
-            "name": gal["name"],
-            "alternate_names": gal["alternate_names"],
-            "type": gal["type"],
-            "coordinates": {
-                "ra": gal["ra"],
-                "dec": gal["dec"],
-                "ra_deg": round(ra_deg, 6),
-                "dec_deg": round(dec_deg, 6)
-            },
-            "position_3d": {
-                "x": x,
-                "y": y,
-                "z": z
-            },
-            "distance_kpc": gal["distance_kpc"],
-            "distance_uncertainty_kpc": round(gal["distance_kpc"] * 0.05, 1),  # Assume 5% uncertainty
-            "size_estimate_kpc": gal["size_estimate_kpc"],
-            "morphological_type": gal["type"],
-            "notes": gal["notes"],
-            "source": "Caltech NED / McConnachie 2012",
-            "source_url": "https://ned.ipac.caltech.edu/level5/Mateo/table1.html",
-            "citation": "McConnachie, A. W. 2012, AJ, 144, 4"
-        }
-        
-        galaxies.append(galaxy)
-    
-    return galaxies
+    return galaxies_raw
 
-def create_metadata() -> Dict:
+def create_galaxy_database(galactocentric: bool = False) -> List[Dict]:
+    """Create comprehensive Local Group galaxy database"""
+    return process_galaxies(builtin_galaxy_rows(), galactocentric=galactocentric)
+
+GALACTOCENTRIC_COORDINATE_SYSTEM = "Equatorial J2000.0 (ICRS), converted to galactocentric Cartesian (kpc)"
+
+def create_metadata(galaxy_count: int, galactocentric: bool = False) -> Dict:
     """Create metadata about the dataset"""
     return {
         "version": "1.0",
         "created": "2025-10-21",
-        "galaxy_count": 42,
+        "galaxy_count": galaxy_count,
         "sources": [
             {
                 "name": "Caltech NED Local Group Database",
@@ -566,40 +705,411 @@ def create_metadata() -> Dict:
                 "description": "Distance measurements and photometry"
             }
         ],
-        "coordinate_system": "Equatorial J2000.0, converted to Cartesian (kpc)",
+        "coordinate_system": (GALACTOCENTRIC_COORDINATE_SYSTEM if galactocentric
+                              else "Equatorial J2000.0, converted to Cartesian (kpc)"),
         "notes": "Distances in kiloparsecs (kpc). 1 kpc = 3,260.47 light-years"
     }
 
+# Streaming ingest for external catalogs that do not fit in memory.
+# Rows are read lazily, converted in fixed-size chunks and written out as they
+# are produced, so peak memory depends on the chunk size, not the catalog size.
+
+def _parse_csv_row(row: Dict[str, str]) -> Dict:
+    """Convert a CSV row (all strings) to the raw galaxy row shape"""
+    aliases = row.get("alternate_names") or ""
+    return {
+        "name": row["name"],
+        "alternate_names": [a.strip() for a in aliases.split(";") if a.strip()],
+        "type": row["type"],
+        "ra": row["ra"],
+        "dec": row["dec"],
+        "distance_kpc": float(row["distance_kpc"]),
+        "size_estimate_kpc": float(row["size_estimate_kpc"]),
+        "notes": row.get("notes") or "",
+    }
+
+def read_catalog_rows(path: str) -> Iterator[Dict]:
+    """
+    Lazily read raw galaxy rows from a local catalog file
+    - .csv: header with name, alternate_names (';' separated), type, ra, dec,
+      distance_kpc, size_estimate_kpc, notes
+    - .ndjson / .jsonl: one raw row object per line
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(f):
+                yield _parse_csv_row(row)
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+def iter_chunks(rows: Iterable[Dict], chunk_size: int) -> Iterator[List[Dict]]:
+    """Group an iterable of rows into lists of at most chunk_size rows"""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def peak_memory_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None if unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def stream_galaxies(rows: Iterable[Dict], output_path: str, chunk_size: int = 10_000,
+                    ndjson: bool = False) -> Dict:
+    """
+    Convert rows chunk by chunk and write them incrementally to output_path,
+    either as a JSON array (one record per line) or as NDJSON.
+    Returns ingest statistics.
+    """
+    start = time.perf_counter()
+    count = 0
+    with open(output_path, "w", encoding="utf-8") as f:
+        if not ndjson:
+            f.write("[")
+        for chunk in iter_chunks(rows, chunk_size):
+            for galaxy in process_galaxies(chunk):
+                line = json.dumps(galaxy, ensure_ascii=False)
+                if ndjson:
+                    f.write(line + "\n")
+                else:
+                    f.write(("\n" if count == 0 else ",\n") + line)
+                count += 1
+        if not ndjson:
+            f.write("\n]\n" if count else "]\n")
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": count,
+        "seconds": elapsed,
+        "rows_per_sec": count / elapsed if elapsed > 0 else 0.0,
+        "peak_memory_mb": peak_memory_mb(),
+    }
+
+def run_streaming(args: argparse.Namespace) -> None:
+    """Streaming ingest of an external catalog file"""
+    print(f"\n📥 Streaming {args.input} -> {args.output} (chunks of {args.chunk_size:,})")
+    stats = stream_galaxies(read_catalog_rows(args.input), args.output,
+                            chunk_size=args.chunk_size, ndjson=args.ndjson)
+    print(f"✓ Wrote {stats['rows']:,} galaxies in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_sec']:,.0f} rows/s)")
+    if stats["peak_memory_mb"] is not None:
+        print(f"  Peak RSS (process high-water mark): {stats['peak_memory_mb']:.1f} MB")
+
+def build_galaxy_records(rows: Sequence[Dict], report, cache: Dict[str, Dict],
+                         galactocentric: bool = False) -> Tuple[List[Dict], Dict[str, Dict]]:
+    """
+    Transform and validate stages of a build: (galaxies, updated row cache),
+    with the validation result in report.validation (a build_report.BuildReport).
+    An exception in either stage marks the report failed before it propagates
+    """
+    from build_cache import process_galaxies_cached
+    from build_report import MAX_REPORTED_ERRORS, validate_galaxies
+
+    try:
+        with report.stage("transform") as stage:
+            galaxies, cache, recomputed = process_galaxies_cached(rows, cache, galactocentric=galactocentric)
+            stage["recomputed"] = recomputed
+        print(f"✓ Processed {len(galaxies)} galaxies ({recomputed} recomputed, {len(galaxies) - recomputed} cached)")
+        report.counts["galaxies"] = len(galaxies)
+
+        with report.stage("validate"):
+            errors = validate_galaxies(galaxies)
+    except Exception as exc:
+        report.fail(exc)
+        raise
+    report.validation = {"checked": len(galaxies), "errors": errors[:MAX_REPORTED_ERRORS], "error_count": len(errors)}
+    return galaxies, cache
+
 def main():
     """Main execution"""
+    from writers import COMPRESSORS, WRITERS
+
+    parser = argparse.ArgumentParser(description="Local Group galaxy data processor")
+    parser.add_argument("--input", help="Stream an external catalog (.csv or .ndjson) instead of the built-in list")
+    parser.add_argument("--output", help="Output path for --input (default: public/data/galaxies.json[l])")
+    parser.add_argument("--sources", nargs="+", metavar="LABEL=PATH[:FORMAT]",
+                        help="Ingest and cross-match local catalog files instead of the built-in list")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for --sources and --uncertainty (default: one per file / CPU)")
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="Rows converted per chunk when streaming")
+    parser.add_argument("--ndjson", action="store_true", help="Write NDJSON instead of a JSON array when streaming")
+    parser.add_argument("--binary", action="store_true", help="Also write the columnar binary catalog (galaxies.bin)")
+    parser.add_argument("--formats", nargs="+", default=[], choices=sorted(WRITERS),
+                        help="Extra catalog formats next to galaxies.json (galaxies.min.json, .ndjson, .bin)")
+    parser.add_argument("--compress", nargs="+", default=[], choices=sorted(set(COMPRESSORS) | {"brotli"}),
+                        help="Also write pre-compressed .gz/.br siblings of the catalog outputs")
+    parser.add_argument("--routes", action="store_true", help="Also write the precomputed route table (routes.bin)")
+    parser.add_argument("--max-jump", type=float, default=None, help="Maximum jump range in kpc for --routes")
+    parser.add_argument("--spatial-index", action="store_true", help="Also write the k-d tree spatial index (spatial_index.bin)")
+    parser.add_argument("--search-index", action="store_true",
+                        help="Also write the name/alias trigram search index (search_index.json)")
+    parser.add_argument("--tiles", action="store_true",
+                        help="Also write octree-sharded binary tiles (tiles/<key>.bin + tiles/index.json)")
+    parser.add_argument("--tile-size", type=int, default=4096, help="Maximum objects per tile for --tiles")
+    parser.add_argument("--particles", action="store_true",
+                        help="Also write seeded, LOD-ordered per-galaxy particle buffers (particles/<id>.bin + manifest.json)")
+    parser.add_argument("--particle-seed", type=int, default=None, help="Base seed for --particles")
+    parser.add_argument("--stars", metavar="PATH",
+                        help="Also ingest a star catalog (.csv, .json or .ndjson) into nearby_stars.json + nearby_stars.bin")
+    parser.add_argument("--star-max-mag", type=float, default=None, help="Faintest apparent magnitude kept by --stars")
+    parser.add_argument("--star-max-abs-mag", type=float, default=None,
+                        help="Faintest absolute magnitude kept by --stars")
+    parser.add_argument("--kinematics", metavar="PATH",
+                        help="Galaxy proper motions/radial velocities (.csv or .json keyed by id or name); writes keyframes/galaxies.bin")
+    parser.add_argument("--epochs", type=float, nargs=3, default=[0.0, 6000.0, 121], metavar=("START", "END", "COUNT"),
+                        help="Galaxy keyframe epochs in Myr from J2000 (default: 0 6000 121)")
+    parser.add_argument("--star-epochs", type=float, nargs=3, default=[0.0, 1.0, 101], metavar=("START", "END", "COUNT"),
+                        help="Star keyframe epochs in Myr, used when --stars rows carry pmra/pmdec/rv (default: 0 1 101)")
+    parser.add_argument("--uncertainty", action="store_true",
+                        help="Also write Monte Carlo error ellipsoids and neighbour travel-time bounds (uncertainty.json)")
+    parser.add_argument("--samples", type=int, default=1000, help="Monte Carlo samples per object for --uncertainty")
+    parser.add_argument("--sky-error", type=float, default=0.0, help="RA/Dec 1-sigma error in arcsec for --uncertainty")
+    parser.add_argument("--galactocentric", action="store_true",
+                        help="Emit render-ready galactocentric position_3d instead of heliocentric equatorial")
+    parser.add_argument("--patches", action="store_true",
+                        help="Diff galaxies.json against the previous build: write patches/ and a version chain in metadata.json "
+                             "(later builds keep the chain going)")
+    parser.add_argument("--force", action="store_true", help="Ignore the build cache and rewrite every output file")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Record each stage's peak Python allocations (tracemalloc) in the build report; slows the build")
+    parser.add_argument("--report", default=None, help="Path of the JSON build report (default: .build_cache/build_report.json)")
+    args = parser.parse_args()
+
     print("🌌 Local Group Galaxy Data Processor")
     print("=" * 50)
+
+    if args.input:
+        if not args.output:
+            args.output = "public/data/galaxies.jsonl" if args.ndjson else "public/data/galaxies.json"
+        run_streaming(args)
+        print("=" * 50)
+        return
     
-    # Create galaxy database
+    from build_cache import load_cache, save_cache, write_if_changed
+    from build_report import DEFAULT_REPORT_PATH, MAX_REPORTED_ERRORS, BuildReport
+
+    if args.trace_memory:
+        import tracemalloc
+        tracemalloc.start()
+    report = BuildReport()
+
+    # Read raw rows
     print("\n📊 Processing galaxy data...")
-    galaxies = create_galaxy_database()
-    print(f"✓ Processed {len(galaxies)} galaxies")
-    
-    # Create metadata
-    metadata = create_metadata()
-    metadata["galaxy_count"] = len(galaxies)
-    
-    # Save to JSON files
-    print("\n💾 Saving data files...")
-    
-    # Create public/data directory
+    with report.stage("parse") as stage:
+        if args.sources:
+            from ingest import ingest_catalogs, parse_source_spec
+            sources = [parse_source_spec(spec) for spec in args.sources]
+            skipped: List[str] = []
+            rows = ingest_catalogs(sources, workers=args.workers, skipped=skipped)
+            print(f"✓ Merged {len(sources)} catalog sources")
+            if skipped:
+                print(f"⚠️  Skipped {len(skipped)} unparseable or unplaceable rows:")
+                for note in skipped[:MAX_REPORTED_ERRORS]:
+                    print(f"  {note}")
+                stage["skipped_rows"] = len(skipped)
+        else:
+            rows = builtin_galaxy_rows()
+        stage["rows"] = len(rows)
+
+    # Create galaxy database and check every record before anything is written or cached
+    try:
+        galaxies, cache = build_galaxy_records(rows, report, {} if args.force else load_cache(),
+                                               galactocentric=args.galactocentric)
+    except Exception:
+        report.save(args.report or DEFAULT_REPORT_PATH)
+        raise
+    errors = report.validation["errors"]
+    if errors:
+        report.status = "failed"
+        report.save(args.report or DEFAULT_REPORT_PATH)
+        print(f"\n❌ Validation failed with {report.validation['error_count']} errors:")
+        for error in errors:
+            print(f"  {error}")
+        sys.exit(1)
+    save_cache(cache)
+    print(f"✓ Validated {len(galaxies)} records")
+
+    # Serialize every output, then write the ones whose bytes changed
     import os
-    os.makedirs("public/data", exist_ok=True)
-    
-    # Save galaxies
-    with open("public/data/galaxies.json", "w", encoding="utf-8") as f:
-        json.dump(galaxies, f, indent=2, ensure_ascii=False)
-    print("✓ Saved public/data/galaxies.json")
-    
-    # Save metadata
-    with open("public/data/metadata.json", "w", encoding="utf-8") as f:
-        json.dump(metadata, f, indent=2, ensure_ascii=False)
-    print("✓ Saved public/data/metadata.json")
+    from writers import EncodeQueue, available_compressors, print_format_table
+    outputs: Dict[str, bytes] = {}
+    with report.stage("serialize"):
+        # Catalog formats are encoded (and compressed) on a background thread
+        # while the derived artifacts below are computed
+        compressors = available_compressors(args.compress)
+        encoder = EncodeQueue(compressors)
+        formats = ["json"] + [fmt for fmt in args.formats if fmt != "json"]
+        if args.binary and "binary" not in formats:
+            formats.append("binary")
+        for fmt in formats:
+            encoder.submit_format(fmt, "public/data/galaxies", galaxies)
+
+        # Derived artifacts are cached per stage (see build_cache.py): a stage
+        # only runs when its code or inputs changed since the last build
+        from build_cache import cached_stage, content_hash, file_hash, stage_key
+        galaxies_digest = content_hash(galaxies)
+        cached_stages: List[str] = []
+
+        def derived(name: str, modules: Sequence[str], inputs: Sequence, compute) -> Dict:
+            """Run or reuse a stage whose compute() returns {"outputs", "counts", ...}"""
+            value, hit = cached_stage(name, stage_key(modules, *inputs), compute, force=args.force)
+            if hit:
+                cached_stages.append(name)
+            outputs.update(value["outputs"])
+            report.counts.update(value["counts"])
+            return value
+
+        if args.routes:
+            def compute_routes() -> Dict:
+                from routing import build_route_table, encode_route_table
+                table = encode_route_table(build_route_table(galaxies, args.max_jump))
+                return {"outputs": {"public/data/routes.bin": table}, "counts": {}}
+            derived("routes", ["routing"], [galaxies_digest, args.max_jump], compute_routes)
+
+        if args.spatial_index:
+            def compute_spatial_index() -> Dict:
+                from routing import galaxy_positions
+                from spatial_index import build_spatial_index, encode_spatial_index
+                index = encode_spatial_index(build_spatial_index(galaxy_positions(galaxies)))
+                return {"outputs": {"public/data/spatial_index.bin": index}, "counts": {}}
+            derived("spatial_index", ["routing", "spatial_index"], [galaxies_digest], compute_spatial_index)
+
+        if args.search_index:
+            def compute_search_index() -> Dict:
+                from search_index import build_search_index, encode_search_index
+                index = encode_search_index(build_search_index(galaxies))
+                return {"outputs": {"public/data/search_index.json": index}, "counts": {}}
+            derived("search_index", ["search_index"], [galaxies_digest], compute_search_index)
+
+        if args.tiles:
+            def compute_tiles() -> Dict:
+                from tiles import encode_tiles
+                index, tile_files = encode_tiles(galaxies, max_per_tile=args.tile_size)
+                files = {f"public/data/{path}": data for path, data in tile_files.items()}
+                files["public/data/tiles/index.json"] = json.dumps(index, indent=2, ensure_ascii=False).encode("utf-8")
+                return {"outputs": files, "counts": {"tiles": len(tile_files)}}
+            derived("tiles", ["tiles"], [galaxies_digest, args.tile_size], compute_tiles)
+
+        if args.particles:
+            from particles import DEFAULT_SEED
+            seed = DEFAULT_SEED if args.particle_seed is None else args.particle_seed
+
+            def compute_particles() -> Dict:
+                from particles import build_lod, encode_particles, generate_particles, particle_count
+                manifest = {"version": 2, "seed": seed, "galaxies": {}}
+                files = {}
+                for galaxy in galaxies:
+                    particles = generate_particles(galaxy, seed)
+                    if particles is None:
+                        continue
+                    path = f"particles/{galaxy['id']}.bin"
+                    files[f"public/data/{path}"] = encode_particles(particles)
+                    manifest["galaxies"][galaxy["id"]] = {
+                        "file": path,
+                        "renderer": particles["renderer"],
+                        "count": particle_count(particles),
+                        "lod": build_lod(particles),
+                    }
+                files["public/data/particles/manifest.json"] = json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8")
+                return {"outputs": files, "galaxies": len(manifest["galaxies"]),
+                        "counts": {"particles": sum(entry["count"] for entry in manifest["galaxies"].values())}}
+            particle_stage = derived("particles", ["particles"], [galaxies_digest, seed], compute_particles)
+
+        if args.stars:
+            def compute_stars() -> Dict:
+                from kinematics import epoch_range, plan_star_motion, propagate_keyframes
+                from stars import StarCatalogEncoder, ingest_stars
+                # Chunks are encoded as they arrive; only the compact motion plan is kept across chunks
+                encoder = StarCatalogEncoder()
+                moving_stars = []
+                star_rows = 0
+                for chunk, read in ingest_stars(args.stars, chunk_size=args.chunk_size, max_apparent_mag=args.star_max_mag,
+                                                max_absolute_mag=args.star_max_abs_mag):
+                    star_rows += read
+                    encoder.add(chunk)
+                    moving_stars.extend(plan_star_motion(chunk))
+                files = {"public/data/nearby_stars.json": encoder.json_bytes(),
+                         "public/data/nearby_stars.bin": encoder.binary_bytes()}
+                counts = {"stars": encoder.count}
+                if moving_stars:
+                    files["public/data/keyframes/stars.bin"] = propagate_keyframes(
+                        moving_stars, epoch_range(*args.star_epochs), workers=args.workers)
+                    counts["moving_stars"] = len(moving_stars)
+                return {"outputs": files, "counts": counts, "read": star_rows}
+            star_stage = derived("stars", ["stars", "kinematics"],
+                                 [file_hash(args.stars), args.star_max_mag, args.star_max_abs_mag, args.star_epochs],
+                                 compute_stars)
+            print(f"✓ Ingested {star_stage['counts']['stars']:,} of {star_stage['read']:,} catalog stars")
+
+        if args.kinematics:
+            from kinematics import epoch_range
+            epochs = epoch_range(*args.epochs)
+
+            def compute_kinematics() -> Dict:
+                from kinematics import load_kinematics, plan_galaxy_motion, propagate_keyframes
+                moving = plan_galaxy_motion(galaxies, load_kinematics(args.kinematics), galactocentric=args.galactocentric)
+                return {"outputs": {"public/data/keyframes/galaxies.bin": propagate_keyframes(moving, epochs, workers=args.workers)},
+                        "counts": {"moving_galaxies": len(moving)}}
+            motion = derived("kinematics", ["kinematics"],
+                             [galaxies_digest, file_hash(args.kinematics), args.epochs, args.galactocentric],
+                             compute_kinematics)
+            print(f"✓ Propagated {motion['counts']['moving_galaxies']:,} galaxies over {len(epochs):,} epochs")
+
+        if args.uncertainty:
+            def compute_uncertainty() -> Dict:
+                from routing import galaxy_positions
+                from uncertainty import neighbor_pairs, propagate_uncertainties
+                uncertainty = propagate_uncertainties(galaxies, neighbor_pairs(galaxy_positions(galaxies)),
+                                                      samples=args.samples, sky_error_arcsec=args.sky_error,
+                                                      galactocentric=args.galactocentric, workers=args.workers)
+                data = json.dumps(uncertainty, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                return {"outputs": {"public/data/uncertainty.json": data},
+                        "counts": {"uncertainty_pairs": len(uncertainty["pairs"])}}
+            derived("uncertainty", ["routing", "uncertainty"],
+                    [galaxies_digest, args.samples, args.sky_error, args.galactocentric], compute_uncertainty)
+
+        if cached_stages:
+            print(f"✓ Reused cached {', '.join(cached_stages)} (same code and inputs as the last build)")
+
+        outputs = {**encoder.results(), **outputs}
+        report.formats = encoder.stats
+
+        # Metadata is written last
+        metadata = create_metadata(len(galaxies), galactocentric=args.galactocentric)
+        from patches import catalog_versioning
+        version_fields, patch_files = catalog_versioning(outputs["public/data/galaxies.json"], enabled=args.patches)
+        if version_fields is not None:
+            metadata.update(version_fields)
+            outputs.update((f"public/data/{path}", data) for path, data in patch_files.items())
+            print(f"✓ Catalog version {version_fields['catalog_version']} "
+                  f"({len(patch_files)} new patch{'' if len(patch_files) == 1 else 'es'})")
+        outputs["public/data/metadata.json"] = json.dumps(metadata, indent=2, ensure_ascii=False).encode("utf-8")
+
+    print("\n💾 Saving data files...")
+    with report.stage("write") as stage:
+        for path, data in outputs.items():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            written = write_if_changed(path, data, force=args.force)
+            report.record_output(path, len(data), written)
+            print(f"✓ Saved {path}" if written else f"✓ {path} unchanged")
+        stage["bytes"] = sum(len(data) for data in outputs.values())
+    if args.particles:
+        print(f"  {report.counts['particles']:,} particles for {particle_stage['galaxies']} galaxies")
+
+    report.status = "ok"
+    report.save(args.report or DEFAULT_REPORT_PATH)
+    if len(report.formats) > 1 or compressors:
+        print("\n📦 Catalog formats:")
+        print_format_table(report.formats, compressors)
+    report.print_summary()
+    print(f"✓ Build report: {args.report or DEFAULT_REPORT_PATH}")
     
     # Print statistics
     print("\n📈 Database Statistics:")
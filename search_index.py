@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Name/alias search index for the galaxy catalog
+Every name and alternate name is folded to a search term (accents removed,
+lower case, letters and digits only: "Boötes I" -> "bootesi") and split into
+trigrams padded with "$" at both ends. A query matches an object when the
+folded query is a substring of one of its terms, the same rule
+searchGalaxies() in src/services/dataLoader.js applies, so a lookup only
+verifies the terms listed under the query's rarest trigram.
+
+Serialized as minified JSON for the browser:
+- ids: object ids in catalog order
+- terms: folded terms, term_object: object index of each term
+- postings: {trigram: term indices, delta encoded (first value absolute)}
+"""
+
+import json
+from typing import Dict, List, Optional, Sequence
+
+from ingest import normalize_name
+
+INDEX_VERSION = 1
+GRAM = 3
+PAD = "$"
+
+def object_terms(galaxy: Dict) -> List[str]:
+    """Distinct folded search terms of a galaxy (name first, then aliases)"""
+    names = [galaxy["name"]] + list(galaxy.get("alternate_names") or [])
+    return [term for term in dict.fromkeys(normalize_name(name) for name in names) if term]
+
+def term_grams(term: str) -> List[str]:
+    """Distinct padded trigrams of a term"""
+    padded = PAD + term + PAD
+    return list(dict.fromkeys(padded[i:i + GRAM] for i in range(len(padded) - GRAM + 1)))
+
+def _delta_encode(values: Sequence[int]) -> List[int]:
+    return [values[0]] + [b - a for a, b in zip(values, values[1:])] if values else []
+
+def _delta_decode(values: Sequence[int]) -> List[int]:
+    decoded, total = [], 0
+    for value in values:
+        total += value
+        decoded.append(total)
+    return decoded
+
+def build_search_index(galaxies: Sequence[Dict]) -> Dict:
+    """Build the serializable search index"""
+    terms: List[str] = []
+    term_object: List[int] = []
+    postings: Dict[str, List[int]] = {}
+    for obj, galaxy in enumerate(galaxies):
+        for term in object_terms(galaxy):
+            for gram in term_grams(term):
+                postings.setdefault(gram, []).append(len(terms))
+            terms.append(term)
+            term_object.append(obj)
+    return {
+        "version": INDEX_VERSION,
+        "gram": GRAM,
+        "ids": [galaxy["id"] for galaxy in galaxies],
+        "terms": terms,
+        "term_object": term_object,
+        "postings": {gram: _delta_encode(postings[gram]) for gram in sorted(postings)},
+    }
+
+def encode_search_index(index: Dict) -> bytes:
+    """Minified JSON bytes of a search index"""
+    return json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def load_search_index(index: Dict) -> Dict:
+    """Decode postings for querying; also maps every bigram to the trigrams that contain it"""
+    postings = {gram: _delta_decode(values) for gram, values in index["postings"].items()}
+    by_bigram: Dict[str, List[str]] = {}
+    for gram in postings:
+        for bigram in dict.fromkeys((gram[:2], gram[1:])):
+            if PAD not in bigram:
+                by_bigram.setdefault(bigram, []).append(gram)
+    return {**index, "postings": postings, "by_bigram": by_bigram}
+
+def search(loaded: Dict, query: str, limit: Optional[int] = None) -> List[str]:
+    """
+    Ids of objects with a term containing the folded query, in catalog order
+    (loaded comes from load_search_index)
+    """
+    needle = normalize_name(query or "")
+    if not needle:
+        return []
+    terms, term_object, postings = loaded["terms"], loaded["term_object"], loaded["postings"]
+
+    if len(needle) >= GRAM:
+        grams = [needle[i:i + GRAM] for i in range(len(needle) - GRAM + 1)]
+        lists = [postings.get(gram) for gram in grams]
+        if not all(lists):
+            return []
+        candidates = min(lists, key=len)
+    elif len(needle) == 2:
+        candidates = sorted({t for gram in loaded["by_bigram"].get(needle, ()) for t in postings[gram]})
+    else:
+        candidates = range(len(terms))
+
+    objects = sorted({term_object[t] for t in candidates if needle in terms[t]})
+    ids = [loaded["ids"][obj] for obj in objects]
+    return ids[:limit] if limit is not None else ids
+
+def linear_search(galaxies: Sequence[Dict], query: str) -> List[str]:
+    """Reference search: scan every name and alias, same semantics as search()"""
+    needle = normalize_name(query or "")
+    if not needle:
+        return []
+    return [galaxy["id"] for galaxy in galaxies if any(needle in term for term in object_terms(galaxy))]
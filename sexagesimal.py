@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Column parser for sexagesimal RA/Dec strings
+Accepts the forms found in real catalogs - "00:42:44.3", "00 42 44.3",
+"00h42m44.3s", "+41:16:09", "+41 16 09", "+41d16m09s", "+41°16′09″" or
++41°16'09" - and decimal degrees, mixed freely within one column. A single
+RA field with an hour marker ("12h", "12.5h") is decimal hours.
+
+A whole column is joined into one string, every separator is mapped to a
+space with a single str.translate() and all fields go through one
+map(float) call, so the per-row Python work is a single arithmetic
+expression. Blocks of rows that do not fit the three-field fast path are
+re-parsed row by row, and rows that cannot be parsed are reported by index.
+"""
+
+import math
+from typing import List, Optional, Sequence, Tuple, Union
+
+Column = Union[Sequence[str], bytes]
+
+# Every separator (and the Unicode minus) in one str.translate() table
+_SEPARATOR_TABLE = str.maketrans({**{c: " " for c in ":hHmMsSdD'\"°′″ʹʺ"}, "−": "-"})
+
+_HOUR_MARKERS = ("h", "H")
+
+# Appended to every row before splitting, to check that rows split evenly
+_ROW_MARKER = " |\n"
+
+# Seconds of exactly 60 show up in catalogs as a rounding artifact ("59.96" -> "60.0")
+MAX_SECONDS = 60.0
+
+# Rows per block when a column does not parse in one pass
+FALLBACK_BLOCK_ROWS = 1024
+
+def _to_lines(values: Column) -> Sequence[str]:
+    """Rows of a column, decoding a newline separated UTF-8 buffer"""
+    if isinstance(values, (bytes, bytearray, memoryview)):
+        text = bytes(values).decode("utf-8").rstrip("\n")
+        return text.split("\n") if text else []
+    return values
+
+def _has_hour_marker(value: str) -> bool:
+    return any(marker in value for marker in _HOUR_MARKERS)
+
+def _parse_fields(fields: Sequence[str], hours: bool, hour_marker: bool = False) -> float:
+    """
+    Degrees for the separated fields of one value, raising ValueError if malformed
+    hour_marker says the raw value carried an "h", which makes a single field decimal hours
+    """
+    if hour_marker and not hours:
+        raise ValueError("hour marker on a Dec value")
+    sign = 1
+    if fields and fields[0] in ("+", "-"):
+        sign = -1 if fields[0] == "-" else 1
+        fields = fields[1:]
+    if not 1 <= len(fields) <= 3:
+        raise ValueError(f"expected 1 to 3 fields, got {len(fields)}")
+    if any(field[:1] in ("+", "-") for field in fields[1:]):
+        raise ValueError("sign on minutes or seconds")
+    if fields[0][:1] == "-":
+        sign = -sign
+    values = [abs(float(field)) for field in fields]
+    if not all(map(math.isfinite, values)):
+        raise ValueError("non-finite field")
+    if (len(values) > 1 and values[1] >= 60) or (len(values) > 2 and values[2] > MAX_SECONDS):
+        raise ValueError("minutes/seconds out of range")
+
+    if len(values) == 1 and hour_marker:
+        if sign < 0 or values[0] >= 24:
+            raise ValueError("RA out of range")
+        return values[0] * 15
+    if len(values) == 1:
+        # A bare single field is decimal degrees, for RA as well
+        if (hours and (sign < 0 or values[0] >= 360)) or (not hours and values[0] > 90):
+            raise ValueError("decimal degrees out of range")
+        return sign * values[0]
+    whole = values[0] + values[1] / 60 + (values[2] / 3600 if len(values) > 2 else 0)
+    if hours:
+        if sign < 0 or whole >= 24:
+            raise ValueError("RA out of range")
+        return whole * 15
+    if whole > 90:
+        raise ValueError("Dec out of range")
+    return sign * whole
+
+def parse_sexagesimal(value: Union[str, bytes], hours: bool = False) -> float:
+    """
+    Parse one sexagesimal value to degrees (hours=True for RA)
+    Raises ValueError for malformed or out of range values
+    """
+    if isinstance(value, bytes):
+        value = value.decode("utf-8")
+    return _parse_fields(value.translate(_SEPARATOR_TABLE).split(), hours, _has_hour_marker(value))
+
+def _parse_block(lines: Sequence[str], hours: bool) -> Optional[List[float]]:
+    """
+    Fast path for rows that all have three in-range fields, None otherwise
+    Each row is followed by a marker token; finding every marker at a
+    position 3 mod 4 proves each row split into exactly three fields.
+    """
+    text = _ROW_MARKER.join(lines) + _ROW_MARKER
+    if not hours and _has_hour_marker(text):
+        return None
+    text = text.translate(_SEPARATOR_TABLE)
+    tokens = text.split()
+    if len(tokens) != 4 * len(lines) or tokens[3::4].count("|") != len(lines):
+        return None
+    del tokens[3::4]
+    try:
+        fields = list(map(float, tokens))
+    except ValueError:
+        return None
+    first, minutes, seconds = fields[0::3], fields[1::3], fields[2::3]
+    if not (math.isfinite(sum(fields)) and min(minutes) >= 0 and max(minutes) < 60
+            and min(seconds) >= 0 and max(seconds) <= MAX_SECONDS):
+        return None
+    if hours:
+        if min(first) < 0 or max(first) >= 24 or "-" in text:
+            return None
+        return [(h + m/60 + s/3600) * 15 for h, m, s in zip(first, minutes, seconds)]
+    if max(map(abs, first)) > 90:
+        return None
+    # copysign keeps "-00 32 00" negative
+    return [math.copysign(abs(d) + m/60 + s/3600, d) for d, m, s in zip(first, minutes, seconds)]
+
+def parse_sexagesimal_column(values: Column, hours: bool = False) -> Tuple[List[float], List[int]]:
+    """
+    Parse a column of sexagesimal values (strings, or a newline separated
+    bytes buffer) to degrees, hours=True for RA.
+    Returns (degrees, error indices); malformed rows are NaN in degrees.
+    """
+    lines = _to_lines(values)
+    degrees = _parse_block(lines, hours)
+    if degrees is not None:
+        return degrees, []
+
+    # Retry block by block so a few odd rows only slow down their own block
+    degrees = []
+    errors: List[int] = []
+    for start in range(0, len(lines), FALLBACK_BLOCK_ROWS):
+        block = lines[start:start + FALLBACK_BLOCK_ROWS]
+        parsed = _parse_block(block, hours)
+        if parsed is not None:
+            degrees.extend(parsed)
+            continue
+        for idx, line in enumerate(block, start):
+            try:
+                degrees.append(_parse_fields(line.translate(_SEPARATOR_TABLE).split(), hours, _has_hour_marker(line)))
+            except ValueError:
+                degrees.append(math.nan)
+                errors.append(idx)
+    return degrees, errors
+
+def parse_ra_column(values: Column) -> Tuple[List[float], List[int]]:
+    """RA column (hours) to degrees, returns (degrees, error indices)"""
+    return parse_sexagesimal_column(values, hours=True)
+
+def parse_dec_column(values: Column) -> Tuple[List[float], List[int]]:
+    """Dec column (degrees) to degrees, returns (degrees, error indices)"""
+    return parse_sexagesimal_column(values, hours=False)
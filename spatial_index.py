@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Static k-d tree over position_3d for nearest-neighbor and range queries
+The tree is implicit: points are permuted so that for every node covering
+the slice [lo, hi) the median point sits at mid = (lo + hi) // 2 and splits on
+axis depth % 3. Slices of at most node_size points are leaves and are scanned
+linearly. A client walks the tree with index arithmetic alone, so the
+serialized form is just the permuted catalog indices and coordinates.
+
+Binary layout (little-endian):
+- Header: magic "SMKD", format version (u32), point count (u32), node size (u32)
+- Catalog indices in tree order: count u32
+- Coordinates in tree order: count * 3 float32 (x, y, z interleaved)
+"""
+
+import heapq
+import math
+import struct
+from array import array
+from typing import Dict, List, Sequence, Tuple
+
+from catalog_binary import from_little_endian, to_little_endian
+
+MAGIC = b"SMKD"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sIII")
+
+DEFAULT_NODE_SIZE = 16
+
+Position = Tuple[float, float, float]
+
+def build_spatial_index(positions: Sequence[Position], node_size: int = DEFAULT_NODE_SIZE) -> Dict:
+    """
+    Build the k-d tree over a list of (x, y, z) positions
+    Returns {"node_size", "ids", "coords"} where ids[i] is the catalog index of
+    the i-th point in tree order and coords holds its x, y, z at 3 * i
+    """
+    order = list(range(len(positions)))
+    stack = [(0, len(order), 0)]
+    while stack:
+        lo, hi, axis = stack.pop()
+        if hi - lo <= node_size:
+            continue
+        order[lo:hi] = sorted(order[lo:hi], key=lambda idx: positions[idx][axis])
+        mid = (lo + hi) >> 1
+        next_axis = (axis + 1) % 3
+        stack.append((lo, mid, next_axis))
+        stack.append((mid + 1, hi, next_axis))
+
+    coords = array("d")
+    for idx in order:
+        coords.extend(positions[idx])
+    return {"node_size": node_size, "ids": array("I", order), "coords": coords}
+
+def radius_search(index: Dict, center: Position, radius: float) -> List[Tuple[int, float]]:
+    """All points within radius of center as (catalog index, distance), nearest first"""
+    ids, coords, node_size = index["ids"], index["coords"], index["node_size"]
+    cx, cy, cz = center
+    radius_sq = radius * radius
+    results = []
+    stack = [(0, len(ids), 0)]
+    while stack:
+        lo, hi, axis = stack.pop()
+        if hi - lo <= node_size:
+            for i in range(lo, hi):
+                dx, dy, dz = coords[3 * i] - cx, coords[3 * i + 1] - cy, coords[3 * i + 2] - cz
+                dist_sq = dx * dx + dy * dy + dz * dz
+                if dist_sq <= radius_sq:
+                    results.append((ids[i], math.sqrt(dist_sq)))
+            continue
+
+        mid = (lo + hi) >> 1
+        dx, dy, dz = coords[3 * mid] - cx, coords[3 * mid + 1] - cy, coords[3 * mid + 2] - cz
+        dist_sq = dx * dx + dy * dy + dz * dz
+        if dist_sq <= radius_sq:
+            results.append((ids[mid], math.sqrt(dist_sq)))
+
+        delta = center[axis] - coords[3 * mid + axis]
+        next_axis = (axis + 1) % 3
+        if delta - radius <= 0:
+            stack.append((lo, mid, next_axis))
+        if delta + radius >= 0:
+            stack.append((mid + 1, hi, next_axis))
+
+    results.sort(key=lambda item: item[1])
+    return results
+
+def box_search(index: Dict, lower: Position, upper: Position) -> List[int]:
+    """Catalog indices of all points inside the axis-aligned box [lower, upper], ascending"""
+    ids, coords, node_size = index["ids"], index["coords"], index["node_size"]
+    lx, ly, lz = lower
+    ux, uy, uz = upper
+    results = []
+    stack = [(0, len(ids), 0)]
+    while stack:
+        lo, hi, axis = stack.pop()
+        if hi - lo <= node_size:
+            for i in range(lo, hi):
+                x, y, z = coords[3 * i], coords[3 * i + 1], coords[3 * i + 2]
+                if lx <= x <= ux and ly <= y <= uy and lz <= z <= uz:
+                    results.append(ids[i])
+            continue
+
+        mid = (lo + hi) >> 1
+        x, y, z = coords[3 * mid], coords[3 * mid + 1], coords[3 * mid + 2]
+        if lx <= x <= ux and ly <= y <= uy and lz <= z <= uz:
+            results.append(ids[mid])
+
+        split = coords[3 * mid + axis]
+        next_axis = (axis + 1) % 3
+        if lower[axis] <= split:
+            stack.append((lo, mid, next_axis))
+        if upper[axis] >= split:
+            stack.append((mid + 1, hi, next_axis))
+
+    results.sort()
+    return results
+
+def nearest_neighbors(index: Dict, point: Position, k: int = 5) -> List[Tuple[int, float]]:
+    """The k points closest to point as (catalog index, distance), nearest first; [] for k <= 0"""
+    if k <= 0:
+        return []
+    ids, coords, node_size = index["ids"], index["coords"], index["node_size"]
+    px, py, pz = point
+    # Max-heap of the best k so far, stored as (-dist_sq, catalog index)
+    best: List[Tuple[float, int]] = []
+
+    def consider(i: int) -> None:
+        dx, dy, dz = coords[3 * i] - px, coords[3 * i + 1] - py, coords[3 * i + 2] - pz
+        dist_sq = dx * dx + dy * dy + dz * dz
+        if len(best) < k:
+            heapq.heappush(best, (-dist_sq, ids[i]))
+        elif dist_sq < -best[0][0]:
+            heapq.heapreplace(best, (-dist_sq, ids[i]))
+
+    # Stack entries carry the squared distance to the splitting plane that
+    # separates them from the query, so far branches can be pruned when popped
+    stack = [(0, len(ids), 0, 0.0)]
+    while stack:
+        lo, hi, axis, plane_sq = stack.pop()
+        if len(best) == k and plane_sq >= -best[0][0]:
+            continue
+        if hi - lo <= node_size:
+            for i in range(lo, hi):
+                consider(i)
+            continue
+
+        mid = (lo + hi) >> 1
+        consider(mid)
+        delta = point[axis] - coords[3 * mid + axis]
+        next_axis = (axis + 1) % 3
+        near, far = ((lo, mid), (mid + 1, hi)) if delta <= 0 else ((mid + 1, hi), (lo, mid))
+        # Push the far side first so the near side is explored first
+        stack.append((far[0], far[1], next_axis, delta * delta))
+        stack.append((near[0], near[1], next_axis, plane_sq))
+
+    return sorted(((idx, math.sqrt(-neg_sq)) for neg_sq, idx in best), key=lambda item: item[1])
+
+def linear_nearest_neighbors(positions: Sequence[Position], point: Position, k: int = 5) -> List[Tuple[int, float]]:
+    """Reference k-NN by scanning and sorting every point (what the browser does today)"""
+    if k <= 0:
+        return []
+    px, py, pz = point
+    distances = [
+        (idx, math.sqrt((x - px) ** 2 + (y - py) ** 2 + (z - pz) ** 2))
+        for idx, (x, y, z) in enumerate(positions)
+    ]
+    distances.sort(key=lambda item: item[1])
+    return distances[:k]
+
+def linear_radius_search(positions: Sequence[Position], center: Position, radius: float) -> List[Tuple[int, float]]:
+    """Reference radius search by scanning every point"""
+    cx, cy, cz = center
+    radius_sq = radius * radius
+    results = []
+    for idx, (x, y, z) in enumerate(positions):
+        dist_sq = (x - cx) ** 2 + (y - cy) ** 2 + (z - cz) ** 2
+        if dist_sq <= radius_sq:
+            results.append((idx, math.sqrt(dist_sq)))
+    results.sort(key=lambda item: item[1])
+    return results
+
+def encode_spatial_index(index: Dict) -> bytes:
+    """Serialize a spatial index into the flat binary layout"""
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(index["ids"]), index["node_size"])
+    return header + to_little_endian(index["ids"]) + to_little_endian(array("f", index["coords"]))
+
+def decode_spatial_index(data: bytes) -> Dict:
+    """Deserialize a spatial index written by encode_spatial_index"""
+    magic, version, count, node_size = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a StarMap spatial index")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported spatial index version {version}")
+    offset = HEADER.size
+    ids = from_little_endian("I", data[offset:offset + count * 4])
+    offset += count * 4
+    coords = array("d", from_little_endian("f", data[offset:offset + count * 12]))
+    return {"node_size": node_size, "ids": ids, "coords": coords}
+
+def write_spatial_index(index: Dict, path: str) -> int:
+    """Write a spatial index to path, returns the number of bytes written"""
+    data = encode_spatial_index(index)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+def read_spatial_index(path: str) -> Dict:
+    """Read a spatial index file"""
+    with open(path, "rb") as f:
+        return decode_spatial_index(f.read())
@@ -6,7 +6,7 @@ import { DirectionsPanel } from './components/DirectionsPanel';
 import { Legend } from './components/Legend';
 import { Controls } from './components/Controls';
 import { useAppStore } from './store/appState';
-import { loadGalaxies, loadMetadata, loadStarCatalog, loadSolarSystem } from './services/dataLoader';
+import { loadGalaxies, loadMetadata, loadStarCatalog, loadSolarSystem, loadGalaxyKeyframes } from './services/dataLoader';
 import './App.css';
 
 /**
@@ -17,6 +17,7 @@ function App() {
   const setMetadata = useAppStore(state => state.setMetadata);
   const setStars = useAppStore(state => state.setStars);
   const setSolarSystem = useAppStore(state => state.setSolarSystem);
+  const setGalaxyKeyframes = useAppStore(state => state.setGalaxyKeyframes);
   const galaxies = useAppStore(state => state.galaxies);
   
   // Load galaxy, star, and solar system data on mount
@@ -46,6 +47,16 @@ function App() {
     loadData();
   }, [setGalaxies, setMetadata, setStars, setSolarSystem]);
   
+  // Galaxy motion is optional; the map stays static until keyframes arrive
+  useEffect(() => {
+    loadGalaxyKeyframes().then(keyframes => {
+      if (keyframes) {
+        setGalaxyKeyframes(keyframes);
+        console.log(`🌀 Loaded motion for ${keyframes.count} galaxies`);
+      }
+    });
+  }, [setGalaxyKeyframes]);
+  
   // Show loading state
   if (galaxies.length === 0) {
     return (
@@ -19,6 +19,9 @@ export function Controls() {
   const galaxies = useAppStore(state => state.galaxies);
   const focusOnGalaxy = useAppStore(state => state.focusOnGalaxy);
   const setSelectedGalaxy = useAppStore(state => state.setSelectedGalaxy);
+  const galaxyKeyframes = useAppStore(state => state.galaxyKeyframes);
+  const epochMyr = useAppStore(state => state.epochMyr);
+  const setEpochMyr = useAppStore(state => state.setEpochMyr);
   
   // Reset to Milky Way view
   const resetToMilkyWay = () => {
@@ -88,6 +91,20 @@ export function Controls() {
           <CloseIcon size={20} />
         </button>
       )}
+
+      {galaxyKeyframes && (
+        <input
+          type="range"
+          className="epoch-slider"
+          min={galaxyKeyframes.epochs[0]}
+          max={galaxyKeyframes.epochs[galaxyKeyframes.epochs.length - 1]}
+          step="any"
+          value={epochMyr}
+          onChange={(e) => setEpochMyr(Number(e.target.value))}
+          title={`Epoch: ${epochMyr.toFixed(0)} Myr from J2000`}
+          aria-label="Epoch in Myr from J2000"
+        />
+      )}
     </div>
   );
 }
@@ -0,0 +1,96 @@
+/**
+ * Delta patches between catalog builds (public/data/patches/, see patches.py)
+ * A client holding galaxies.json version N applies the patches listed in
+ * metadata.json after N instead of downloading the whole catalog again
+ */
+
+const PATCH_FORMAT = 'starmap-catalog-patch';
+
+/**
+ * Apply one record change from a patch's "changed" map
+ * @param {Object} record - Record at the old version
+ * @param {Object} change - {set, unset} or {replace}
+ * @returns {Object} Record at the new version
+ */
+function applyRecordChange(record, change) {
+  if (change.replace) {
+    return change.replace;
+  }
+  const unset = new Set(change.unset || []);
+  const updated = {};
+  for (const [key, value] of Object.entries(record)) {
+    if (!unset.has(key)) updated[key] = value;
+  }
+  return Object.assign(updated, change.set || {});
+}
+
+/**
+ * Apply a catalog patch
+ * @param {Array} galaxies - Galaxy records at the patch's "from" version
+ * @param {Object} patch - Parsed patch file
+ * @returns {Array} Galaxy records at the patch's "to" version
+ */
+export function applyCatalogPatch(galaxies, patch) {
+  if (patch.format !== PATCH_FORMAT) {
+    throw new Error('Not a catalog patch');
+  }
+  const removed = new Set(patch.removed);
+  let records = galaxies
+    .filter(galaxy => !removed.has(galaxy.id))
+    .map(galaxy => (patch.changed[galaxy.id] ? applyRecordChange(galaxy, patch.changed[galaxy.id]) : galaxy));
+  records.push(...patch.added);
+
+  if (patch.order) {
+    const byId = new Map(records.map(record => [record.id, record]));
+    records = patch.order.map(id => byId.get(id));
+  }
+  if (records.length !== patch.count) {
+    throw new Error(`Patch produced ${records.length} records, expected ${patch.count}`);
+  }
+  return records;
+}
+
+/**
+ * Patches that bring a client from a version to the current one
+ * @param {Object} metadata - Parsed metadata.json
+ * @param {number} fromVersion - Catalog version the client holds
+ * @returns {Array|null} Chain entries in order ([] when current, null when out of reach)
+ */
+export function patchChain(metadata, fromVersion) {
+  if (fromVersion === metadata.catalog_version) {
+    return [];
+  }
+  const steps = (metadata.patches || []).filter(entry => entry.from >= fromVersion);
+  if (!steps.length || steps[0].from !== fromVersion || steps[steps.length - 1].to !== metadata.catalog_version) {
+    return null;
+  }
+  for (let i = 1; i < steps.length; i++) {
+    if (steps[i].from !== steps[i - 1].to) {
+      return null;
+    }
+  }
+  return steps;
+}
+
+/**
+ * Bring a locally held catalog up to date by fetching and applying patches
+ * @param {Array} galaxies - Galaxy records the client holds
+ * @param {number} fromVersion - Their catalog version
+ * @param {Object} metadata - Current metadata.json
+ * @returns {Promise<Array|null>} Updated records, or null when the full catalog must be reloaded
+ */
+export async function updateCatalog(galaxies, fromVersion, metadata) {
+  const chain = patchChain(metadata, fromVersion);
+  if (chain === null) {
+    return null;
+  }
+  let records = galaxies;
+  for (const entry of chain) {
+    const response = await fetch(`/data/${entry.file}`);
+    if (!response.ok) {
+      return null;
+    }
+    records = applyCatalogPatch(records, await response.json());
+  }
+  return records;
+}
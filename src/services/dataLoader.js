@@ -3,11 +3,15 @@
  */
 
 import { raDecDistToCartesian, lightYearsToKpc, getSunPosition } from './stellarCoordinates';
+import { decodeSearchIndex, foldSearchText, searchIndex } from './searchIndex';
+import { loadKeyframes } from './keyframes';
 
 let galaxiesCache = null;
 let metadataCache = null;
 let starsCache = null;
 let solarSystemCache = null;
+let searchIndexPromise = null;
+let galaxyKeyframesPromise = null;
 
 /**
  * Load galaxy data from JSON file
@@ -63,8 +67,35 @@ export async function findGalaxyById(id) {
   return galaxies.find(g => g.id === id) || null;
 }
 
+/**
+ * Load the prebuilt name/alias search index, null if the build did not emit one
+ * @returns {Promise<Object|null>} Decoded search index
+ */
+export function loadSearchIndex() {
+  if (!searchIndexPromise) {
+    searchIndexPromise = fetch('/data/search_index.json')
+      .then(response => (response.ok ? response.json() : null))
+      .then(index => (index ? decodeSearchIndex(index) : null))
+      .catch(() => null);
+  }
+  return searchIndexPromise;
+}
+
+/**
+ * Load galaxy epoch keyframes, null if the build ran without --kinematics
+ * @returns {Promise<Object|null>} Decoded keyframes (see services/keyframes.js)
+ */
+export function loadGalaxyKeyframes() {
+  if (!galaxyKeyframesPromise) {
+    galaxyKeyframesPromise = loadKeyframes('/data/keyframes/galaxies.bin').catch(() => null);
+  }
+  return galaxyKeyframesPromise;
+}
+
 /**
  * Find galaxy by name (fuzzy search)
+ * Matches the accent- and punctuation-folded query against names and
+ * alternate names ("bootes" finds "Boötes I")
  * @param {string} query - Search query
  * @returns {Promise<Array>} Matching galaxies
  */
@@ -73,20 +104,27 @@ export async function searchGalaxies(query) {
     return [];
   }
   
-  const galaxies = await loadGalaxies();
-  const lowerQuery = query.toLowerCase();
+  const [galaxies, index] = await Promise.all([loadGalaxies(), loadSearchIndex()]);
+  
+  if (index && index.ids.length === galaxies.length) {
+    const byId = new Map(galaxies.map(galaxy => [galaxy.id, galaxy]));
+    return searchIndex(index, query).map(id => byId.get(id)).filter(Boolean);
+  }
+  
+  const needle = foldSearchText(query);
+  if (!needle) {
+    return [];
+  }
   
   return galaxies.filter(galaxy => {
     // Search in main name
-    if (galaxy.name.toLowerCase().includes(lowerQuery)) {
+    if (foldSearchText(galaxy.name).includes(needle)) {
       return true;
     }
     
     // Search in alternate names
-    if (galaxy.alternate_names && galaxy.alternate_names.length > 0) {
-      return galaxy.alternate_names.some(name => 
-        name.toLowerCase().includes(lowerQuery)
-      );
+    if (galaxy.alternate_names && galaxy.alternate_names.some(name => foldSearchText(name).includes(needle))) {
+      return true;
     }
     
     return false;
@@ -178,7 +216,12 @@ export async function loadStarCatalog() {
           position_3d: sunPos
         };
       }
-      
+
+      // Positions precomputed by the data build are already galactocentric
+      if (star.position_3d) {
+        return star;
+      }
+
       // Convert RA/Dec to galactocentric Cartesian coordinates
       const distanceKpc = lightYearsToKpc(star.distance_ly);
       const position = raDecDistToCartesian(star.ra, star.dec, distanceKpc);
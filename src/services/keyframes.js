@@ -0,0 +1,105 @@
+/**
+ * Epoch keyframes written by kinematics.py (public/data/keyframes/*.bin)
+ * Positions are stored as int16 offsets from each object's J2000 position_3d
+ * (in the catalog's own frame, so epoch 0 is galaxies.json itself),
+ * one frame per epoch; the client interpolates linearly between frames
+ */
+
+const MAGIC = 'SMKF';
+const FORMAT_VERSION = 1;
+const HEADER_SIZE = 16;
+
+/**
+ * Decode a keyframe buffer
+ * @param {ArrayBuffer} buffer - Contents of a keyframe file
+ * @returns {Object} {ids, epochs, origins, scales, frames, count}
+ */
+export function decodeKeyframes(buffer) {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+  if (magic !== MAGIC) {
+    throw new Error('Not a StarMap keyframe buffer');
+  }
+  const version = view.getUint32(4, true);
+  if (version !== FORMAT_VERSION) {
+    throw new Error(`Unsupported keyframe version ${version}`);
+  }
+  const count = view.getUint32(8, true);
+  const epochCount = view.getUint32(12, true);
+
+  let offset = HEADER_SIZE;
+  const epochs = new Float32Array(buffer, offset, epochCount);
+  offset += epochCount * 4;
+
+  const idOffsets = new Uint32Array(buffer, offset, count + 1);
+  offset += (count + 1) * 4;
+  const blobSize = idOffsets[count];
+  const decoder = new TextDecoder();
+  const blob = new Uint8Array(buffer, offset, blobSize);
+  const ids = new Array(count);
+  for (let i = 0; i < count; i++) {
+    ids[i] = decoder.decode(blob.subarray(idOffsets[i], idOffsets[i + 1]));
+  }
+  offset += blobSize + ((4 - (blobSize % 4)) % 4);
+
+  const origins = new Float32Array(buffer, offset, count * 3);
+  offset += count * 12;
+  const scales = new Float32Array(buffer, offset, count);
+  offset += count * 4;
+  const frames = new Int16Array(buffer, offset, epochCount * count * 3);
+
+  return { ids, epochs, origins, scales, frames, count };
+}
+
+/**
+ * Load and decode a keyframe file
+ * @param {string} url - e.g. '/data/keyframes/galaxies.bin'
+ * @returns {Promise<Object>} Decoded keyframes
+ */
+export async function loadKeyframes(url) {
+  const response = await fetch(url);
+  if (!response.ok) {
+    throw new Error(`Failed to load keyframes: ${response.statusText}`);
+  }
+  return decodeKeyframes(await response.arrayBuffer());
+}
+
+/**
+ * Interpolated positions of every object at an epoch (clamped to the keyframe range)
+ * @param {Object} keyframes - Result of decodeKeyframes()
+ * @param {number} epochMyr - Myr from J2000
+ * @param {Float32Array} [out] - Optional x, y, z output buffer to reuse between frames
+ * @returns {Float32Array} Interleaved x, y, z positions in kpc
+ */
+export function positionsAt(keyframes, epochMyr, out) {
+  const { epochs, origins, scales, frames, count } = keyframes;
+  const positions = out || new Float32Array(count * 3);
+  const last = epochs.length - 1;
+
+  let low = 0;
+  let high = 0;
+  let t = 0;
+  if (epochMyr >= epochs[last]) {
+    low = high = last;
+  } else if (epochMyr > epochs[0]) {
+    // Binary search for the first epoch at or after epochMyr
+    let lo = 1;
+    let hi = last;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (epochs[mid] < epochMyr) lo = mid + 1;
+      else hi = mid;
+    }
+    high = lo;
+    low = lo - 1;
+    t = (epochMyr - epochs[low]) / (epochs[high] - epochs[low]);
+  }
+
+  const a = low * count * 3;
+  const b = high * count * 3;
+  for (let i = 0; i < count * 3; i++) {
+    const step = frames[a + i] + (frames[b + i] - frames[a + i]) * t;
+    positions[i] = origins[i] + step * scales[(i / 3) | 0];
+  }
+  return positions;
+}
@@ -0,0 +1,88 @@
+/**
+ * Name/alias search over the prebuilt search index (public/data/search_index.json)
+ * Mirrors search_index.py: a query matches when its folded form is a
+ * substring of a folded name or alternate name
+ */
+
+const GRAM = 3;
+const PAD = '$';
+
+/**
+ * Fold a name or query for matching ("Boötes I" -> "bootesi")
+ * @param {string} text - Name or query
+ * @returns {string} Accent-free, lower case letters and digits
+ */
+export function foldSearchText(text) {
+  return (text || '')
+    .normalize('NFKD')
+    .replace(/\p{M}/gu, '')
+    .toLowerCase()
+    .replace(/[^a-z0-9]/g, '');
+}
+
+/**
+ * Decode the delta-encoded postings of a search index
+ * @param {Object} index - Parsed search_index.json
+ * @returns {Object} Index ready for searchIndex()
+ */
+export function decodeSearchIndex(index) {
+  const postings = new Map();
+  const byBigram = new Map();
+
+  for (const [gram, deltas] of Object.entries(index.postings)) {
+    const terms = new Array(deltas.length);
+    let total = 0;
+    for (let i = 0; i < deltas.length; i++) {
+      total += deltas[i];
+      terms[i] = total;
+    }
+    postings.set(gram, terms);
+
+    for (const bigram of new Set([gram.slice(0, 2), gram.slice(1)])) {
+      if (bigram.includes(PAD)) continue;
+      if (!byBigram.has(bigram)) byBigram.set(bigram, []);
+      byBigram.get(bigram).push(gram);
+    }
+  }
+
+  return { ...index, postings, byBigram };
+}
+
+/**
+ * Ids of the objects matching a query, in catalog order
+ * @param {Object} index - Index from decodeSearchIndex()
+ * @param {string} query - Search query
+ * @returns {string[]} Matching object ids
+ */
+export function searchIndex(index, query) {
+  const needle = foldSearchText(query);
+  if (!needle) {
+    return [];
+  }
+
+  let candidates;
+  if (needle.length >= GRAM) {
+    // Only the terms containing the rarest trigram can match
+    for (let i = 0; i + GRAM <= needle.length; i++) {
+      const terms = index.postings.get(needle.slice(i, i + GRAM));
+      if (!terms) return [];
+      if (!candidates || terms.length < candidates.length) candidates = terms;
+    }
+  } else if (needle.length === 2) {
+    const terms = new Set();
+    for (const gram of index.byBigram.get(needle) || []) {
+      for (const term of index.postings.get(gram)) terms.add(term);
+    }
+    candidates = [...terms];
+  } else {
+    candidates = index.terms.map((_, term) => term);
+  }
+
+  const objects = new Set();
+  for (const term of candidates) {
+    if (index.terms[term].includes(needle)) {
+      objects.add(index.term_object[term]);
+    }
+  }
+  return [...objects].sort((a, b) => a - b).map(obj => index.ids[obj]);
+}
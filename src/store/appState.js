@@ -1,5 +1,7 @@
 import { create } from 'zustand';
+import { useMemo } from 'react';
 import { DEFAULT_SPEED } from '../utils/constants';
+import { positionsAt } from '../services/keyframes';
 
 /**
  * Global application state using Zustand
@@ -17,6 +19,12 @@ export const useAppStore = create((set, get) => ({
   setStars: (stars) => set({ stars }),
   setSolarSystem: (solarSystem) => set({ solarSystem }),
   
+  // Galaxy motion (keyframes from the data build) and the displayed epoch in Myr from J2000
+  galaxyKeyframes: null,
+  epochMyr: 0,
+  setGalaxyKeyframes: (galaxyKeyframes) => set({ galaxyKeyframes }),
+  setEpochMyr: (epochMyr) => set({ epochMyr }),
+  
   // Selection state
   selectedGalaxy: null,
   hoveredGalaxy: null,
@@ -309,7 +317,7 @@ export const useAppStore = create((set, get) => ({
 
 // Get filtered and searched galaxies
 export const useFilteredGalaxies = () => {
-  const galaxies = useAppStore(state => state.galaxies);
+  const galaxies = useGalaxiesAtEpoch(useAppStore(state => state.galaxies));
   const searchQuery = useAppStore(state => state.searchQuery);
   const enabledTypes = useAppStore(state => state.enabledTypes);
   
@@ -376,3 +384,27 @@ export const useRouteInfo = () => {
   };
 };
 
+
+// Galaxies moved to the current epoch; galaxies without keyframes keep their catalog position
+export const useGalaxiesAtEpoch = (galaxies) => {
+  const keyframes = useAppStore(state => state.galaxyKeyframes);
+  const epochMyr = useAppStore(state => state.epochMyr);
+  
+  return useMemo(() => {
+    if (!keyframes || epochMyr === 0) {
+      return galaxies;
+    }
+    const positions = positionsAt(keyframes, epochMyr);
+    const index = new Map(keyframes.ids.map((id, i) => [id, i]));
+    return galaxies.map(galaxy => {
+      const i = index.get(galaxy.id);
+      if (i === undefined) {
+        return galaxy;
+      }
+      return {
+        ...galaxy,
+        position_3d: { x: positions[i * 3], y: positions[i * 3 + 1], z: positions[i * 3 + 2] },
+      };
+    });
+  }, [galaxies, keyframes, epochMyr]);
+};
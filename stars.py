@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Nearby-star ingestion for public/data/nearby_stars.json
+Reads a local stellar catalog (CSV with a header row, JSON array or NDJSON;
+column names are matched case-insensitively against STAR_COLUMN_ALIASES)
+chunk_size rows at a time. Per chunk, distances are converted to kpc and
+positions to the galactocentric frame the front end uses for stars,
+column-wise; missing magnitudes are derived from the distance modulus and the
+magnitude cuts applied. Display colors come from a lookup table indexed by
+spectral class and subclass, built once at import.
+
+ingest_stars() yields the converted chunks and StarCatalogEncoder encodes
+each one as it arrives, so only one chunk of records is alive at a time.
+
+Records keep the hand-maintained nearby_stars.json schema and add
+distance_kpc and position_3d (which loadStarCatalog() uses as-is). The binary
+variant (nearby_stars.bin) is the columnar container of catalog_binary.py.
+"""
+
+import csv
+import json
+import math
+import re
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from catalog_binary import (
+    KIND_FLOAT32,
+    KIND_STRING,
+    encode_float_column,
+    encode_sections,
+    encode_string_column,
+)
+from scraper import SUN_GALACTOCENTRIC_KPC, equatorial_to_galactocentric_batch, make_galaxy_id
+
+# Same conversion as lightYearsToKpc in src/services/stellarCoordinates.js
+LY_PER_KPC = 3260.47
+LY_PER_PC = 3.26156
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Column names used by common stellar catalogs (HYG, Gaia/VizieR dumps),
+# mapped to the nearby_stars.json fields or to a unit-specific input field
+STAR_COLUMN_ALIASES = {
+    "id": "id", "starid": "id",
+    "name": "name", "designation": "name",
+    "propername": "properName", "proper": "properName", "proper_name": "properName",
+    "spectraltype": "spectralType", "spect": "spectralType", "sptype": "spectralType", "sp_type": "spectralType",
+    "spectral_type": "spectralType",
+    "ra": "ra", "ra_deg": "ra", "radeg": "ra", "raj2000": "ra", "ra_icrs": "ra",
+    "ra_hours": "ra_hours", "rahours": "ra_hours",
+    "dec": "dec", "dec_deg": "dec", "dedeg": "dec", "dej2000": "dec", "de_icrs": "dec",
+    "distance_ly": "distance_ly", "dist_ly": "distance_ly",
+    "distance_pc": "distance_pc", "dist": "distance_pc", "dist_pc": "distance_pc",
+    "parallax": "parallax_mas", "plx": "parallax_mas",
+    "apparentmagnitude": "apparentMagnitude", "mag": "apparentMagnitude", "vmag": "apparentMagnitude",
+    "absolutemagnitude": "absoluteMagnitude", "absmag": "absoluteMagnitude",
+    "color": "color",
+    "issolarsystem": "isSolarSystem",
+    # Optional kinematics, kept on the record for kinematics.py
+    "pmra": "pmra_mas_yr", "pmra_mas_yr": "pmra_mas_yr",
+    "pmdec": "pmdec_mas_yr", "pmde": "pmdec_mas_yr", "pmdec_mas_yr": "pmdec_mas_yr",
+    "rv": "radial_velocity_km_s", "radial_velocity": "radial_velocity_km_s",
+    "radial_velocity_km_s": "radial_velocity_km_s",
+}
+KINEMATIC_FIELDS = ("pmra_mas_yr", "pmdec_mas_yr", "radial_velocity_km_s")
+
+# Anchor colors at subclass 0, the same per-class colors as getSpectralColor()
+# in src/shaders/starShaders.js; subclasses blend toward the next class
+SPECTRAL_CLASSES = "OBAFGKMLT"
+SPECTRAL_ANCHORS = {
+    "O": "#9BB0FF", "B": "#AABFFF", "A": "#CAD7FF", "F": "#F8F7FF", "G": "#FFF4EA",
+    "K": "#FFD2A1", "M": "#FFCC6F", "L": "#FF4500", "T": "#8B0000",
+}
+WHITE_DWARF_COLOR = "#FFFFFF"
+DEFAULT_STAR_COLOR = "#FFFFFF"
+SUBCLASS_STEPS = 100  # LUT resolution: tenths of a subclass
+
+# Optional subdwarf prefix, class letter, optional subclass ("sdM4.5", "K1.5III", "DA2")
+_SPECTRAL_PATTERN = re.compile(r"\s*(?:sd|esd|usd)?([OBAFGKMLTD])(\d(?:\.\d+)?)?")
+
+def _hex_to_rgb(color: str) -> Tuple[int, int, int]:
+    return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+def build_color_lut() -> List[str]:
+    """Hex colors for every class and tenth of a subclass, index = class * SUBCLASS_STEPS + tenths"""
+    lut = []
+    for idx, spectral_class in enumerate(SPECTRAL_CLASSES):
+        start = _hex_to_rgb(SPECTRAL_ANCHORS[spectral_class])
+        end = _hex_to_rgb(SPECTRAL_ANCHORS[SPECTRAL_CLASSES[min(idx + 1, len(SPECTRAL_CLASSES) - 1)]])
+        for step in range(SUBCLASS_STEPS):
+            t = step / SUBCLASS_STEPS
+            lut.append("#" + "".join(f"{round(a + (b - a) * t):02X}" for a, b in zip(start, end)))
+    return lut
+
+COLOR_LUT = build_color_lut()
+
+# Catalogs repeat a few thousand distinct spectral strings, so each is parsed once
+_COLOR_CACHE: Dict[str, str] = {}
+
+def spectral_color(spectral_type: Optional[str]) -> str:
+    """Display color of a spectral type string (white for white dwarfs and unknown types)"""
+    if not spectral_type:
+        return DEFAULT_STAR_COLOR
+    color = _COLOR_CACHE.get(spectral_type)
+    if color is None:
+        match = _SPECTRAL_PATTERN.match(spectral_type)
+        if match is None:
+            color = DEFAULT_STAR_COLOR
+        elif match.group(1) == "D":
+            color = WHITE_DWARF_COLOR
+        else:
+            tenths = round(float(match.group(2) or 0) * SUBCLASS_STEPS / 10)
+            index = SPECTRAL_CLASSES.index(match.group(1)) * SUBCLASS_STEPS + min(tenths, SUBCLASS_STEPS - 1)
+            color = COLOR_LUT[index]
+        _COLOR_CACHE[spectral_type] = color
+    return color
+
+def _map_record(record: Dict) -> Dict:
+    return {STAR_COLUMN_ALIASES[key.strip().lower()]: value for key, value in record.items()
+            if key.strip().lower() in STAR_COLUMN_ALIASES}
+
+def read_star_rows(path: str) -> Iterator[Dict]:
+    """Rows of a star catalog with mapped field names (values as found in the file)"""
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        yield from (_map_record(record) for record in (data["stars"] if isinstance(data, dict) else data))
+    elif path.endswith((".ndjson", ".jsonl")):
+        with open(path, "r", encoding="utf-8") as f:
+            yield from (_map_record(json.loads(line)) for line in f if line.strip())
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(line for line in f if not line.startswith("#"))
+            fields = [STAR_COLUMN_ALIASES.get(column.strip().lower()) for column in next(reader, [])]
+            for values in reader:
+                yield {field: value for field, value in zip(fields, values) if field and value.strip()}
+
+def iter_star_chunks(rows: Iterable[Dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Dict]]:
+    """Group rows into lists of at most chunk_size"""
+    chunk: List[Dict] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _number(value) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    return float(value)
+
+def _distance_ly(row: Dict) -> Optional[float]:
+    """Distance in light years from whichever distance column the row has"""
+    if row.get("distance_ly") not in (None, ""):
+        return float(row["distance_ly"])
+    if row.get("distance_pc") not in (None, ""):
+        return float(row["distance_pc"]) * LY_PER_PC
+    parallax = _number(row.get("parallax_mas"))
+    if parallax is not None and parallax > 0:
+        return 1000 / parallax * LY_PER_PC
+    return None
+
+def process_star_chunk(rows: Sequence[Dict], max_apparent_mag: Optional[float] = None,
+                       max_absolute_mag: Optional[float] = None) -> List[Dict]:
+    """
+    Convert mapped catalog rows to star records, column-wise
+    Rows without a position, distance or any magnitude are dropped, as are
+    rows fainter than the magnitude cuts.
+    """
+    rows = [row for row in rows if row.get("ra", row.get("ra_hours")) not in (None, "")
+            and row.get("dec") not in (None, "")]
+    ras = [float(row["ra"]) if row.get("ra") not in (None, "") else float(row["ra_hours"]) * 15 for row in rows]
+    decs = [float(row["dec"]) for row in rows]
+    distances_ly = [_distance_ly(row) for row in rows]
+    apparent = [_number(row.get("apparentMagnitude")) for row in rows]
+    absolute = [_number(row.get("absoluteMagnitude")) for row in rows]
+
+    # Distance modulus m - M = 5 log10(d / 10 pc) fills in whichever magnitude is missing
+    moduli = [5 * math.log10(ly / LY_PER_PC) - 5 if ly else None for ly in distances_ly]
+    apparent = [m if m is not None or M is None or mu is None else M + mu
+                for m, M, mu in zip(apparent, absolute, moduli)]
+    absolute = [M if M is not None or m is None or mu is None else m - mu
+                for m, M, mu in zip(apparent, absolute, moduli)]
+
+    keep = [
+        ly is not None and ly >= 0 and m is not None and M is not None
+        and (max_apparent_mag is None or m <= max_apparent_mag)
+        and (max_absolute_mag is None or M <= max_absolute_mag)
+        for ly, m, M in zip(distances_ly, apparent, absolute)
+    ]
+    rows, ras, decs, distances_ly, apparent, absolute = (
+        [value for value, kept in zip(column, keep) if kept]
+        for column in (rows, ras, decs, distances_ly, apparent, absolute)
+    )
+
+    distances_kpc = [ly / LY_PER_KPC for ly in distances_ly]
+    xs, ys, zs = equatorial_to_galactocentric_batch(ras, decs, distances_kpc, digits=None)
+
+    stars = []
+    for row, ra, dec, ly, kpc, x, y, z, m, M in zip(rows, ras, decs, distances_ly, distances_kpc,
+                                                   xs, ys, zs, apparent, absolute):
+        name = row.get("name") or row.get("properName") or str(row.get("id", ""))
+        is_sun = ly == 0
+        if is_sun:
+            # The Sun, not the Galactic Center where distance 0 galaxies go
+            x, y, z = SUN_GALACTOCENTRIC_KPC
+        star = {
+            "id": str(row.get("id") or make_galaxy_id(name)),
+            "name": name,
+            "properName": row.get("properName") or name,
+            "spectralType": row.get("spectralType", ""),
+            "ra": round(ra, 5),
+            "dec": round(dec, 5),
+            "distance_ly": round(ly, 2),
+            "distance_kpc": round(kpc, 8),
+            "position_3d": {"x": round(x, 8), "y": round(y, 8), "z": round(z, 8)},
+            "apparentMagnitude": round(m, 2),
+            "absoluteMagnitude": round(M, 2),
+            "color": row.get("color") or spectral_color(row.get("spectralType")),
+        }
+        if is_sun or str(row.get("isSolarSystem", "")).lower() in ("true", "1"):
+            star["isSolarSystem"] = True
+        for field in KINEMATIC_FIELDS:
+            value = _number(row.get(field))
+            if value is not None:
+                star[field] = value
+        stars.append(star)
+    return stars
+
+def ingest_stars(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, max_apparent_mag: Optional[float] = None,
+                 max_absolute_mag: Optional[float] = None) -> Iterator[Tuple[List[Dict], int]]:
+    """
+    Read and convert a star catalog chunk by chunk
+    Yields (stars kept from the chunk, rows read in the chunk); only one chunk is held at a time
+    """
+    for chunk in iter_star_chunks(read_star_rows(path), chunk_size):
+        yield process_star_chunk(chunk, max_apparent_mag, max_absolute_mag), len(chunk)
+
+_BINARY_FLOAT_COLUMNS = [
+    ("position_3d", lambda s: (s["position_3d"]["x"], s["position_3d"]["y"], s["position_3d"]["z"])),
+    ("ra_deg", lambda s: (s["ra"],)),
+    ("dec_deg", lambda s: (s["dec"],)),
+    ("distance_ly", lambda s: (s["distance_ly"],)),
+    ("apparent_mag", lambda s: (s["apparentMagnitude"],)),
+    ("absolute_mag", lambda s: (s["absoluteMagnitude"],)),
+    # 0-1 RGB, ready for a WebGL color attribute
+    ("color_rgb", lambda s: tuple(c / 255 for c in _hex_to_rgb(s["color"]))),
+]
+_BINARY_STRING_COLUMNS = (("id", "id"), ("name", "name"), ("spectral_type", "spectralType"))
+
+class StarCatalogEncoder:
+    """
+    Builds nearby_stars.json and nearby_stars.bin one chunk at a time
+    add() encodes a chunk's records straight to JSON text and float32 /
+    string columns, so the caller can drop the records: memory holds the
+    encoded outputs instead of a dict per star
+    """
+
+    def __init__(self, json_output: bool = True, binary_output: bool = True):
+        self.json_output = json_output
+        self.binary_output = binary_output
+        self.count = 0
+        self._json_chunks: List[bytes] = []
+        self._floats = {name: array("f") for name, _ in _BINARY_FLOAT_COLUMNS}
+        self._strings: Dict[str, List[str]] = {name: [] for name, _ in _BINARY_STRING_COLUMNS}
+
+    def add(self, stars: Sequence[Dict]) -> None:
+        """Encode a chunk of star records"""
+        if not stars:
+            return
+        self.count += len(stars)
+        if self.json_output:
+            self._add_json(stars)
+        if self.binary_output:
+            for name, accessor in _BINARY_FLOAT_COLUMNS:
+                self._floats[name].extend(v for s in stars for v in accessor(s))
+            for name, field in _BINARY_STRING_COLUMNS:
+                self._strings[name].extend(s[field] for s in stars)
+
+    def _add_json(self, stars: Sequence[Dict]) -> None:
+        # Same text json.dumps(all_stars, indent=2) produces: each item indented one level
+        self._json_chunks.append(",\n  ".join(
+            json.dumps(star, indent=2, ensure_ascii=False).replace("\n", "\n  ") for star in stars
+        ).encode("utf-8"))
+
+    def json_bytes(self) -> bytes:
+        """nearby_stars.json bytes (pretty printed like the hand-maintained file)"""
+        if not self.count:
+            return b"[]"
+        return b"[\n  " + b",\n  ".join(self._json_chunks) + b"\n]"
+
+    def binary_bytes(self) -> bytes:
+        """Columnar binary variant: float32 positions, astrometry, magnitudes and RGB colors plus string columns"""
+        sections = [(name, KIND_FLOAT32, encode_float_column(values)) for name, values in self._floats.items()]
+        sections += [(name, KIND_STRING, encode_string_column(values)) for name, values in self._strings.items()]
+        return encode_sections(self.count, sections)
+
+def encode_stars_json(stars: Sequence[Dict]) -> bytes:
+    """nearby_stars.json bytes for a list of records (see StarCatalogEncoder for chunked input)"""
+    encoder = StarCatalogEncoder(binary_output=False)
+    encoder.add(stars)
+    return encoder.json_bytes()
+
+def encode_stars_binary(stars: Sequence[Dict]) -> bytes:
+    """nearby_stars.bin bytes for a list of records (see StarCatalogEncoder for chunked input)"""
+    encoder = StarCatalogEncoder(json_output=False)
+    encoder.add(stars)
+    return encoder.binary_bytes()
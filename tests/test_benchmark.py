@@ -0,0 +1,10 @@
+import pytest
+
+import benchmark
+
+@pytest.mark.parametrize("suite", sorted(benchmark.SUITES))
+def test_suite_runs_on_a_small_catalog(suite, monkeypatch):
+    # Every suite checks its results against a reference path; a small run keeps those checks in the test gate
+    monkeypatch.setattr(benchmark, "RESULTS", [])
+    benchmark.SUITES[suite]([200], 1)
+    assert benchmark.RESULTS
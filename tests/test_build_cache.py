@@ -0,0 +1,48 @@
+from build_cache import cached_stage, code_fingerprint, process_galaxies_cached, stage_key
+from scraper import builtin_galaxy_rows, process_galaxies
+
+def write_modules(root, **sources):
+    for name, source in sources.items():
+        (root / f"{name}.py").write_text(source, encoding="utf-8")
+
+def fingerprint(root):
+    code_fingerprint.cache_clear()
+    return code_fingerprint("stage", root=str(root))
+
+def test_fingerprint_follows_lazy_imports_but_not_main(tmp_path):
+    write_modules(tmp_path,
+                  stage="import json\n\ndef run():\n    from helper import value\n    return value\n\n"
+                        "def main():\n    import cli\n",
+                  helper="value = 1\n", cli="flag = 1\n")
+    before = fingerprint(tmp_path)
+    write_modules(tmp_path, cli="flag = 2\n")
+    assert fingerprint(tmp_path) == before
+    write_modules(tmp_path, helper="value = 2\n")
+    assert fingerprint(tmp_path) != before
+
+def test_cached_stage_reuses_only_matching_keys(tmp_path):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"outputs": {"a.bin": b"\x00\x01"}, "counts": {"n": len(calls)}}
+
+    key = stage_key(["routing"], "inputs-1")
+    first, hit = cached_stage("demo", key, compute, cache_dir=str(tmp_path))
+    assert not hit and first["outputs"] == {"a.bin": b"\x00\x01"}
+    again, hit = cached_stage("demo", key, compute, cache_dir=str(tmp_path))
+    assert hit and again == first and len(calls) == 1
+
+    _, hit = cached_stage("demo", stage_key(["routing"], "inputs-2"), compute, cache_dir=str(tmp_path))
+    assert not hit and len(calls) == 2
+    _, hit = cached_stage("demo", stage_key(["routing"], "inputs-2"), compute, force=True, cache_dir=str(tmp_path))
+    assert not hit and len(calls) == 3
+
+def test_row_cache_matches_uncached_build():
+    rows = builtin_galaxy_rows()
+    galaxies, cache, recomputed = process_galaxies_cached(rows, {})
+    assert recomputed == len(rows) and galaxies == process_galaxies(rows)
+    edited = [dict(row) for row in rows]
+    edited[3]["distance_kpc"] = edited[3]["distance_kpc"] + 1
+    galaxies, _, recomputed = process_galaxies_cached(edited, cache)
+    assert recomputed == 1 and galaxies == process_galaxies(edited)
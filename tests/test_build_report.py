@@ -0,0 +1,74 @@
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+
+import pytest
+
+from build_report import BuildReport, validate_galaxies
+from scraper import build_galaxy_records, create_galaxy_database
+
+SCRAPER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scraper.py")
+
+def test_traced_peak_is_reset_per_stage():
+    report = BuildReport()
+    tracemalloc.start()
+    try:
+        with report.stage("big"):
+            block = bytearray(8 * 1024 * 1024)
+            del block
+        with report.stage("small"):
+            block = bytearray(1024)
+    finally:
+        tracemalloc.stop()
+    big, small = report.stages
+    assert big["traced_peak_mb"] >= 8
+    assert small["traced_peak_mb"] < 1
+    assert "process_peak_rss_mb" in small
+
+def test_traced_peak_absent_without_tracing():
+    report = BuildReport()
+    with report.stage("untraced"):
+        pass
+    assert report.stages[0]["traced_peak_mb"] is None
+
+def test_validation_flags_bad_records():
+    galaxies = create_galaxy_database()
+    assert validate_galaxies(galaxies) == []
+    galaxies[0]["coordinates"]["dec_deg"] = 91.0
+    galaxies[1]["id"] = galaxies[2]["id"]
+    errors = validate_galaxies(galaxies)
+    assert any("dec_deg = 91.0" in error for error in errors)
+    assert any(error.endswith("duplicate id") for error in errors)
+
+def raw_row(name, ra="00:42:44.3", dec="+41:16:09", distance_kpc=778.0):
+    return {"name": name, "alternate_names": [], "type": "dSph", "ra": ra, "dec": dec,
+            "distance_kpc": distance_kpc, "size_estimate_kpc": 1.0, "notes": ""}
+
+def test_transform_error_fails_the_report():
+    report = BuildReport()
+    with pytest.raises(ValueError, match="malformed RA"):
+        build_galaxy_records([raw_row("Good"), raw_row("Bad", ra="25:00:00")], report, {})
+    assert report.status == "failed"
+    assert report.error.startswith("transform: ValueError: ")
+    assert report.to_dict()["error"] == report.error
+
+def test_invalid_records_are_reported_not_raised():
+    report = BuildReport()
+    galaxies, cache = build_galaxy_records([raw_row("Good"), raw_row("Behind", distance_kpc=-5.0)], report, {})
+    assert len(galaxies) == 2 and len(cache) == 2
+    assert report.validation["errors"]
+    assert all(error.startswith("behind: ") for error in report.validation["errors"])
+    assert "behind: distance_kpc = -5.0" in report.validation["errors"]
+    assert [stage["name"] for stage in report.stages] == ["transform", "validate"]
+
+def test_failed_validation_does_not_save_the_cache(tmp_path):
+    bad = tmp_path / "bad.csv"
+    bad.write_text("name,ra,dec,dist,diam\nBehind,00:42:44.3,+41:16:09,-5,1\n", encoding="utf-8")
+    result = subprocess.run([sys.executable, SCRAPER, "--sources", f"bad={bad}", "--report", "report.json"],
+                            cwd=tmp_path, capture_output=True, text=True)
+    assert result.returncode == 1
+    assert json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))["status"] == "failed"
+    assert not (tmp_path / ".build_cache" / "galaxies.json").exists()
+    assert not (tmp_path / "public").exists()
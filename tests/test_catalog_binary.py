@@ -0,0 +1,40 @@
+import pytest
+
+from catalog_binary import (
+    DIRECTORY_ENTRY,
+    FLOAT_COLUMNS,
+    KIND_FLOAT32,
+    STRING_COLUMNS,
+    decode_catalog,
+    encode_catalog,
+    encode_float_column,
+    encode_sections,
+    read_directory,
+)
+
+GALAXIES = [
+    {"id": "andromeda_m31", "name": "Andromeda (M31)", "type": "SA(s)b",
+     "coordinates": {"ra_deg": 10.6847, "dec_deg": 41.2690},
+     "position_3d": {"x": 583.27, "y": 110.94, "z": 495.08}, "distance_kpc": 778.0, "size_estimate_kpc": 67.0},
+    {"id": "boötes_i", "name": "Boötes I", "type": "dSph",
+     "coordinates": {"ra_deg": 210.025, "dec_deg": 14.5},
+     "position_3d": {"x": -54.0, "y": -30.9, "z": 16.3}, "distance_kpc": 66.0, "size_estimate_kpc": 0.5},
+]
+
+def test_every_column_name_round_trips_exactly():
+    count, directory = read_directory(encode_catalog(GALAXIES))
+    assert count == len(GALAXIES)
+    assert set(directory) == {name for name, _ in FLOAT_COLUMNS} | set(STRING_COLUMNS)
+
+def test_size_column_decodes():
+    columns = decode_catalog(encode_catalog(GALAXIES))
+    assert list(columns["size_kpc"]) == pytest.approx([67.0, 0.5])
+    assert columns["name"] == ["Andromeda (M31)", "Boötes I"]
+
+def test_names_longer_than_a_directory_entry_are_rejected():
+    assert DIRECTORY_ENTRY.size == 28
+    with pytest.raises(ValueError, match="too long"):
+        encode_sections(1, [("size_estimate_kpc", KIND_FLOAT32, encode_float_column([1.0]))])
+    # Exactly 16 bytes still fits
+    _, directory = read_directory(encode_sections(1, [("x" * 16, KIND_FLOAT32, encode_float_column([1.0]))]))
+    assert list(directory) == ["x" * 16]
@@ -0,0 +1,77 @@
+import struct
+
+import pytest
+
+from benchmark import make_synthetic_rows
+from catalog_binary import decode_catalog, write_catalog_binary
+from catalog_reader import CatalogReader
+from scraper import process_galaxies
+
+def float32(value):
+    return struct.unpack("<f", struct.pack("<f", value))[0]
+
+def as_float32(galaxy):
+    """What the binary catalog keeps of a galaxy record"""
+    position = galaxy["position_3d"]
+    return {
+        "id": galaxy["id"],
+        "name": galaxy["name"],
+        "type": galaxy["type"],
+        "coordinates": {key: float32(galaxy["coordinates"][key]) for key in ("ra_deg", "dec_deg")},
+        "position_3d": {axis: float32(position[axis]) for axis in "xyz"},
+        "distance_kpc": float32(galaxy["distance_kpc"]),
+        "size_estimate_kpc": float32(galaxy["size_estimate_kpc"]),
+    }
+
+@pytest.fixture(scope="module")
+def galaxies():
+    galaxies = process_galaxies(make_synthetic_rows(30))
+    # Ids that are prefixes, suffixes and substrings of their neighbours' ids
+    for galaxy, object_id in zip(galaxies, ["g1", "g10", "g11", "g1g", "xg1", "boötes_i"]):
+        galaxy["id"] = object_id
+    return galaxies
+
+@pytest.fixture
+def catalog(galaxies, tmp_path):
+    path = tmp_path / "galaxies.bin"
+    write_catalog_binary(galaxies, str(path))
+    with CatalogReader(str(path)) as catalog:
+        yield catalog
+
+def test_records_round_trip_at_float32(galaxies, catalog):
+    assert len(catalog) == len(galaxies)
+    assert list(catalog) == [as_float32(g) for g in galaxies]
+    assert catalog[3] == as_float32(galaxies[3])
+
+def test_lookup_by_id(galaxies, catalog):
+    for galaxy in reversed(galaxies):
+        assert catalog.get(galaxy["id"]) == as_float32(galaxy)
+
+@pytest.mark.parametrize("object_id", ["g", "1", "g1g1", "1g", "g11 ", "", "missing"])
+def test_partial_ids_are_not_found(catalog, object_id):
+    assert catalog.get(object_id) is None
+
+def test_columns_match_decode_catalog(galaxies, tmp_path):
+    path = tmp_path / "galaxies.bin"
+    write_catalog_binary(galaxies, str(path))
+    decoded = decode_catalog(path.read_bytes())
+    with CatalogReader(str(path)) as catalog:
+        for name in ("position_3d", "ra_deg", "dec_deg", "distance_kpc", "size_kpc"):
+            assert list(catalog.column(name)) == list(decoded[name])
+        assert [catalog.string("name", idx) for idx in range(len(catalog))] == decoded["name"]
+
+def test_bad_rows_and_columns(catalog):
+    with pytest.raises(IndexError):
+        catalog.record(len(catalog))
+    with pytest.raises(IndexError):
+        catalog.record(-1)
+    with pytest.raises(ValueError, match="not a float32 column"):
+        catalog.column("name")
+    with pytest.raises(ValueError, match="not a string column"):
+        catalog.string("ra_deg", 0)
+
+def test_not_a_catalog(tmp_path):
+    path = tmp_path / "galaxies.json"
+    path.write_bytes(b"[" + b" " * 64 + b"]")
+    with pytest.raises(ValueError, match="Not a StarMap binary catalog"):
+        CatalogReader(str(path))
@@ -0,0 +1,23 @@
+import pytest
+
+from scraper import parse_dec_column, parse_dec_to_degrees, parse_ra_column, parse_ra_to_degrees
+
+def test_ra_column_matches_scalar_parser():
+    values = ["00:42:44.3", "12:30:00", "23:59:59.9", "05:23:34.5"]
+    assert parse_ra_column(values) == pytest.approx([parse_ra_to_degrees(v) for v in values], abs=1e-12)
+
+def test_dec_column_matches_scalar_parser():
+    values = ["+41:16:09", "-00:32:00", "-69:45:22", "+00:00:01"]
+    assert parse_dec_column(values) == pytest.approx([parse_dec_to_degrees(v) for v in values], abs=1e-12)
+    assert parse_dec_column(["-00:32:00"])[0] < 0
+
+def test_short_row_does_not_borrow_fields_from_its_neighbour():
+    # Two rows with 2 + 4 fields add up to 3 per row; each row must still parse on its own
+    with pytest.raises(ValueError, match=r"rows 1 \('03:04:05:06'\)"):
+        parse_ra_column(["01:02", "03:04:05:06"])
+    with pytest.raises(ValueError, match="rows 1"):
+        parse_dec_column(["+01:02", "+03:04:05:06"])
+
+def test_mixed_precision_rows_parse_row_by_row():
+    assert parse_ra_column(["01:02", "03:04:05"]) == pytest.approx(
+        [parse_ra_to_degrees("01:02"), parse_ra_to_degrees("03:04:05")], abs=1e-12)
@@ -0,0 +1,58 @@
+import math
+
+import pytest
+
+from scraper import (
+    ICRS_TO_GALACTIC,
+    SUN_GALACTOCENTRIC_KPC,
+    equatorial_to_galactic_batch,
+    equatorial_to_galactocentric_batch,
+)
+
+# (name, RA deg, Dec deg, l deg, b deg): the poles defining the Hipparcos Galactic
+# frame, plus SIMBAD positions of well-known objects
+GALACTIC_REFERENCE_POINTS = [
+    ("North Galactic Pole", 192.85948, 27.12825, None, 90.0),
+    ("North Celestial Pole", 0.0, 90.0, 122.93192, 27.12825),
+    ("Galactic Center (Sgr A*)", 266.41684, -29.00781, 359.94423, -0.04616),
+    ("Andromeda (M31)", 10.68471, 41.26875, 121.17431, -21.57330),
+    ("Large Magellanic Cloud", 80.89417, -69.75611, 280.46526, -32.88835),
+]
+TOLERANCE_DEG = 1e-3
+
+@pytest.mark.parametrize("name,ra,dec,l_ref,b_ref", GALACTIC_REFERENCE_POINTS, ids=[p[0] for p in GALACTIC_REFERENCE_POINTS])
+def test_reference_points(name, ra, dec, l_ref, b_ref):
+    (l,), (b,) = equatorial_to_galactic_batch([ra], [dec])
+    assert b == pytest.approx(b_ref, abs=TOLERANCE_DEG)
+    if l_ref is not None:
+        assert abs((l - l_ref + 180) % 360 - 180) < TOLERANCE_DEG
+
+def test_rotation_is_orthonormal():
+    for i, row_i in enumerate(ICRS_TO_GALACTIC):
+        for j, row_j in enumerate(ICRS_TO_GALACTIC):
+            assert sum(a * b for a, b in zip(row_i, row_j)) == pytest.approx(float(i == j), abs=1e-12)
+
+def test_sgr_a_star_lands_at_the_galactic_center():
+    sun_distance = math.hypot(*SUN_GALACTOCENTRIC_KPC)
+    xs, ys, zs = equatorial_to_galactocentric_batch([266.41684], [-29.00781], [sun_distance], digits=None)
+    assert math.hypot(xs[0], ys[0], zs[0]) < 0.05
+
+def test_heliocentric_distances_are_preserved():
+    ra = [10.68471, 80.89417, 152.1, 300.0]
+    dec = [41.26875, -69.75611, 12.3, -45.0]
+    distances = [778.0, 50.0, 254.0, 1.5]
+    xs, ys, zs = equatorial_to_galactocentric_batch(ra, dec, distances, digits=None)
+    sun_x, sun_y, sun_z = SUN_GALACTOCENTRIC_KPC
+    for x, y, z, d in zip(xs, ys, zs, distances):
+        assert math.dist((x, y, z), (sun_x, sun_y, sun_z)) == pytest.approx(d)
+
+def test_axes_follow_the_front_end_frame():
+    # l = 90 (direction of rotation) is +y, the North Galactic Pole is +z,
+    # and the Galactic Center lies toward smaller x as seen from the Sun
+    sun_x, sun_y, sun_z = SUN_GALACTOCENTRIC_KPC
+    xs, ys, zs = equatorial_to_galactocentric_batch([192.85948, 266.41684], [27.12825, -29.00781], [1.0, 1.0], digits=None)
+    assert zs[0] - sun_z == pytest.approx(1.0, abs=1e-6)
+    assert xs[1] - sun_x == pytest.approx(-1.0, abs=1e-5)
+
+def test_milky_way_row_sits_at_the_origin():
+    assert equatorial_to_galactocentric_batch([266.4], [-29.0], [0]) == ([0.0], [0.0], [0.0])
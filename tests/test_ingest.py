@@ -0,0 +1,86 @@
+import os
+
+from ingest import cross_match, ingest_catalogs, normalize_coordinate, parse_source
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+NED = ("ned", os.path.join(FIXTURES, "ned.tsv"), "tsv")
+VIZIER = ("vizier", os.path.join(FIXTURES, "vizier.csv"), "csv")
+
+def row(name, ra, dec, source, aliases=()):
+    return {"name": name, "alternate_names": list(aliases), "ra": ra, "dec": dec, "source": source}
+
+def test_bad_distance_skips_row_with_a_note():
+    rows, skipped = parse_source(NED)
+    assert [r["name"] for r in rows] == ["Andromeda Galaxy", "Triangulum Galaxy"]
+    assert len(skipped) == 1
+    assert skipped[0].endswith("ned.tsv:6: M32: non-numeric distance_kpc '~770'")
+
+def test_bad_coordinates_skip_row(tmp_path):
+    path = tmp_path / "bad_coordinates.csv"
+    path.write_text("name,ra,dec\nGood,10.5,41.2\nBad,12:99:00,+41:00:00\n", encoding="utf-8")
+    rows, skipped = parse_source(("bad", str(path), "csv"))
+    assert [r["name"] for r in rows] == ["Good"]
+    assert len(skipped) == 1 and ":3: Bad: bad ra" in skipped[0]
+
+def test_ingest_merges_across_sources_and_reports_skipped_rows():
+    skipped = []
+    merged = ingest_catalogs([NED, VIZIER], workers=1, skipped=skipped)
+    by_name = {galaxy["name"]: galaxy for galaxy in merged}
+    assert set(by_name) == {"Andromeda Galaxy", "Triangulum Galaxy", "NGC 205"}
+    assert by_name["Andromeda Galaxy"]["source"] == "ned / vizier"
+    assert by_name["Andromeda Galaxy"]["distance_kpc"] == 778.0
+    assert "M31" in by_name["Andromeda Galaxy"]["alternate_names"]
+    assert by_name["Triangulum Galaxy"]["source"] == "ned / vizier"
+    assert by_name["NGC 205"]["source"] == "vizier"
+    assert len(skipped) == 1
+
+def test_object_without_a_distance_is_skipped(tmp_path):
+    path = tmp_path / "extra.csv"
+    path.write_text("name,ra,dec,dist,diam\nLeo T,09:34:53.4,+17:03:05,,0.3\n"
+                    "Andromeda,00:42:44.3,+41:16:09,,\n", encoding="utf-8")
+    skipped = []
+    merged = ingest_catalogs([NED, ("extra", str(path), "csv")], workers=1, skipped=skipped)
+    names = {galaxy["name"] for galaxy in merged}
+    # Andromeda's distance comes from NED; nothing places Leo T
+    assert "Andromeda Galaxy" in names and "Leo T" not in names
+    assert skipped[-1] == "extra: Leo T: no distance_kpc in any source"
+    assert all(galaxy["distance_kpc"] is not None for galaxy in merged)
+
+def test_rows_of_one_source_never_merge():
+    rows = [
+        row("Pair A", "10:00:00.0", "+20:00:00", "a", aliases=["Pair"]),
+        row("Pair B", "10:00:00.5", "+20:00:05", "a", aliases=["Pair"]),
+    ]
+    assert cross_match(rows, radius_arcsec=60) == [[0], [1]]
+
+def test_matches_do_not_chain():
+    # b sits 50" from a and c sits 50" from b, but c is 100" from a
+    rows = [
+        row("A", "10:00:00.00", "+20:00:00", "one"),
+        row("B", "10:00:00.00", "+20:00:50", "two"),
+        row("C", "10:00:00.00", "+20:01:40", "three"),
+    ]
+    assert cross_match(rows, radius_arcsec=60) == [[0, 1], [2]]
+
+def test_one_row_per_source_and_closest_wins():
+    rows = [
+        row("A", "10:00:00.00", "+20:00:00", "one"),
+        row("far", "10:00:00.00", "+20:00:40", "two"),
+        row("near", "10:00:00.00", "+20:00:10", "two"),
+    ]
+    assert cross_match(rows, radius_arcsec=60) == [[0, 2], [1]]
+
+def test_name_match_beats_position():
+    rows = [
+        row("Leo I", "10:08:28.1", "+12:18:23", "one"),
+        row("Regulus Dwarf", "10:08:27.4", "+12:18:27", "one"),
+        row("LEO-I", "10:08:27.5", "+12:18:26", "two"),
+    ]
+    assert cross_match(rows, radius_arcsec=60) == [[0, 2], [1]]
+
+def test_unit_marked_coordinates_are_normalized():
+    assert normalize_coordinate("12.5h", is_ra=True) == "12:30:00.0"
+    assert normalize_coordinate("00h42m44.3s", is_ra=True) == "00:42:44.3"
+    assert normalize_coordinate("10.68458", is_ra=True) == "00:42:44.3"
+    assert normalize_coordinate("+41d16m09s", is_ra=False) == "+41:16:09"
+    assert normalize_coordinate("-05 30 00", is_ra=False) == "-05:30:00"
@@ -0,0 +1,117 @@
+import math
+
+import pytest
+
+from kinematics import (
+    GALACTOCENTRIC_TO_EQUATORIAL,
+    G_KPC3_MSUN_MYR2,
+    HOST_MASSES_MSUN,
+    M31_ID,
+    MILKY_WAY_ID,
+    decode_keyframes,
+    epoch_range,
+    kepler_position,
+    plan_galaxy_motion,
+    positions_at,
+    propagate_keyframes,
+)
+from scraper import SUN_GALACTOCENTRIC_KPC, create_galaxy_database
+
+# (pmra mas/yr, pmdec mas/yr, radial velocity km/s)
+M31_MOTION = (0.049, -0.038, -300.0)
+M33_MOTION = (0.024, 0.003, -180.0)
+M33_ID = "triangulum_m33"
+LMC_ID = "large_magellanic_cloud"
+MOTIONS = {M31_ID: M31_MOTION, M33_ID: M33_MOTION, LMC_ID: (1.9, 0.3, 262.0)}
+
+@pytest.fixture(scope="module")
+def galaxies():
+    return create_galaxy_database(galactocentric=True)
+
+def propagate(objects, epochs):
+    return decode_keyframes(propagate_keyframes(objects, epochs, workers=1))
+
+def in_catalog(obj, position):
+    """A galactocentric position of obj relative to its keyframe origin (position_3d, rounded)"""
+    return tuple(o + p - q for o, p, q in zip(obj["origin"], position, obj["position"]))
+
+def test_satellite_of_static_m31_orbits_its_catalog_position(galaxies):
+    objects = plan_galaxy_motion(galaxies, {M33_ID: M33_MOTION}, galactocentric=True)
+    (m33,) = objects
+    assert m33["host"] == M31_ID
+    m31 = next(g["position_3d"] for g in galaxies if g["id"] == M31_ID)
+    host = m33["host_position"]
+    assert math.dist(host, (m31["x"], m31["y"], m31["z"])) < 0.01
+
+    epochs = epoch_range(0, 3000, 7)
+    keyframes = propagate(objects, epochs)
+    r0 = tuple(p - h for p, h in zip(m33["position"], host))
+    v0 = m33["velocity"]
+    mu = G_KPC3_MSUN_MYR2 * HOST_MASSES_MSUN[M31_ID]
+    for epoch in epochs:
+        (position,) = positions_at(keyframes, epoch)
+        expected = in_catalog(m33, tuple(h + r for h, r in zip(host, kepler_position(r0, v0, mu, epoch))))
+        assert math.dist(position, expected) < 1e-3 * max(1.0, math.dist(expected, m33["origin"]))
+
+def test_satellite_follows_a_moving_m31(galaxies):
+    objects = plan_galaxy_motion(galaxies, {M31_ID: M31_MOTION, M33_ID: M33_MOTION}, galactocentric=True)
+    by_id = {obj["id"]: obj for obj in objects}
+    m31, m33 = by_id[M31_ID], by_id[M33_ID]
+    assert m31["host"] == MILKY_WAY_ID and m33["host"] == M31_ID
+    epochs = epoch_range(0, 3000, 7)
+    keyframes = propagate(objects, epochs)
+    mu_pair = G_KPC3_MSUN_MYR2 * (HOST_MASSES_MSUN[MILKY_WAY_ID] + HOST_MASSES_MSUN[M31_ID])
+    mu_m31 = G_KPC3_MSUN_MYR2 * HOST_MASSES_MSUN[M31_ID]
+    r_rel = tuple(a - b for a, b in zip(m33["position"], m31["position"]))
+    v_rel = tuple(a - b for a, b in zip(m33["velocity"], m31["velocity"]))
+    for epoch in epochs:
+        positions = dict(zip(keyframes["ids"], positions_at(keyframes, epoch)))
+        m31_now = kepler_position(m31["position"], m31["velocity"], mu_pair, epoch)
+        expected = in_catalog(m33, tuple(h + r for h, r in zip(m31_now, kepler_position(r_rel, v_rel, mu_m31, epoch))))
+        m31_now = in_catalog(m31, m31_now)
+        assert math.dist(positions[M31_ID], m31_now) < 1e-3 * max(1.0, math.dist(m31_now, m31["origin"]))
+        assert math.dist(positions[M33_ID], expected) < 1e-3 * max(1.0, math.dist(expected, m33["origin"]))
+
+def test_milky_way_satellite_ignores_m31(galaxies):
+    objects = plan_galaxy_motion(galaxies, {LMC_ID: MOTIONS[LMC_ID]}, galactocentric=True)
+    assert [obj["host"] for obj in objects] == [MILKY_WAY_ID]
+    assert "host_position" not in objects[0]
+
+@pytest.mark.parametrize("galactocentric", [False, True])
+def test_epoch_zero_is_the_catalog_position(galactocentric):
+    catalog = create_galaxy_database(galactocentric=galactocentric)
+    keyframes = propagate(plan_galaxy_motion(catalog, MOTIONS, galactocentric=galactocentric),
+                          epoch_range(-500, 500, 5))
+    by_id = {g["id"]: g["position_3d"] for g in catalog}
+    assert sorted(keyframes["ids"]) == sorted(MOTIONS)
+    for object_id, position in zip(keyframes["ids"], positions_at(keyframes, 0.0)):
+        expected = by_id[object_id]
+        assert math.dist(position, (expected["x"], expected["y"], expected["z"])) < 1e-4 * math.dist(position, (0, 0, 0))
+
+def test_equatorial_keyframes_are_rotated_galactocentric_motion():
+    epochs = epoch_range(-2000, 2000, 9)
+    frames = {}
+    for galactocentric in (False, True):
+        catalog = create_galaxy_database(galactocentric=galactocentric)
+        keyframes = propagate(plan_galaxy_motion(catalog, MOTIONS, galactocentric=galactocentric), epochs)
+        start = dict(zip(keyframes["ids"], positions_at(keyframes, 0.0)))
+        frames[galactocentric] = {
+            epoch: {object_id: tuple(p - q for p, q in zip(position, start[object_id]))
+                    for object_id, position in zip(keyframes["ids"], positions_at(keyframes, epoch))}
+            for epoch in epochs
+        }
+    for epoch in epochs:
+        for object_id, moved in frames[True][epoch].items():
+            rotated = tuple(sum(r * m for r, m in zip(row, moved)) for row in GALACTOCENTRIC_TO_EQUATORIAL)
+            assert math.dist(frames[False][epoch][object_id], rotated) < 1e-3 * max(1.0, math.dist(moved, (0, 0, 0)))
+
+def test_rotation_maps_galactocentric_onto_equatorial_axes():
+    equatorial = {g["id"]: g["position_3d"] for g in create_galaxy_database()}
+    for galaxy in create_galaxy_database(galactocentric=True):
+        if galaxy["distance_kpc"] == 0:
+            continue
+        p = galaxy["position_3d"]
+        offset = (p["x"] - SUN_GALACTOCENTRIC_KPC[0], p["y"] - SUN_GALACTOCENTRIC_KPC[1], p["z"] - SUN_GALACTOCENTRIC_KPC[2])
+        rotated = tuple(sum(r * o for r, o in zip(row, offset)) for row in GALACTOCENTRIC_TO_EQUATORIAL)
+        expected = equatorial[galaxy["id"]]
+        assert math.dist(rotated, (expected["x"], expected["y"], expected["z"])) < 0.02
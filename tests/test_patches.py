@@ -0,0 +1,113 @@
+import copy
+import json
+
+import pytest
+
+from patches import (
+    apply_patch,
+    apply_patch_bytes,
+    build_patch,
+    catalog_versioning,
+    diff_catalogs,
+    encode_patch,
+    patch_chain,
+)
+from writers import write_json
+
+def catalog(count=6):
+    return [
+        {"id": f"g{i}", "name": f"Galaxy {i}", "type": "dSph", "distance_kpc": 100.0 + i, "notes": f"note {i}"}
+        for i in range(count)
+    ]
+
+def as_patch(old, new):
+    return {"format": "starmap-catalog-patch", "count": len(new), **diff_catalogs(old, new)}
+
+def edited_catalogs():
+    base = catalog()
+    changed = copy.deepcopy(base)
+    changed[1]["distance_kpc"] = 81.0
+    del changed[2]["notes"]
+    changed[3]["aliases"] = ["G3"]
+    removed_and_added = [g for g in base if g["id"] != "g4"] + [{"id": "g9", "name": "New", "type": "dIrr"}]
+    reordered = list(reversed(base))
+    field_order = copy.deepcopy(base)
+    field_order[0] = dict(reversed(list(field_order[0].items())))
+    return [(base, base), (base, changed), (base, removed_and_added), (base, reordered), (base, field_order),
+            (base, base[3:] + base[:1]), (base, []), ([], base)]
+
+@pytest.mark.parametrize("old,new", edited_catalogs())
+def test_apply_inverts_diff(old, new):
+    result = apply_patch(old, as_patch(old, new))
+    assert result == new
+    assert [list(record) for record in result] == [list(record) for record in new]
+
+def test_patch_bytes_round_trip():
+    old_bytes = write_json(catalog())
+    new = catalog()
+    new[0]["distance_kpc"] = 7.5
+    new_bytes = write_json(new)
+    patch = json.loads(encode_patch(build_patch(old_bytes, new_bytes, 1, 2)))
+    assert apply_patch_bytes(old_bytes, patch) == new_bytes
+    with pytest.raises(ValueError, match="does not start from this catalog"):
+        apply_patch_bytes(new_bytes, patch)
+
+def build(data_dir, galaxies, patches):
+    """One build's metadata and patch writes, the way scraper.main does them"""
+    galaxies_bytes = write_json(galaxies)
+    fields, files = catalog_versioning(galaxies_bytes, str(data_dir), enabled=patches)
+    metadata = {"total_objects": len(galaxies), **(fields or {})}
+    for path, data in files.items():
+        (data_dir / path).parent.mkdir(parents=True, exist_ok=True)
+        (data_dir / path).write_bytes(data)
+    (data_dir / "galaxies.json").write_bytes(galaxies_bytes)
+    (data_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
+    return metadata
+
+def replay(data_dir, galaxies, from_version):
+    metadata = json.loads((data_dir / "metadata.json").read_text(encoding="utf-8"))
+    for entry in patch_chain(metadata, from_version):
+        galaxies = apply_patch(galaxies, json.loads((data_dir / entry["file"]).read_bytes()))
+    return galaxies
+
+def test_unversioned_builds_stay_unversioned(tmp_path):
+    assert build(tmp_path, catalog(), patches=False) == {"total_objects": 6}
+    assert build(tmp_path, catalog(3), patches=False) == {"total_objects": 3}
+
+def test_chain_survives_a_build_without_patches(tmp_path):
+    versions = [catalog(4), catalog(5), catalog(6), catalog(7)]
+    versions[2][0]["distance_kpc"] = 42.0
+
+    assert build(tmp_path, versions[0], patches=True)["catalog_version"] == 1
+    assert build(tmp_path, versions[1], patches=True)["catalog_version"] == 2
+    metadata = build(tmp_path, versions[2], patches=False)
+    assert metadata["catalog_version"] == 3
+    assert [(e["from"], e["to"]) for e in metadata["patches"]] == [(1, 2), (2, 3)]
+    metadata = build(tmp_path, versions[3], patches=True)
+    assert metadata["catalog_version"] == 4
+
+    for held in range(3):
+        assert replay(tmp_path, versions[held], held + 1) == versions[3]
+    assert sorted(p.name for p in (tmp_path / "patches").iterdir()) == [
+        "galaxies-1-2.json", "galaxies-2-3.json", "galaxies-3-4.json"]
+
+def test_lost_chain_never_reuses_a_version(tmp_path):
+    build(tmp_path, catalog(4), patches=True)
+    build(tmp_path, catalog(5), patches=True)
+    published = (tmp_path / "patches" / "galaxies-1-2.json").read_bytes()
+
+    # metadata.json written by something that knew nothing about versions
+    (tmp_path / "metadata.json").write_text("{}", encoding="utf-8")
+    metadata = build(tmp_path, catalog(6), patches=True)
+    assert metadata["catalog_version"] == 3 and metadata["patches"] == []
+    assert patch_chain(metadata, 1) is None
+
+    metadata = build(tmp_path, catalog(7), patches=True)
+    assert [(e["from"], e["to"]) for e in metadata["patches"]] == [(3, 4)]
+    assert (tmp_path / "patches" / "galaxies-1-2.json").read_bytes() == published
+
+def test_patch_chain_requires_contiguous_steps():
+    metadata = {"catalog_version": 4, "patches": [{"from": 1, "to": 2}, {"from": 3, "to": 4}]}
+    assert patch_chain(metadata, 3) == [{"from": 3, "to": 4}]
+    assert patch_chain(metadata, 1) is None
+    assert patch_chain(metadata, 4) == []
@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import pytest
+
+from query_server import CatalogIndex, QueryServer
+
+GALAXIES = [
+    {"id": f"g{i}", "name": f"Galaxy {i}", "type": "dSph",
+     "position_3d": {"x": 10.0 * i, "y": 0.0, "z": 0.0}}
+    for i in range(5)
+]
+
+@pytest.fixture
+def server():
+    server = QueryServer(CatalogIndex(GALAXIES), workers=2)
+    yield server
+    server.executor.shutdown()
+
+def request(server, path, **params):
+    status, body = asyncio.run(server.respond(path, params))
+    return status, json.loads(body)
+
+def test_nearest_point(server):
+    status, payload = request(server, "/nearest", x="11", y="0", z="0", k="2")
+    assert status == 200
+    assert [r["id"] for r in payload["results"]] == ["g1", "g2"]
+
+@pytest.mark.parametrize("path,params", [
+    ("/nearest", {"x": "nan", "y": "0", "z": "0"}),
+    ("/nearest", {"x": "0", "y": "1e400", "z": "0"}),
+    ("/nearest", {"x": "0", "y": "0", "z": "-inf"}),
+    ("/bbox", {"min": "nan,0,0", "max": "1,1,1"}),
+    ("/bbox", {"min": "0,0,0", "max": "inf,1,1"}),
+])
+def test_non_finite_coordinates_are_rejected(server, path, params):
+    status, payload = request(server, path, **params)
+    assert status == 400
+    assert "finite" in payload["error"]
+    assert len(server.cache) == 0
+
+def test_unexpected_errors_are_500_and_not_cached(server):
+    def broken(params):
+        raise RuntimeError("boom")
+
+    server.handlers["/route"] = broken
+    status, payload = request(server, "/route", **{"from": "g0", "to": "g1"})
+    assert status == 500
+    assert payload == {"error": "Internal error (RuntimeError)"}
+    assert len(server.cache) == 0
+
+def test_client_errors(server):
+    assert request(server, "/nearest", id="nope") == (404, {"error": "Unknown id 'nope'"})
+    assert request(server, "/route", **{"from": "g0", "to": "nope"}) == (404, {"error": "Unknown id 'nope'"})
+    assert request(server, "/route", to="g1") == (400, {"error": "Missing parameter 'from'"})
+    assert request(server, "/nearest", x="1", z="0") == (400, {"error": "Missing parameter 'y'"})
+    assert request(server, "/nearest", x="a", y="0", z="0")[0] == 400
+
+def test_key_errors_in_handlers_are_500(server):
+    def buggy(params):
+        return {}["missing"]
+
+    server.handlers["/prefix"] = buggy
+    assert request(server, "/prefix", q="gal") == (500, {"error": "Internal error (KeyError)"})
+
+async def exchange(server, raw):
+    listener = await server.start("127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), timeout=5)
+        writer.close()
+        return response
+    finally:
+        listener.close()
+        await listener.wait_closed()
+
+def test_invalid_content_length_is_400(server):
+    response = asyncio.run(exchange(server, b"GET /stats HTTP/1.1\r\nContent-Length: lots\r\n\r\n"))
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 400 ")
+    assert b"Connection: close" in head
+    assert json.loads(body) == {"error": "Invalid Content-Length"}
@@ -0,0 +1,18 @@
+import json
+
+import pytest
+
+from records import GalaxyTable
+from scraper import builtin_galaxy_rows, process_galaxies
+
+@pytest.mark.parametrize("galactocentric", [False, True])
+def test_table_records_match_process_galaxies(galactocentric):
+    rows = builtin_galaxy_rows()
+    rows[0] = {**rows[0], "source": "Test survey", "source_url": "https://example.org", "citation": "Doe 2024"}
+    expected = process_galaxies(rows, galactocentric)
+    table = GalaxyTable.from_rows(rows, galactocentric, chunk_size=7)
+    assert len(table) == len(rows)
+    actual = table.to_records()
+    assert actual == expected
+    # Same JSON bytes, including int vs float distances
+    assert json.dumps(actual, ensure_ascii=False) == json.dumps(expected, ensure_ascii=False)
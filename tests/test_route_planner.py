@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from route_planner import DIJKSTRA_MIN_TARGETS, RoutePlanner, build_bounded_graph
+from routing import build_jump_graph, galaxy_positions, shortest_path_reference
+
+MAX_JUMP_KPC = 250.0
+
+def make_galaxies(count, seed, spread=600.0):
+    rng = random.Random(seed)
+    return [
+        {"id": f"g{i}", "position_3d": {"x": rng.uniform(-spread, spread),
+                                        "y": rng.uniform(-spread, spread),
+                                        "z": rng.uniform(-spread, spread)}}
+        for i in range(count)
+    ]
+
+@pytest.fixture(scope="module")
+def galaxies():
+    return make_galaxies(150, seed=7)
+
+@pytest.fixture(scope="module")
+def planner(galaxies):
+    return RoutePlanner(galaxies, MAX_JUMP_KPC)
+
+def assert_same_route(route, reference):
+    path, distance = route
+    ref_path, ref_distance = reference
+    assert bool(path) == bool(ref_path)
+    assert distance == pytest.approx(ref_distance, rel=1e-9)
+    if path:
+        assert (path[0], path[-1]) == (ref_path[0], ref_path[-1])
+
+@pytest.mark.parametrize("max_jump_kpc", [MAX_JUMP_KPC, 60.0, None])
+def test_grid_graph_has_the_same_edges_as_all_pairs(galaxies, max_jump_kpc):
+    positions = galaxy_positions(galaxies)
+    graph = build_bounded_graph(positions, max_jump_kpc)
+    offsets, neighbors, weights = graph["offsets"], graph["neighbors"], graph["weights"]
+    for node, edges in enumerate(build_jump_graph(positions, max_jump_kpc)):
+        lo, hi = offsets[node], offsets[node + 1]
+        got = sorted(zip(neighbors[lo:hi], weights[lo:hi]))
+        assert [j for j, _ in got] == [j for j, _ in sorted(edges)]
+        assert [d for _, d in got] == pytest.approx([d for _, d in sorted(edges)])
+
+def test_astar_matches_dijkstra(galaxies, planner):
+    rng = random.Random(1)
+    for _ in range(40):
+        start_id, end_id = rng.choice(planner.ids), rng.choice(planner.ids)
+        assert_same_route(planner.route(start_id, end_id),
+                          shortest_path_reference(galaxies, start_id, end_id, MAX_JUMP_KPC))
+
+def test_unreachable_and_trivial_routes(galaxies):
+    lonely = galaxies + [{"id": "far", "position_3d": {"x": 1e5, "y": 0.0, "z": 0.0}}]
+    planner = RoutePlanner(lonely, MAX_JUMP_KPC)
+    assert planner.route("g0", "far") == ([], 0.0)
+    assert planner.route("g0", "g0") == (["g0"], 0.0)
+
+def test_batch_plan_matches_single_routes(galaxies, planner):
+    # One start with many destinations takes the Dijkstra path, the rest run A*
+    many = [("g0", end_id) for end_id in planner.ids[:DIJKSTRA_MIN_TARGETS + 8]]
+    rng = random.Random(2)
+    queries = many + [(rng.choice(planner.ids), rng.choice(planner.ids)) for _ in range(60)]
+    planned = planner.plan(queries, workers=1)
+    assert len(planned) == len(queries)
+    for (start_id, end_id), route in zip(queries, planned):
+        assert_same_route(route, shortest_path_reference(galaxies, start_id, end_id, MAX_JUMP_KPC))
+
+def test_process_pool_matches_one_process(planner):
+    rng = random.Random(3)
+    queries = [(rng.choice(planner.ids), rng.choice(planner.ids)) for _ in range(200)]
+    assert planner.plan(queries, workers=2, chunk_size=8) == planner.plan(queries, workers=1)
+
+def test_tour_joins_its_legs(planner):
+    waypoints = ["g0", "g1", "g2"]
+    path, total = planner.tour(waypoints)
+    legs = [planner.route(a, b) for a, b in zip(waypoints, waypoints[1:])]
+    if all(leg for leg, _ in legs):
+        assert path == legs[0][0] + legs[1][0][1:]
+        assert total == pytest.approx(sum(distance for _, distance in legs))
+    else:
+        assert (path, total) == ([], 0.0)
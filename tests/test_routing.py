@@ -0,0 +1,104 @@
+import itertools
+import math
+import random
+
+import pytest
+
+from routing import build_route_table, decode_route_table, encode_route_table, lookup_route
+
+def make_galaxies(count, seed, spread=600.0):
+    rng = random.Random(seed)
+    return [
+        {"id": f"g{i}", "position_3d": {"x": rng.uniform(-spread, spread),
+                                        "y": rng.uniform(-spread, spread),
+                                        "z": rng.uniform(-spread, spread)}}
+        for i in range(count)
+    ]
+
+def separation(a, b):
+    pa, pb = a["position_3d"], b["position_3d"]
+    return math.dist((pa["x"], pa["y"], pa["z"]), (pb["x"], pb["y"], pb["z"]))
+
+def floyd_warshall(galaxies, max_jump_kpc):
+    count = len(galaxies)
+    dist = [[0.0 if i == j else math.inf for j in range(count)] for i in range(count)]
+    for i, j in itertools.combinations(range(count), 2):
+        d = separation(galaxies[i], galaxies[j])
+        if d <= max_jump_kpc:
+            dist[i][j] = dist[j][i] = d
+    for k in range(count):
+        for i in range(count):
+            for j in range(count):
+                if dist[i][k] + dist[k][j] < dist[i][j]:
+                    dist[i][j] = dist[i][k] + dist[k][j]
+    return dist
+
+def exhaustive_shortest(galaxies, start, end, max_jump_kpc):
+    """Shortest simple path by trying every ordering of every subset of intermediate nodes"""
+    others = [i for i in range(len(galaxies)) if i not in (start, end)]
+    best = math.inf
+    for size in range(len(others) + 1):
+        for middle in itertools.permutations(others, size):
+            path = (start, *middle, end)
+            hops = [separation(galaxies[a], galaxies[b]) for a, b in zip(path, path[1:])]
+            if all(hop <= max_jump_kpc for hop in hops):
+                best = min(best, sum(hops))
+    return best
+
+def check_path(galaxies, path, max_jump_kpc):
+    by_id = {g["id"]: g for g in galaxies}
+    hops = [separation(by_id[a], by_id[b]) for a, b in zip(path, path[1:])]
+    assert all(hop <= max_jump_kpc + 1e-9 for hop in hops)
+    return sum(hops)
+
+@pytest.mark.parametrize("seed,max_jump_kpc", [(1, 350.0), (2, 500.0), (3, 250.0)])
+def test_table_matches_floyd_warshall(seed, max_jump_kpc):
+    galaxies = make_galaxies(30, seed)
+    expected = floyd_warshall(galaxies, max_jump_kpc)
+    table = build_route_table(galaxies, max_jump_kpc)
+    unreachable = 0
+    for i, start in enumerate(galaxies):
+        for j, end in enumerate(galaxies):
+            path, distance = lookup_route(table, start["id"], end["id"])
+            if math.isinf(expected[i][j]):
+                unreachable += 1
+                assert (path, distance) == ([], 0.0)
+                continue
+            assert distance == pytest.approx(expected[i][j])
+            assert path[0] == start["id"] and path[-1] == end["id"]
+            assert check_path(galaxies, path, max_jump_kpc) == pytest.approx(expected[i][j])
+    if max_jump_kpc == 250.0:
+        assert unreachable, "the sparse case should include disconnected pairs"
+
+def test_table_matches_exhaustive_search():
+    galaxies = make_galaxies(7, seed=4, spread=300.0)
+    table = build_route_table(galaxies, 260.0)
+    for i, j in itertools.permutations(range(len(galaxies)), 2):
+        expected = exhaustive_shortest(galaxies, i, j, 260.0)
+        path, distance = lookup_route(table, galaxies[i]["id"], galaxies[j]["id"])
+        if math.isinf(expected):
+            assert path == []
+        else:
+            assert distance == pytest.approx(expected)
+
+def test_decoded_table_matches_within_float32():
+    galaxies = make_galaxies(25, seed=5)
+    table = build_route_table(galaxies, 400.0)
+    decoded = decode_route_table(encode_route_table(table))
+    for start, end in itertools.product(table["ids"], repeat=2):
+        path, distance = lookup_route(table, start, end)
+        decoded_path, decoded_distance = lookup_route(decoded, start, end)
+        assert decoded_path == path
+        assert decoded_distance == pytest.approx(distance, rel=1e-6)
+
+def test_lookup_does_not_modify_table():
+    galaxies = make_galaxies(10, seed=6)
+    table = build_route_table(galaxies, 500.0)
+    bare = {key: value for key, value in table.items() if key != "index"}
+    snapshot = dict(bare)
+    lookup_route(bare, "g0", "g9")
+    assert bare == snapshot
+
+def test_table_size_limit():
+    with pytest.raises(ValueError, match="limited to 5 nodes"):
+        build_route_table(make_galaxies(6, seed=7), 500.0, max_nodes=5)
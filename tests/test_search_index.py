@@ -0,0 +1,52 @@
+import json
+import random
+
+import pytest
+
+from scraper import create_galaxy_database
+from search_index import build_search_index, encode_search_index, linear_search, load_search_index, search
+
+@pytest.fixture(scope="module")
+def galaxies():
+    return create_galaxy_database()
+
+@pytest.fixture(scope="module")
+def loaded(galaxies):
+    return load_search_index(json.loads(encode_search_index(build_search_index(galaxies))))
+
+def test_accents_and_case_are_folded(loaded):
+    assert search(loaded, "bootes") == ["boötes_i"]
+    assert search(loaded, "BOÖTES I") == ["boötes_i"]
+    assert search(loaded, "Boo-I") == ["boötes_i"]
+
+def test_alternate_names_match(loaded):
+    assert search(loaded, "NGC 224") == ["andromeda_m31"]
+    assert search(loaded, "lmc") == ["large_magellanic_cloud"]
+
+@pytest.mark.parametrize("query", ["m", "3", "m3", "gc", "ngc", "ngc 5", "dwarf", "sculptor", "xyz", "q"])
+def test_short_and_long_queries_match_linear_scan(galaxies, loaded, query):
+    assert search(loaded, query) == linear_search(galaxies, query)
+
+def test_results_are_in_catalog_order_and_limited(galaxies, loaded):
+    order = {galaxy["id"]: idx for idx, galaxy in enumerate(galaxies)}
+    found = search(loaded, "ngc")
+    assert len(found) > 3
+    assert found == sorted(found, key=order.get)
+    assert search(loaded, "ngc", limit=3) == found[:3]
+    assert search(loaded, "m3")[:2] == ["andromeda_m31", "triangulum_m33"]
+
+def test_empty_queries_match_nothing(loaded):
+    assert search(loaded, "") == []
+    assert search(loaded, " - ") == []
+    assert search(loaded, None) == []
+
+def test_random_queries_match_linear_scan(galaxies, loaded):
+    rng = random.Random(16)
+    names = [name for galaxy in galaxies for name in [galaxy["name"], *galaxy["alternate_names"]]]
+    for _ in range(500):
+        name = rng.choice(names)
+        start = rng.randrange(len(name))
+        query = name[start:start + rng.randint(1, 6)]
+        if rng.random() < 0.2:
+            query = query.upper()
+        assert search(loaded, query) == linear_search(galaxies, query), query
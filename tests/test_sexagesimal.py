@@ -0,0 +1,42 @@
+import math
+
+import pytest
+
+from sexagesimal import parse_dec_column, parse_ra_column, parse_sexagesimal
+
+@pytest.mark.parametrize("value,expected", [
+    ("12h", 180.0),
+    ("12.5h", 187.5),
+    ("12.5H", 187.5),
+    ("0h", 0.0),
+    ("12h30m", 187.5),
+    ("12h30m00s", 187.5),
+    ("187.5", 187.5),
+    ("187.5d", 187.5),
+])
+def test_ra_units(value, expected):
+    assert parse_sexagesimal(value, hours=True) == pytest.approx(expected)
+
+@pytest.mark.parametrize("value", ["24h", "-1h", "25.0h"])
+def test_ra_hours_out_of_range(value):
+    with pytest.raises(ValueError):
+        parse_sexagesimal(value, hours=True)
+
+def test_hour_marker_rejected_for_dec():
+    with pytest.raises(ValueError, match="hour marker"):
+        parse_sexagesimal("12h", hours=False)
+    degrees, errors = parse_dec_column(["+41d16m09s", "+12h30m00s", "-5"])
+    assert errors == [1] and math.isnan(degrees[1])
+    assert degrees[0] == pytest.approx(41.2691667) and degrees[2] == -5.0
+
+def test_column_fallback_honours_hour_marker():
+    degrees, errors = parse_ra_column(["00:42:44.3", "12.5h", "187.5", "12h"])
+    assert errors == []
+    assert degrees == pytest.approx([10.6845833, 187.5, 187.5, 180.0])
+
+def test_mixed_forms_in_one_column():
+    values = ["00:42:44.3", "00 42 44.3", "00h42m44.3s"]
+    degrees, errors = parse_ra_column("\n".join(values).encode("utf-8"))
+    assert errors == [] and degrees == pytest.approx([10.6845833] * 3)
+    degrees, errors = parse_dec_column(["+41:16:09", "+41 16 09", "+41°16′09″", "−00:32:00"])
+    assert errors == [] and degrees == pytest.approx([41.2691667] * 3 + [-0.5333333])
@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from spatial_index import (
+    box_search,
+    build_spatial_index,
+    decode_spatial_index,
+    encode_spatial_index,
+    linear_nearest_neighbors,
+    linear_radius_search,
+    nearest_neighbors,
+    radius_search,
+)
+
+def make_positions(count, seed=1):
+    rng = random.Random(seed)
+    return [(rng.uniform(-500, 500), rng.uniform(-500, 500), rng.uniform(-500, 500)) for _ in range(count)]
+
+POSITIONS = make_positions(300)
+INDEX = build_spatial_index(POSITIONS, node_size=8)
+
+@pytest.mark.parametrize("k", [0, -3])
+def test_nearest_neighbors_non_positive_k(k):
+    assert nearest_neighbors(INDEX, (0.0, 0.0, 0.0), k) == []
+    assert linear_nearest_neighbors(POSITIONS, (0.0, 0.0, 0.0), k) == []
+
+@pytest.mark.parametrize("k", [1, 5, 40, 500])
+def test_nearest_neighbors_match_linear_scan(k):
+    for point in make_positions(20, seed=2):
+        actual = nearest_neighbors(INDEX, point, k)
+        expected = linear_nearest_neighbors(POSITIONS, point, k)
+        assert [idx for idx, _ in actual] == [idx for idx, _ in expected]
+
+def test_radius_and_box_match_linear_scan():
+    for center in make_positions(20, seed=3):
+        assert radius_search(INDEX, center, 150.0) == linear_radius_search(POSITIONS, center, 150.0)
+        lower = tuple(c - 100 for c in center)
+        upper = tuple(c + 100 for c in center)
+        expected = [idx for idx, p in enumerate(POSITIONS) if all(lo <= c <= hi for lo, c, hi in zip(lower, p, upper))]
+        assert box_search(INDEX, lower, upper) == expected
+
+def test_round_trip_keeps_neighbors():
+    decoded = decode_spatial_index(encode_spatial_index(INDEX))
+    point = (10.0, -20.0, 30.0)
+    assert [idx for idx, _ in nearest_neighbors(decoded, point, 10)] == \
+        [idx for idx, _ in nearest_neighbors(INDEX, point, 10)]
@@ -0,0 +1,53 @@
+import csv
+import json
+import random
+import tracemalloc
+
+from stars import StarCatalogEncoder, encode_stars_binary, encode_stars_json, ingest_stars
+
+def write_star_csv(path, count, seed=1):
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "ra", "dec", "parallax", "vmag", "spect"])
+        for idx in range(count):
+            writer.writerow([f"Star {idx}", rng.uniform(0, 360), rng.uniform(-90, 90),
+                             rng.uniform(20, 500), rng.uniform(-1, 9), rng.choice(["G2V", "M4.5V", "A0V", ""])])
+
+def test_ingest_yields_chunks(tmp_path):
+    path = tmp_path / "stars.csv"
+    write_star_csv(path, 250)
+    chunks = list(ingest_stars(str(path), chunk_size=100))
+    assert [read for _, read in chunks] == [100, 100, 50]
+    assert sum(len(stars) for stars, _ in chunks) == 250
+
+def test_chunked_encoding_matches_whole_list(tmp_path):
+    path = tmp_path / "stars.csv"
+    write_star_csv(path, 250)
+    encoder = StarCatalogEncoder()
+    everything = []
+    for stars, _ in ingest_stars(str(path), chunk_size=64, max_apparent_mag=6.5):
+        encoder.add(stars)
+        everything.extend(stars)
+    assert 0 < encoder.count == len(everything) < 250
+    assert encoder.json_bytes() == json.dumps(everything, indent=2, ensure_ascii=False).encode("utf-8")
+    assert encoder.json_bytes() == encode_stars_json(everything)
+    assert encoder.binary_bytes() == encode_stars_binary(everything)
+    assert encode_stars_json([]) == b"[]"
+
+def test_records_do_not_accumulate(tmp_path):
+    path = tmp_path / "stars.csv"
+    write_star_csv(path, 2000)
+
+    def traced_peak(chunk_size):
+        encoder = StarCatalogEncoder()
+        tracemalloc.start()
+        try:
+            for stars, _ in ingest_stars(str(path), chunk_size=chunk_size):
+                encoder.add(stars)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    # Small chunks keep far less live than one chunk holding every record
+    assert traced_peak(100) < 0.6 * traced_peak(2000)
@@ -0,0 +1,86 @@
+import itertools
+import json
+from array import array
+
+import pytest
+
+from catalog_binary import encode_catalog
+from catalog_reader import CatalogReader
+from routing import galaxy_positions
+from scraper import process_galaxies
+from tiles import encode_tiles, linear_bbox, load_bbox, tiles_in_bbox
+
+def grid_catalog(side=9):
+    """Objects on an integer grid, so octree cell edges fall exactly on objects"""
+    return [
+        {"id": f"g{x}_{y}_{z}", "name": f"Grid {x} {y} {z}", "type": "dSph",
+         "coordinates": {"ra_deg": float(x), "dec_deg": float(y)},
+         "position_3d": {"x": float(x), "y": float(y), "z": float(z)},
+         "distance_kpc": 10.0 + z, "size_estimate_kpc": 0.5}
+        for x, y, z in itertools.product(range(side), repeat=3)
+    ]
+
+def write_tiles(directory, galaxies, max_per_tile):
+    index, files = encode_tiles(galaxies, max_per_tile=max_per_tile)
+    (directory / "tiles").mkdir()
+    for path, data in files.items():
+        (directory / path).write_bytes(data)
+    (directory / "tiles" / "index.json").write_text(json.dumps(index), encoding="utf-8")
+    return index
+
+def expected_ids(galaxies, lo, hi):
+    flat32 = array("f", [v for position in galaxy_positions(galaxies) for v in position])
+    positions = list(zip(flat32[0::3], flat32[1::3], flat32[2::3]))
+    return sorted(galaxies[idx]["id"] for idx in linear_bbox(positions, lo, hi))
+
+@pytest.fixture(scope="module")
+def grid(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("grid")
+    galaxies = grid_catalog()
+    index = write_tiles(directory, galaxies, max_per_tile=20)
+    return directory, galaxies, index
+
+@pytest.mark.parametrize("lo,hi", [
+    ((1.5, 1.5, 1.5), (6.5, 6.5, 6.5)),   # many tiles
+    ((0, 0, 0), (4, 4, 4)),               # ends on the root's cell edges
+    ((4, 4, 4), (8, 8, 8)),               # starts on them
+    ((4, 0, 0), (4, 8, 8)),               # a plane of objects on an edge
+    ((4, 4, 4), (4, 4, 4)),               # a single point
+    ((-3, -3, -3), (20, 20, 20)),         # everything
+])
+def test_box_queries_match_linear_scan(grid, lo, hi):
+    directory, galaxies, index = grid
+    assert len(tiles_in_bbox(index, lo, hi)) > (1 if lo != hi else 0)
+    assert sorted(record["id"] for record in load_bbox(str(directory), lo, hi)) == expected_ids(galaxies, lo, hi)
+
+@pytest.mark.parametrize("lo,hi", [((20, 20, 20), (30, 30, 30)), ((1.2, 1.2, 1.2), (1.8, 1.8, 1.8))])
+def test_empty_boxes(grid, lo, hi):
+    directory, _, index = grid
+    assert load_bbox(str(directory), lo, hi, index) == []
+
+def test_records_match_the_catalog_reader(grid, tmp_path):
+    directory, galaxies, index = grid
+    (tmp_path / "galaxies.bin").write_bytes(encode_catalog(galaxies))
+    found = load_bbox(str(directory), (2, 2, 2), (3, 5, 3), index)
+    assert found
+    with CatalogReader(str(tmp_path / "galaxies.bin")) as catalog:
+        assert found == [catalog.get(record["id"]) for record in found]
+
+def test_ra_wrap(tmp_path):
+    rows = [
+        {"name": f"Wrap {idx}", "alternate_names": [], "type": "dSph", "ra": ra, "dec": dec,
+         "distance_kpc": 100.0, "size_estimate_kpc": 1.0, "notes": ""}
+        for idx, (ra, dec) in enumerate([("23:59:50", "+00:00:00"), ("00:00:10", "+00:00:00"),
+                                         ("23:58:00", "+00:30:00"), ("00:02:00", "-00:30:00"),
+                                         ("12:00:00", "+00:00:00"), ("06:00:00", "+45:00:00")])
+    ]
+    galaxies = process_galaxies(rows)
+    index = write_tiles(tmp_path, galaxies, max_per_tile=1)
+    # Heliocentric equatorial: RA 0h is +x, so objects either side of the wrap straddle y = 0
+    lo, hi = (90.0, -2.0, -2.0), (110.0, 2.0, 2.0)
+    assert len(tiles_in_bbox(index, lo, hi)) > 1
+    found = sorted(record["id"] for record in load_bbox(str(tmp_path), lo, hi, index))
+    assert found == expected_ids(galaxies, lo, hi) == ["wrap_0", "wrap_1", "wrap_2", "wrap_3"]
+    lo, hi = (99.0, -0.5, -0.5), (101.0, 0.5, 0.5)
+    found = sorted(record["id"] for record in load_bbox(str(tmp_path), lo, hi, index))
+    assert found == expected_ids(galaxies, lo, hi) == ["wrap_0", "wrap_1"]
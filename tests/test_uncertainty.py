@@ -0,0 +1,64 @@
+import math
+
+import pytest
+
+from benchmark import make_synthetic_rows
+from routing import galaxy_positions
+from scraper import process_galaxies
+from uncertainty import (
+    neighbor_pairs,
+    percentile,
+    propagate_uncertainties,
+    sample_positions,
+    sample_sources,
+    symmetric_eigen_3x3,
+)
+
+SAMPLES = 400
+
+@pytest.fixture(scope="module")
+def galaxies():
+    return process_galaxies(make_synthetic_rows(60))
+
+def test_process_pool_matches_one_process(galaxies):
+    pairs = neighbor_pairs(galaxy_positions(galaxies), k=3)
+    inline = propagate_uncertainties(galaxies, pairs, SAMPLES, workers=1, chunk_size=16)
+    pooled = propagate_uncertainties(galaxies, pairs, SAMPLES, workers=2, chunk_size=16)
+    assert pooled == inline
+    assert [e["id"] for e in inline["ellipsoids"]] == [g["id"] for g in galaxies]
+    assert [(p["from"], p["to"]) for p in inline["pairs"]] == [(galaxies[i]["id"], galaxies[j]["id"]) for i, j in pairs]
+
+def test_samples_are_reproducible_per_object(galaxies):
+    source = sample_sources(galaxies, sky_error_arcsec=30.0)[0]
+    assert sample_positions(source, SAMPLES) == sample_positions(source, SAMPLES)
+    assert sample_positions(source, SAMPLES, seed=1) != sample_positions(source, SAMPLES)
+
+def test_distance_errors_stretch_along_the_line_of_sight(galaxies):
+    # Distance-only errors give a needle: one axis of about sigma, the others ~0
+    result = propagate_uncertainties(galaxies, samples=SAMPLES, workers=1)
+    for galaxy, ellipsoid in zip(galaxies, result["ellipsoids"]):
+        sigma = galaxy["distance_uncertainty_kpc"]
+        major, middle, _ = ellipsoid["axes_kpc"]
+        assert major == pytest.approx(sigma, rel=0.15, abs=1e-3)
+        assert middle <= 1e-3 * max(sigma, 1.0)
+        position = galaxy["position_3d"]
+        line_of_sight = [position[axis] / galaxy["distance_kpc"] for axis in "xyz"]
+        alignment = sum(a * b for a, b in zip(ellipsoid["axis_vectors"][0], line_of_sight))
+        assert abs(alignment) == pytest.approx(1.0, abs=1e-3)
+
+def test_pair_bounds_are_ordered(galaxies):
+    result = propagate_uncertainties(galaxies, [(0, 1), (2, 3)], SAMPLES, workers=1)
+    for pair in result["pairs"]:
+        low, median, high = pair["distance_kpc"]
+        assert low <= median <= high
+        assert pair["travel_years"] == sorted(pair["travel_years"])
+
+def test_symmetric_eigen_3x3():
+    values, vectors = symmetric_eigen_3x3(((4.0, 1.0, 0.0), (1.0, 4.0, 0.0), (0.0, 0.0, 1.0)))
+    assert values == pytest.approx([5.0, 3.0, 1.0])
+    assert [abs(c) for c in vectors[0]] == pytest.approx([math.sqrt(0.5), math.sqrt(0.5), 0.0])
+
+def test_percentile_interpolates():
+    assert percentile([0.0, 10.0], 50.0) == 5.0
+    assert percentile([1.0, 2.0, 3.0], 100.0) == 3.0
+    assert percentile([7.0], 2.5) == 7.0
@@ -0,0 +1,104 @@
+import fnmatch
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmark import make_synthetic_rows
+from catalog_binary import decode_catalog
+from scraper import process_galaxies
+from writers import COMPRESSORS, WRITERS, EncodeQueue, available_compressors, gzip_compress
+
+PUBLIC = Path(__file__).resolve().parent.parent / "public"
+# Content-Encoding token and underlying content type of every sibling the build can write
+ENCODINGS = {".gz": "gzip", ".br": "br"}
+CONTENT_TYPES = {".json": "application/json", ".ndjson": "application/x-ndjson", ".bin": "application/octet-stream"}
+
+@pytest.fixture(scope="module")
+def galaxies():
+    galaxies = process_galaxies(make_synthetic_rows(40))
+    galaxies[0]["name"] = "Boötes I"
+    return galaxies
+
+def decode(fmt, data):
+    if fmt == "ndjson":
+        return [json.loads(line) for line in data.decode("utf-8").splitlines()]
+    return json.loads(data)
+
+@pytest.mark.parametrize("fmt", ["json", "json-min", "ndjson"])
+def test_json_formats_round_trip(galaxies, fmt):
+    assert decode(fmt, WRITERS[fmt][1](galaxies)) == galaxies
+
+def test_json_is_the_historical_galaxies_json(galaxies):
+    expected = json.dumps(galaxies, indent=2, ensure_ascii=False).encode("utf-8")
+    assert WRITERS["json"][1](galaxies) == expected
+
+def test_binary_format_decodes(galaxies):
+    columns = decode_catalog(WRITERS["binary"][1](galaxies))
+    assert columns["id"] == [g["id"] for g in galaxies]
+    assert columns["name"] == [g["name"] for g in galaxies]
+
+def test_gzip_is_deterministic():
+    data = b'{"id": "andromeda_m31"}' * 100
+    assert gzip_compress(data) == gzip_compress(data)
+    assert gzip.decompress(gzip_compress(data)) == data
+
+def test_encode_queue_writes_every_format_and_sibling(galaxies):
+    queue = EncodeQueue(["gzip"])
+    for fmt in WRITERS:
+        queue.submit_format(fmt, "data/galaxies", galaxies)
+    outputs = queue.results()
+
+    assert len(outputs) == 2 * len(WRITERS)
+    for fmt, (suffix, encode) in WRITERS.items():
+        path = "data/galaxies" + suffix
+        assert outputs[path] == encode(galaxies)
+        assert gzip.decompress(outputs[path + ".gz"]) == outputs[path]
+    assert [entry["format"] for entry in queue.stats] == list(WRITERS)
+    assert all(entry["gzip_bytes"] == len(outputs[entry["path"] + ".gz"]) for entry in queue.stats)
+
+def test_missing_or_unknown_compressors(capsys):
+    assert available_compressors(["gzip"]) == ["gzip"]
+    if "brotli" not in COMPRESSORS:
+        assert available_compressors(["gzip", "brotli"]) == ["gzip"]
+        assert "brotli is not installed" in capsys.readouterr().out
+    with pytest.raises(ValueError, match="Unknown compressor 'zstd'"):
+        available_compressors(["zstd"])
+
+def header_rules():
+    """public/_headers as [(url pattern, {header: value})]"""
+    rules = []
+    for line in (PUBLIC / "_headers").read_text(encoding="utf-8").splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        if line[0].isspace():
+            name, _, value = line.strip().partition(":")
+            rules[-1][1][name] = value.strip()
+        else:
+            rules.append((line.strip(), {}))
+    return rules
+
+def headers_for(url):
+    headers = {}
+    for pattern, values in header_rules():
+        if fnmatch.fnmatchcase(url, pattern):
+            headers.update(values)
+    return headers
+
+@pytest.mark.parametrize("suffix", sorted({suffix for suffix, _ in WRITERS.values()}))
+@pytest.mark.parametrize("compressed", sorted(ENCODINGS))
+def test_compressed_siblings_are_served_with_content_encoding(suffix, compressed):
+    headers = headers_for(f"/data/galaxies{suffix}{compressed}")
+    assert headers["Content-Encoding"] == ENCODINGS[compressed]
+    # .min.json is still JSON
+    assert headers["Content-Type"].startswith(CONTENT_TYPES["." + suffix.rsplit(".", 1)[-1]])
+
+def test_uncompressed_outputs_keep_their_encoding():
+    for suffix, _ in WRITERS.values():
+        assert "Content-Encoding" not in headers_for(f"/data/galaxies{suffix}")
+    assert "Content-Encoding" not in headers_for("/data/404.html")
+
+def test_missing_siblings_are_a_404():
+    # Without a 404.html on the way up from /data, Pages serves the app's index.html for missing files
+    assert (PUBLIC / "data" / "404.html").is_file()
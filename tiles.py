@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Octree-sharded catalog tiles for on-demand loading
+The bounding cube of all position_3d values is split into octants until each
+leaf holds at most max_per_tile objects. Every leaf becomes one tile in the
+columnar binary catalog format (catalog_binary.py), and a root index lists
+each tile's key, file, object count, octree cell and tight content bounds,
+so a client only fetches the tiles that intersect the region it looks at.
+
+Tile keys are "t" followed by the octant digits of the path from the root
+(bit 0 = +x half, bit 1 = +y, bit 2 = +z), e.g. "t" for a single root tile
+or "t53" for octant 3 of octant 5.
+"""
+
+import json
+import os
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from catalog_binary import encode_catalog
+from catalog_reader import CatalogReader
+from routing import Position, galaxy_positions
+
+INDEX_VERSION = 1
+DEFAULT_MAX_PER_TILE = 4096
+DEFAULT_MAX_DEPTH = 10
+
+Bounds = Tuple[Position, Position]
+
+def bounding_box(positions: Sequence[Position]) -> Bounds:
+    """Tight (min corner, max corner) of a set of points"""
+    xs, ys, zs = zip(*positions)
+    return (min(xs), min(ys), min(zs)), (max(xs), max(ys), max(zs))
+
+def bounding_cube(positions: Sequence[Position]) -> Bounds:
+    """Smallest axis-aligned cube at the min corner that contains every point"""
+    lo, hi = bounding_box(positions)
+    side = max(h - l for l, h in zip(lo, hi)) or 1.0
+    return lo, (lo[0] + side, lo[1] + side, lo[2] + side)
+
+def build_octree_tiles(positions: Sequence[Position], max_per_tile: int = DEFAULT_MAX_PER_TILE,
+                       max_depth: int = DEFAULT_MAX_DEPTH) -> List[Dict]:
+    """
+    Split points into octree leaves of at most max_per_tile points (deeper
+    than max_depth a leaf keeps whatever is left). Returns the non-empty
+    leaves as {"key", "depth", "cell", "indices"} in key order.
+    """
+    if not positions:
+        return []
+    tiles = []
+    stack = [("t", bounding_cube(positions), list(range(len(positions))))]
+    while stack:
+        key, (lo, hi), indices = stack.pop()
+        depth = len(key) - 1
+        if len(indices) <= max_per_tile or depth >= max_depth:
+            tiles.append({"key": key, "depth": depth, "cell": (lo, hi), "indices": indices})
+            continue
+        center = tuple((l + h) / 2 for l, h in zip(lo, hi))
+        octants: List[List[int]] = [[] for _ in range(8)]
+        for idx in indices:
+            x, y, z = positions[idx]
+            octants[(x >= center[0]) | (y >= center[1]) << 1 | (z >= center[2]) << 2].append(idx)
+        for octant, members in enumerate(octants):
+            if not members:
+                continue
+            child_lo = tuple(c if octant >> axis & 1 else l for axis, (l, c) in enumerate(zip(lo, center)))
+            child_hi = tuple(h if octant >> axis & 1 else c for axis, (c, h) in enumerate(zip(center, hi)))
+            stack.append((key + str(octant), (child_lo, child_hi), members))
+    tiles.sort(key=lambda tile: tile["key"])
+    return tiles
+
+def encode_tiles(galaxies: Sequence[Dict], max_per_tile: int = DEFAULT_MAX_PER_TILE,
+                 max_depth: int = DEFAULT_MAX_DEPTH, prefix: str = "tiles/") -> Tuple[Dict, Dict[str, bytes]]:
+    """Tile the catalog, returns (root index, {tile file path: encoded tile})"""
+    positions = galaxy_positions(galaxies)
+    # Content bounds use the stored float32 values so box tests match what readers see
+    flat32 = array("f", [v for position in positions for v in position])
+    positions32 = list(zip(flat32[0::3], flat32[1::3], flat32[2::3]))
+    files: Dict[str, bytes] = {}
+    entries = []
+    for tile in build_octree_tiles(positions, max_per_tile, max_depth):
+        path = f"{prefix}{tile['key']}.bin"
+        files[path] = encode_catalog([galaxies[idx] for idx in tile["indices"]])
+        content_lo, content_hi = bounding_box([positions32[idx] for idx in tile["indices"]])
+        entries.append({
+            "key": tile["key"],
+            "file": path,
+            "count": len(tile["indices"]),
+            "depth": tile["depth"],
+            "cell": [list(tile["cell"][0]), list(tile["cell"][1])],
+            "bounds": [list(content_lo), list(content_hi)],
+            "bytes": len(files[path]),
+        })
+    index = {
+        "version": INDEX_VERSION,
+        "format": "SMCB",
+        "count": len(galaxies),
+        "max_per_tile": max_per_tile,
+        "bounds": [list(corner) for corner in bounding_box(positions32)] if positions else None,
+        "tiles": entries,
+    }
+    return index, files
+
+def boxes_intersect(lo1: Sequence[float], hi1: Sequence[float], lo2: Sequence[float], hi2: Sequence[float]) -> bool:
+    """True if two closed axis-aligned boxes overlap"""
+    return all(l1 <= h2 and l2 <= h1 for l1, h1, l2, h2 in zip(lo1, hi1, lo2, hi2))
+
+def tiles_in_bbox(index: Dict, lo: Position, hi: Position) -> List[Dict]:
+    """Index entries of the tiles whose contents can fall inside the box"""
+    return [tile for tile in index["tiles"] if boxes_intersect(tile["bounds"][0], tile["bounds"][1], lo, hi)]
+
+def read_tile_index(directory: str) -> Dict:
+    """Load the root tile index from an output directory (e.g. public/data)"""
+    with open(os.path.join(directory, "tiles", "index.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def load_bbox(directory: str, lo: Position, hi: Position, index: Optional[Dict] = None) -> List[Dict]:
+    """
+    Objects with position_3d inside the closed box [lo, hi], reading only the
+    intersecting tiles. Records are catalog_reader.CatalogReader.record dicts
+    (float32 precision), in tile order.
+    """
+    index = index or read_tile_index(directory)
+    records = []
+    for tile in tiles_in_bbox(index, lo, hi):
+        with CatalogReader(os.path.join(directory, tile["file"])) as catalog:
+            positions = catalog.positions
+            for i in range(catalog.count):
+                x, y, z = positions[3 * i], positions[3 * i + 1], positions[3 * i + 2]
+                if lo[0] <= x <= hi[0] and lo[1] <= y <= hi[1] and lo[2] <= z <= hi[2]:
+                    records.append(catalog.record(i))
+    return records
+
+def linear_bbox(positions: Sequence[Position], lo: Position, hi: Position) -> List[int]:
+    """Reference box query: indices of every point inside [lo, hi]"""
+    return [
+        idx for idx, (x, y, z) in enumerate(positions)
+        if lo[0] <= x <= hi[0] and lo[1] <= y <= hi[1] and lo[2] <= z <= hi[2]
+    ]
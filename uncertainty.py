@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo propagation of distance (and optional RA/Dec) uncertainties
+Every object is sampled N times from a normal distribution around its
+distance (sigma = distance_uncertainty_kpc) and, optionally, around its sky
+position. The samples are converted to Cartesian positions column-wise and
+summarized as a positional error ellipsoid. Pairs of objects get percentile
+bounds on their separation and on the travel time between them.
+
+Samples are drawn from a per-object seeded stream (crc32 of the id), so they
+never have to be stored: a pair simply regenerates the draws of both
+objects. Work is split into chunks of objects (or pairs) that run in a
+process pool, which keeps memory bounded by chunk size x samples.
+"""
+
+import math
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from scraper import equatorial_to_galactocentric_batch
+
+DEFAULT_SAMPLES = 1000
+DEFAULT_SEED = 20251021
+DEFAULT_CHUNK_SIZE = 256
+PERCENTILES = (2.5, 50.0, 97.5)
+
+# Same constants as src/utils/constants.js (KPC_TO_LIGHTYEARS, DEFAULT_SPEED)
+KPC_TO_LIGHTYEARS = 3260.47
+DEFAULT_SPEED_FRACTION = 0.25
+
+# (id, ra_deg, dec_deg, distance_kpc, distance sigma kpc, RA/Dec sigma arcsec)
+SampleSource = Tuple[str, float, float, float, float, float]
+
+def sample_sources(galaxies: Sequence[Dict], sky_error_arcsec: float = 0.0) -> List[SampleSource]:
+    """Compact, picklable sampling inputs for galaxy records"""
+    return [
+        (g["id"], g["coordinates"]["ra_deg"], g["coordinates"]["dec_deg"], g["distance_kpc"],
+         g["distance_uncertainty_kpc"], sky_error_arcsec)
+        for g in galaxies
+    ]
+
+def sample_positions(source: SampleSource, samples: int, seed: int = DEFAULT_SEED,
+                     galactocentric: bool = False) -> Tuple[List[float], List[float], List[float]]:
+    """Cartesian position samples (xs, ys, zs) of one object, identical on every call"""
+    object_id, ra, dec, distance, sigma, sky_sigma_arcsec = source
+    rng = Random(zlib.crc32(object_id.encode("utf-8")) ^ seed)
+    gauss = rng.gauss
+    distances = [max(0.0, gauss(distance, sigma)) for _ in range(samples)] if sigma > 0 else [distance] * samples
+    if sky_sigma_arcsec > 0:
+        sky_sigma = sky_sigma_arcsec / 3600
+        cos_dec = max(math.cos(math.radians(dec)), 1e-6)
+        ras = [(ra + gauss(0.0, sky_sigma) / cos_dec) % 360 for _ in range(samples)]
+        decs = [max(-90.0, min(90.0, dec + gauss(0.0, sky_sigma))) for _ in range(samples)]
+    else:
+        ras, decs = [ra] * samples, [dec] * samples
+
+    if galactocentric:
+        return equatorial_to_galactocentric_batch(ras, decs, distances, digits=None)
+    # Heliocentric equatorial, as equatorial_to_cartesian_batch but unrounded
+    xs, ys, zs = [], [], []
+    for r, d, dist in zip(map(math.radians, ras), map(math.radians, decs), distances):
+        d_cos_dec = dist * math.cos(d)
+        xs.append(d_cos_dec * math.cos(r))
+        ys.append(d_cos_dec * math.sin(r))
+        zs.append(dist * math.sin(d))
+    return xs, ys, zs
+
+def symmetric_eigen_3x3(matrix: Sequence[Sequence[float]]) -> Tuple[List[float], List[List[float]]]:
+    """Eigenvalues (descending) and unit eigenvectors of a symmetric 3x3 matrix (Jacobi rotations)"""
+    a = [list(row) for row in matrix]
+    v = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+    for _ in range(50):
+        p, q = max(((0, 1), (0, 2), (1, 2)), key=lambda pq: abs(a[pq[0]][pq[1]]))
+        if abs(a[p][q]) < 1e-15 * max(1.0, abs(a[p][p]) + abs(a[q][q])):
+            break
+        theta = (a[q][q] - a[p][p]) / (2 * a[p][q])
+        t = math.copysign(1.0, theta) / (abs(theta) + math.sqrt(theta * theta + 1))
+        c = 1 / math.sqrt(t * t + 1)
+        s = t * c
+        for k in range(3):
+            akp, akq = a[k][p], a[k][q]
+            a[k][p], a[k][q] = c * akp - s * akq, s * akp + c * akq
+        for k in range(3):
+            apk, aqk = a[p][k], a[q][k]
+            a[p][k], a[q][k] = c * apk - s * aqk, s * apk + c * aqk
+        for k in range(3):
+            vkp, vkq = v[k][p], v[k][q]
+            v[k][p], v[k][q] = c * vkp - s * vkq, s * vkp + c * vkq
+    order = sorted(range(3), key=lambda i: a[i][i], reverse=True)
+    return [a[i][i] for i in order], [[v[k][i] for k in range(3)] for i in order]
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Linearly interpolated percentile of an already sorted sequence"""
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+def error_ellipsoid(xs: Sequence[float], ys: Sequence[float], zs: Sequence[float]) -> Dict:
+    """Mean, covariance and 1-sigma principal axes of a cloud of position samples"""
+    n = len(xs)
+    mean = [math.fsum(xs) / n, math.fsum(ys) / n, math.fsum(zs) / n]
+    dx = [x - mean[0] for x in xs]
+    dy = [y - mean[1] for y in ys]
+    dz = [z - mean[2] for z in zs]
+    denominator = max(n - 1, 1)
+
+    def cov(u: Sequence[float], w: Sequence[float]) -> float:
+        return math.fsum(map(float.__mul__, u, w)) / denominator
+
+    sxx, syy, szz, sxy, sxz, syz = cov(dx, dx), cov(dy, dy), cov(dz, dz), cov(dx, dy), cov(dx, dz), cov(dy, dz)
+    values, vectors = symmetric_eigen_3x3(((sxx, sxy, sxz), (sxy, syy, syz), (sxz, syz, szz)))
+    return {
+        "mean": [round(m, 4) for m in mean],
+        # xx, yy, zz, xy, xz, yz
+        "covariance": [round(c, 6) for c in (sxx, syy, szz, sxy, sxz, syz)],
+        "axes_kpc": [round(math.sqrt(max(value, 0.0)), 4) for value in values],
+        "axis_vectors": [[round(c, 6) for c in vector] for vector in vectors],
+    }
+
+def _ellipsoid_chunk(args: Tuple[Sequence[SampleSource], int, int, bool]) -> List[Dict]:
+    """Worker entry point: error ellipsoids for a chunk of objects"""
+    sources, samples, seed, galactocentric = args
+    results = []
+    for source in sources:
+        ellipsoid = error_ellipsoid(*sample_positions(source, samples, seed, galactocentric))
+        results.append({"id": source[0], **ellipsoid})
+    return results
+
+def _pair_chunk(args: Tuple[Sequence[Tuple[SampleSource, SampleSource]], int, int, bool, float]) -> List[Dict]:
+    """Worker entry point: separation and travel time percentiles for a chunk of pairs"""
+    pairs, samples, seed, galactocentric, speed_fraction = args
+    years_per_kpc = KPC_TO_LIGHTYEARS / speed_fraction
+    # Neighbour pairs repeat objects, so each chunk samples every object once
+    cache: Dict[SampleSource, Tuple[List[float], List[float], List[float]]] = {}
+
+    def positions(source: SampleSource) -> Tuple[List[float], List[float], List[float]]:
+        if source not in cache:
+            cache[source] = sample_positions(source, samples, seed, galactocentric)
+        return cache[source]
+
+    results = []
+    for first, second in pairs:
+        x1, y1, z1 = positions(first)
+        x2, y2, z2 = positions(second)
+        distances = sorted(map(math.dist, zip(x1, y1, z1), zip(x2, y2, z2)))
+        bounds = [percentile(distances, pct) for pct in PERCENTILES]
+        results.append({
+            "from": first[0],
+            "to": second[0],
+            "distance_kpc": [round(value, 4) for value in bounds],
+            "travel_years": [round(value * years_per_kpc) for value in bounds],
+        })
+    return results
+
+def _run_chunks(worker, chunks: List[tuple], workers: Optional[int]) -> List[Dict]:
+    """Run chunk jobs inline or in a process pool, preserving order"""
+    if workers == 1 or len(chunks) <= 1:
+        return [result for chunk in chunks for result in worker(chunk)]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        return [result for results in pool.map(worker, chunks) for result in results]
+
+def propagate_uncertainties(galaxies: Sequence[Dict], pairs: Sequence[Tuple[int, int]] = (),
+                            samples: int = DEFAULT_SAMPLES, sky_error_arcsec: float = 0.0,
+                            seed: int = DEFAULT_SEED, galactocentric: bool = False,
+                            speed_fraction: float = DEFAULT_SPEED_FRACTION,
+                            workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+    """
+    Error ellipsoids for every galaxy and percentile bounds for the given
+    (index, index) pairs. Positions use the same frame as position_3d.
+    """
+    sources = sample_sources(galaxies, sky_error_arcsec)
+    ellipsoid_chunks = [
+        (sources[start:start + chunk_size], samples, seed, galactocentric)
+        for start in range(0, len(sources), chunk_size)
+    ]
+    pair_sources = [(sources[i], sources[j]) for i, j in pairs]
+    pair_chunks = [
+        (pair_sources[start:start + chunk_size], samples, seed, galactocentric, speed_fraction)
+        for start in range(0, len(pair_sources), chunk_size)
+    ]
+    return {
+        "version": 1,
+        "samples": samples,
+        "seed": seed,
+        "sky_error_arcsec": sky_error_arcsec,
+        "speed_fraction": speed_fraction,
+        "percentiles": list(PERCENTILES),
+        "ellipsoids": _run_chunks(_ellipsoid_chunk, ellipsoid_chunks, workers),
+        "pairs": _run_chunks(_pair_chunk, pair_chunks, workers),
+    }
+
+def neighbor_pairs(positions: Sequence[Tuple[float, float, float]], k: int = 5) -> List[Tuple[int, int]]:
+    """Distinct (i, j) pairs, i < j, linking every object to its k nearest neighbours"""
+    from spatial_index import build_spatial_index, nearest_neighbors
+
+    index = build_spatial_index(positions)
+    pairs = set()
+    for i, point in enumerate(positions):
+        for j, _ in nearest_neighbors(index, point, k + 1):
+            if j != i:
+                pairs.add((min(i, j), max(i, j)))
+    return sorted(pairs)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Pluggable output writers for the galaxy catalog
+Each registered format turns the processed records into bytes; every output
+can also get pre-compressed .gz / .br siblings that a static host can serve
+as-is (public/_headers gives them Content-Encoding on Cloudflare Pages).
+Encoding runs on a background thread (EncodeQueue). Only part of that work
+overlaps with the rest of the build: zlib/brotli compression and file I/O
+release the GIL, but json.dumps and the binary encoder hold it, so those
+steps take turns with the main thread instead of running alongside it. A
+process pool would overlap them too, but it would first have to pickle
+every record to the worker, which costs about as much as encoding them.
+
+Formats:
+- json: pretty printed (indent=2), the historical galaxies.json
+- json-min: minified JSON array
+- ndjson: one record per line
+- binary: columnar binary catalog (catalog_binary.py)
+"""
+
+import gzip
+import json
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from catalog_binary import encode_catalog
+
+try:
+    import brotli  # optional, only needed for .br siblings
+except ImportError:
+    brotli = None
+
+# Writer registry: format name -> (file suffix, function(records) returning bytes)
+WRITERS: Dict[str, Tuple[str, Callable[[Sequence[Dict]], bytes]]] = {}
+
+def register_writer(fmt: str, suffix: str):
+    """Register an output format and the file suffix it is written with"""
+    def decorator(func: Callable[[Sequence[Dict]], bytes]) -> Callable[[Sequence[Dict]], bytes]:
+        WRITERS[fmt] = (suffix, func)
+        return func
+    return decorator
+
+@register_writer("json", ".json")
+def write_json(records: Sequence[Dict]) -> bytes:
+    """Pretty printed JSON array (indent=2)"""
+    return json.dumps(records, indent=2, ensure_ascii=False).encode("utf-8")
+
+@register_writer("json-min", ".min.json")
+def write_json_min(records: Sequence[Dict]) -> bytes:
+    """Minified JSON array"""
+    return json.dumps(records, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+@register_writer("ndjson", ".ndjson")
+def write_ndjson(records: Sequence[Dict]) -> bytes:
+    """One minified JSON record per line"""
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    return "".join(dumps(record) + "\n" for record in records).encode("utf-8")
+
+register_writer("binary", ".bin")(encode_catalog)
+
+def gzip_compress(data: bytes) -> bytes:
+    """Deterministic gzip (no timestamp) at the highest level"""
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+# Compressor registry: name -> (file suffix, function), brotli only when installed
+COMPRESSORS: Dict[str, Tuple[str, Callable[[bytes], bytes]]] = {"gzip": (".gz", gzip_compress)}
+if brotli is not None:
+    COMPRESSORS["brotli"] = (".br", lambda data: brotli.compress(data, quality=11))
+
+def available_compressors(requested: Sequence[str]) -> List[str]:
+    """Requested compressors that can run here, warning about missing optional ones"""
+    names = []
+    for name in requested:
+        if name in COMPRESSORS:
+            names.append(name)
+        elif name == "brotli":
+            print("⚠️  brotli is not installed (pip install brotli), skipping .br files")
+        else:
+            raise ValueError(f"Unknown compressor '{name}'")
+    return names
+
+class EncodeQueue:
+    """
+    Encodes outputs on a background thread while the caller keeps computing
+    (compression overlaps; JSON encoding holds the GIL, see the module docstring)
+    submit() returns immediately; results() waits and returns
+    {path: bytes} in submission order, with per-output timings in stats.
+    """
+
+    def __init__(self, compressors: Sequence[str] = ()):
+        self.compressors = list(compressors)
+        self.stats: List[Dict] = []
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="encode")
+        self._pending: List[Tuple[str, str, Future]] = []
+
+    def _encode(self, func: Callable[..., bytes], args: tuple) -> Tuple[bytes, float, Dict[str, Tuple[bytes, float]]]:
+        start = time.perf_counter()
+        data = func(*args)
+        encoded = time.perf_counter() - start
+        compressed = {}
+        for name in self.compressors:
+            start = time.perf_counter()
+            compressed[name] = (COMPRESSORS[name][1](data), time.perf_counter() - start)
+        return data, encoded, compressed
+
+    def submit(self, path: str, label: str, func: Callable[..., bytes], *args) -> None:
+        """Queue func(*args) to produce the bytes of path (plus compressed siblings)"""
+        self._pending.append((path, label, self._executor.submit(self._encode, func, args)))
+
+    def submit_format(self, fmt: str, base_path: str, records: Sequence[Dict]) -> None:
+        """Queue a registered format, written to base_path + the format's suffix"""
+        suffix, func = WRITERS[fmt]
+        self.submit(base_path + suffix, fmt, func, records)
+
+    def results(self) -> Dict[str, bytes]:
+        """Wait for every queued output, returns {path: bytes} including compressed siblings"""
+        outputs: Dict[str, bytes] = {}
+        for path, label, future in self._pending:
+            data, encoded, compressed = future.result()
+            outputs[path] = data
+            entry = {"path": path, "format": label, "bytes": len(data), "encode_seconds": round(encoded, 6)}
+            for name, (packed, seconds) in compressed.items():
+                outputs[path + COMPRESSORS[name][0]] = packed
+                entry[f"{name}_bytes"] = len(packed)
+                entry[f"{name}_seconds"] = round(seconds, 6)
+            self.stats.append(entry)
+        self._pending = []
+        self._executor.shutdown()
+        return outputs
+
+def print_format_table(stats: Sequence[Dict], compressors: Sequence[str]) -> None:
+    """Bytes on the wire and encode time per output"""
+    header = f"  {'output':<38} {'bytes':>12} {'encode ms':>10}"
+    for name in compressors:
+        header += f" {name + ' bytes':>13} {name + ' ms':>10}"
+    print(header)
+    for entry in stats:
+        line = f"  {entry['path']:<38} {entry['bytes']:>12,} {entry['encode_seconds'] * 1000:>10.1f}"
+        for name in compressors:
+            line += f" {entry[f'{name}_bytes']:>13,} {entry[f'{name}_seconds'] * 1000:>10.1f}"
+        print(line)